@@ -1,14 +1,28 @@
 import os
+import asyncio
 import json
+import logging
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, send_from_directory
+import numpy as np
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory, stream_with_context, url_for
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
 
+# Optional: faster JSON (de)serialization for the meeting store
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from services.audio_service import AudioService
 from services.analysis_service import AnalysisService
 from services.search_service import SearchService
-from services.visual_service import VisualService
+from services.visual_service import VisualService, PLACEHOLDER_URL
 from services.integration_service import IntegrationService
 
 # Optional real-time service (requires websockets)
@@ -23,19 +37,61 @@ except ImportError:
 
 load_dotenv()
 
+# Configure logging once for the app and its services
+logging.basicConfig(level=logging.INFO)
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', 'dev-key-change-in-production')
 app.config['UPLOAD_FOLDER'] = 'uploads'  # Fixed: was == instead of =
 app.config['MAX_CONTENT_LENGTH'] = 25 * 1024 * 1024  # 25MB limit
 
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 # Allowed audio file extensions
-ALLOWED_EXTENSIONS = {'mp3', 'wav', 'm4a', 'aac', 'flac'}
+ALLOWED_EXTENSIONS = frozenset({'.mp3', '.wav', '.m4a', '.aac', '.flac'})
+
+# Meeting storage
+MEETINGS_FILE = 'data/meetings.json'
+EMBEDDINGS_FILE = 'data/embeddings.npy'  # (N, D) float16, rows L2-normalized
+STATS_FILE = 'data/stats.json'  # Aggregates for /stats, rewritten with every save
+INDEX_FILE = 'data/meetings_index.json'  # List-view fields only, served by /meetings
+
+# Parsed meetings, reused until the file on disk changes; 'by_id' maps
+# str(meeting id) -> meeting, since routes receive both int and str ids,
+# and 'next_id' is the next free integer id for uploaded meetings
+_meetings_cache = {'mtime': None, 'data': None, 'by_id': {}, 'next_id': 1}
+_stats_cache = {'mtime': None, 'data': None}
+_index_cache = {'mtime': None, 'data': None}
+
+# Disk writes are done by a single background writer (queued writes are
+# drained at interpreter exit); 'snapshot' holds the latest serialized state
+# not yet picked up, 'in_flight' counts unfinished saves
+_store_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='meetings-writer')
+_store_lock = threading.Lock()
+_store_state = {'snapshot': None, 'in_flight': 0}
+
+# Serializes load -> modify -> save of the shared meeting list, so meetings
+# added concurrently (e.g. by two processing jobs) don't get the same id or
+# overwrite each other's append
+_meetings_update_lock = threading.Lock()
+
+# Uploaded meetings are processed in the background; job status lives in
+# one small file per job so any gunicorn worker can answer /jobs/<id>
+JOBS_DIR = 'data/jobs'
+PROCESS_WORKERS = int(os.getenv('PROCESS_WORKERS', '2'))
+_job_executor = ThreadPoolExecutor(max_workers=PROCESS_WORKERS, thread_name_prefix='meeting-jobs')
+
+# One long-lived event loop for async work started from request threads, so
+# the async OpenAI client (one per loop) keeps its pooled connections
+_async_loop = asyncio.new_event_loop()
+threading.Thread(target=_async_loop.run_forever, name='async-loop', daemon=True).start()
 
 # Initialize services
 audio_service = AudioService()
 analysis_service = AnalysisService()
 search_service = SearchService()
-visual_service = VisualService()
+visual_service = VisualService(static_folder=app.static_folder, static_url_path=app.static_url_path)
 integration_service = IntegrationService()
 
 # Initialize real-time service if available
@@ -45,20 +101,285 @@ else:
     realtime_service = None
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return os.path.splitext(filename)[1].lower() in ALLOWED_EXTENSIONS
+
+def save_upload(file, filepath):
+    """Stream an uploaded file to disk in large chunks"""
+    with open(filepath, 'wb') as out:
+        shutil.copyfileobj(file.stream, out, length=UPLOAD_CHUNK_SIZE)
+
+def _json_default(obj):
+    """Serialize numpy arrays when falling back to the stdlib encoder"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _json_dumps(obj):
+    """Serialize to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, default=_json_default).encode('utf-8')
+
+def _json_loads(raw):
+    """Parse JSON bytes"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def stream_json_list(key, items):
+    """Stream {key: [items...]} as JSON one item at a time instead of building the whole body"""
+    def generate():
+        yield b'{"' + key.encode('utf-8') + b'":['
+        for i, item in enumerate(items):
+            yield (b',' if i else b'') + _json_dumps(item)
+        yield b']}'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+async def _next_event(events):
+    return await events.__anext__()
+
+def stream_events(events):
+    """Stream (event, data) pairs from an async generator as server-sent events"""
+    def generate():
+        try:
+            while True:
+                try:
+                    event, data = asyncio.run_coroutine_threadsafe(_next_event(events), _async_loop).result()
+                except StopAsyncIteration:
+                    break
+                yield b'event: ' + event.encode('utf-8') + b'\ndata: ' + _json_dumps(data) + b'\n\n'
+        finally:
+            asyncio.run_coroutine_threadsafe(events.aclose(), _async_loop).result()
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def _has_embedding(meeting):
+    embedding = meeting.get('embedding')
+    return embedding is not None and len(embedding) > 0
+
+def _split_embeddings(meetings):
+    """
+    Separate embeddings from meeting records for storage
+    
+    Returns:
+        tuple: (records referencing matrix rows via 'embedding_row', float16 matrix or None)
+    """
+    records = []
+    vectors = []
+    dimension = None
+    for meeting in meetings:
+        record = {k: v for k, v in meeting.items() if k != 'embedding'}
+        if _has_embedding(meeting):
+            if dimension is None:
+                dimension = len(meeting['embedding'])
+            if len(meeting['embedding']) == dimension:
+                record['embedding_row'] = len(vectors)
+                vectors.append(meeting['embedding'])
+            else:
+                # Can't share the matrix; keep it inline
+                record['embedding'] = meeting['embedding']
+        elif 'embedding' in meeting:
+            record['embedding'] = []
+        records.append(record)
+    
+    if not vectors:
+        return records, None
+    
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return records, (matrix / norms).astype(np.float16)
+
+def _attach_embeddings(meetings):
+    """Point each stored meeting's 'embedding' at its row of the memory-mapped matrix"""
+    if not any('embedding_row' in m for m in meetings):
+        return
+    
+    matrix = np.load(EMBEDDINGS_FILE, mmap_mode='r')
+    for meeting in meetings:
+        row = meeting.pop('embedding_row', None)
+        if row is not None:
+            meeting['embedding'] = matrix[row]
+
+def _index_meetings(meetings):
+    """Rebuild the id lookup and id counter for a freshly loaded or saved list"""
+    _meetings_cache['by_id'] = {str(m['id']): m for m in meetings if 'id' in m}
+    _meetings_cache['next_id'] = max((m['id'] for m in meetings if isinstance(m.get('id'), int)), default=0) + 1
 
 def load_meetings():
-    """Load meetings from JSON file"""
-    if os.path.exists('data/meetings.json'):
-        with open('data/meetings.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return []
+    """Load meetings from JSON file, re-parsing only when the file has changed.
+
+    The returned list is shared between requests; callers that modify it
+    must persist their changes with save_meetings().
+    """
+    with _store_lock:
+        if _store_state['in_flight']:
+            # Our own save hasn't reached the disk yet; the cache is newer
+            return _meetings_cache['data']
+    
+    try:
+        mtime = os.stat(MEETINGS_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    
+    if _meetings_cache['data'] is not None and _meetings_cache['mtime'] == mtime:
+        return _meetings_cache['data']
+    
+    with open(MEETINGS_FILE, 'rb') as f:
+        meetings = _json_loads(f.read())
+    _attach_embeddings(meetings)
+    
+    _meetings_cache['data'] = meetings
+    _index_meetings(meetings)
+    _meetings_cache['mtime'] = mtime
+    return meetings
+
+def get_meeting_by_id(meeting_id):
+    """Look up a meeting by id (int or str) without scanning the list"""
+    load_meetings()
+    return _meetings_cache['by_id'].get(str(meeting_id))
+
+def _atomic_write(path, write):
+    """Write a file via a temp file and rename so readers never see a partial file"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def _write_pending_snapshot():
+    """Background writer: persist the latest snapshot, skipping superseded ones"""
+    try:
+        with _store_lock:
+            snapshot = _store_state['snapshot']
+            _store_state['snapshot'] = None
+        if snapshot is None:
+            return
+        
+        # Files are written in order: the embedding matrix goes before the
+        # records that index into it; the old file stays valid for any
+        # memory maps still pointing at it
+        for path, payload, cache in snapshot:
+            if isinstance(payload, np.ndarray):
+                _atomic_write(path, lambda f: np.save(f, payload))
+            else:
+                _atomic_write(path, lambda f: f.write(payload))
+            if cache is not None:
+                cache['mtime'] = os.stat(path).st_mtime_ns
+    
+    except Exception as e:
+        print(f"Failed to write meetings: {str(e)}")
+    
+    finally:
+        with _store_lock:
+            _store_state['in_flight'] -= 1
 
 def save_meetings(meetings):
-    """Save meetings to JSON file"""
-    os.makedirs('data', exist_ok=True)
-    with open('data/meetings.json', 'w', encoding='utf-8') as f:
-        json.dump(meetings, f, indent=2, ensure_ascii=False)
+    """
+    Save meetings and refresh the in-memory cache
+    
+    Serialization happens on the calling thread; the disk write is handed
+    to the background writer so the request doesn't wait on it. Saves
+    issued in quick succession collapse into a single write.
+    """
+    records, matrix = _split_embeddings(meetings)
+    stats = compute_stats(meetings)
+    meeting_list = [meeting_list_entry(m) for m in meetings]
+    
+    snapshot = []
+    if matrix is not None:
+        snapshot.append((EMBEDDINGS_FILE, matrix, None))
+    snapshot += [
+        (MEETINGS_FILE, _json_dumps(records), _meetings_cache),
+        (STATS_FILE, _json_dumps(stats), _stats_cache),
+        (INDEX_FILE, _json_dumps(meeting_list), _index_cache)
+    ]
+    
+    with _store_lock:
+        _store_state['snapshot'] = snapshot
+        _store_state['in_flight'] += 1
+        _meetings_cache['data'] = meetings
+        _index_meetings(meetings)
+        _stats_cache['data'] = stats
+        _index_cache['data'] = meeting_list
+    search_service.invalidate_index()
+    _store_writer.submit(_write_pending_snapshot)
+
+def flush_meetings():
+    """Block until all pending meeting writes have reached the disk"""
+    _store_writer.submit(lambda: None).result()
+
+def compute_stats(meetings):
+    """Aggregate meeting statistics (done once per save, not per /stats request)"""
+    return {
+        'total_meetings': len(meetings),
+        'total_duration': sum((m.get('analysis') or {}).get('duration_minutes', 0) for m in meetings),
+        'action_items_count': sum(len((m.get('analysis') or {}).get('action_items', [])) for m in meetings),
+        'decisions_count': sum(len((m.get('analysis') or {}).get('key_decisions', [])) for m in meetings)
+    }
+
+def meeting_list_entry(meeting):
+    """List-view fields of a meeting (computed once per save for the index file)"""
+    summary = (meeting.get('analysis') or {}).get('summary', '')
+    filename = meeting.get('filename', '')
+    return {
+        'id': meeting.get('id'),
+        'title': meeting.get('title', f"Meeting - {filename}"),
+        'filename': filename,
+        'timestamp': meeting.get('timestamp', ''),
+        'attendees': meeting.get('attendees', []),
+        'summary': summary[:200] + '...' if len(summary) > 200 else summary
+    }
+
+def _load_derived(path, cache, compute):
+    """
+    Load a file derived from the meetings on save (stats, list index)
+    
+    The file is re-read only when it changes; stores written before the
+    file existed fall back to computing it from the full meeting list.
+    """
+    with _store_lock:
+        if _store_state['in_flight']:
+            return cache['data']
+    
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return compute(load_meetings())
+    
+    if cache['data'] is None or cache['mtime'] != mtime:
+        with open(path, 'rb') as f:
+            cache['data'] = _json_loads(f.read())
+        cache['mtime'] = mtime
+    return cache['data']
+
+def load_stats():
+    """Load precomputed meeting statistics"""
+    return _load_derived(STATS_FILE, _stats_cache, compute_stats)
+
+def load_meeting_list():
+    """Load the list-view summary of every meeting without the full records"""
+    return _load_derived(INDEX_FILE, _index_cache,
+                         lambda meetings: [meeting_list_entry(m) for m in meetings])
+
+def update_meeting(meeting_id, **fields):
+    """Set fields on a stored meeting and save, serialized with other updates"""
+    with _meetings_update_lock:
+        meetings = load_meetings()
+        meeting = get_meeting_by_id(meeting_id)
+        if meeting is not None:
+            meeting.update(fields)
+            save_meetings(meetings)
+        return meeting
+
+def next_meeting_id(meetings):
+    """Next free integer meeting id (realtime sessions use string ids)"""
+    if meetings is _meetings_cache['data']:
+        return _meetings_cache['next_id']
+    return max((m['id'] for m in meetings if isinstance(m.get('id'), int)), default=0) + 1
 
 @app.route('/')
 def index():
@@ -88,12 +409,11 @@ def upload_file():
         
         # Save uploaded file
         filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
         filename = f"{timestamp}_{filename}"
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         
-        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-        file.save(filepath)
+        save_upload(file, filepath)
         
         return jsonify({
             'success': True,
@@ -104,8 +424,125 @@ def upload_file():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _job_path(job_id):
+    return os.path.join(JOBS_DIR, f"{job_id}.json")
+
+def _set_job_status(job_id, status, **fields):
+    """Record a job's status where every worker process can read it"""
+    _atomic_write(_job_path(job_id), lambda f: f.write(_json_dumps({'job_id': job_id, 'status': status, **fields})))
+
+def load_job(job_id):
+    """Read a job's status, or None for unknown ids"""
+    try:
+        with open(_job_path(job_id), 'rb') as f:
+            return _json_loads(f.read())
+    except FileNotFoundError:
+        return None
+
+def fail_interrupted_jobs(pid=None):
+    """
+    Mark queued and running jobs that can no longer finish as failed
+    
+    Jobs only live in the memory of the worker that accepted them, so when
+    it exits their status files would otherwise stay unfinished forever.
+    
+    Args:
+        pid: Only fail jobs of this (exited) worker process; None fails all
+            of them, which is only safe before any worker has started
+        
+    Returns:
+        Number of jobs marked as failed
+    """
+    if not os.path.isdir(JOBS_DIR):
+        return 0
+    
+    failed = 0
+    for name in os.listdir(JOBS_DIR):
+        if not name.endswith('.json'):
+            continue
+        job = load_job(name[:-len('.json')])
+        if not job or job.get('status') not in ('queued', 'started'):
+            continue
+        if pid is not None and job.get('pid') != pid:
+            continue
+        _set_job_status(job['job_id'], 'failed', error='Processing was interrupted by a server restart')
+        failed += 1
+    return failed
+
+def run_meeting_pipeline(filepath, filename, meeting_title, attendees):
+    """
+    Transcribe, analyze and store an uploaded meeting
+    
+    Args:
+        filepath: Path of the uploaded audio file
+        filename: Stored upload filename
+        meeting_title: Title for the meeting
+        attendees: List of attendee names
+        
+    Returns:
+        Summary of the stored meeting
+    """
+    # Step 1: Transcribe audio
+    print(f"Transcribing audio file: {filename}")
+    transcript = audio_service.transcribe(filepath)
+    
+    # Steps 2-4 only depend on the transcript (and the summary), so the
+    # API calls overlap: embedding runs alongside analysis and visual
+    # generation starts as soon as the summary is available
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        print("Analyzing meeting content and creating embeddings...")
+        analysis_future = executor.submit(analysis_service.analyze_meeting, transcript)
+        embedding_future = executor.submit(search_service.create_embedding, transcript)
+        
+        analysis = analysis_future.result()
+        print("Generating visual summary...")
+        visual_future = executor.submit(visual_service.generate_visual_summary, analysis['summary'])
+        
+        embedding = embedding_future.result()
+        visual_url = visual_future.result()
+    
+    # Save meeting data
+    meeting_data = {
+        'title': meeting_title,
+        'filename': filename,
+        'timestamp': datetime.now().isoformat(),
+        'attendees': attendees,
+        'transcript': transcript,
+        'analysis': analysis,
+        'embedding': embedding,
+        'visual_url': visual_url
+    }
+    
+    with _meetings_update_lock:
+        meetings = load_meetings()
+        meeting_data['id'] = next_meeting_id(meetings)
+        meetings.append(meeting_data)
+        save_meetings(meetings)
+    
+    # Don't clean up uploaded file - keep for reference
+    # os.remove(filepath)  # Commented out to preserve files
+    
+    return {
+        'id': meeting_data['id'],
+        'title': meeting_title,
+        'timestamp': meeting_data['timestamp'],
+        'analysis': analysis,
+        'visual_url': visual_url
+    }
+
+def _run_meeting_job(job_id, *args):
+    """Background job wrapper around run_meeting_pipeline"""
+    try:
+        _set_job_status(job_id, 'started', pid=os.getpid())
+        meeting = run_meeting_pipeline(*args)
+        _set_job_status(job_id, 'finished', meeting=meeting)
+    except Exception as e:
+        print(f"Error processing meeting: {str(e)}")
+        _set_job_status(job_id, 'failed', error=str(e))
+
 @app.route('/process/<filename>', methods=['POST'])
 def process_meeting(filename):
+    """Queue an uploaded file for processing; poll /jobs/<job_id> for the result"""
     try:
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         
@@ -116,72 +553,35 @@ def process_meeting(filename):
         meeting_title = request.json.get('title', f'Meeting - {filename}') if request.is_json else f'Meeting - {filename}'
         attendees = request.json.get('attendees', []) if request.is_json else []
         
-        # Step 1: Transcribe audio
-        print(f"Transcribing audio file: {filename}")
-        transcript = audio_service.transcribe(filepath)
-        
-        # Step 2: Analyze content
-        print("Analyzing meeting content...")
-        analysis = analysis_service.analyze_meeting(transcript)
-        
-        # Step 3: Generate embeddings for search
-        print("Creating embeddings...")
-        embedding = search_service.create_embedding(transcript)
-        
-        # Step 4: Generate visual summary
-        print("Generating visual summary...")
-        visual_url = visual_service.generate_visual_summary(analysis['summary'])
+        job_id = uuid.uuid4().hex
+        _set_job_status(job_id, 'queued', pid=os.getpid())
+        _job_executor.submit(_run_meeting_job, job_id, filepath, filename, meeting_title, attendees)
         
-        # Save meeting data
-        meeting_data = {
-            'id': len(load_meetings()) + 1,
-            'title': meeting_title,
-            'filename': filename,
-            'timestamp': datetime.now().isoformat(),
-            'attendees': attendees,
-            'transcript': transcript,
-            'analysis': analysis,
-            'embedding': embedding.tolist() if hasattr(embedding, 'tolist') else embedding,
-            'visual_url': visual_url
-        }
-        
-        meetings = load_meetings()
-        meetings.append(meeting_data)
-        save_meetings(meetings)
-        
-        # Don't clean up uploaded file - keep for reference
-        # os.remove(filepath)  # Commented out to preserve files
-        
-        return jsonify({
-            'success': True,
-            'meeting': {
-                'id': meeting_data['id'],
-                'title': meeting_title,
-                'timestamp': meeting_data['timestamp'],
-                'analysis': analysis,
-                'visual_url': visual_url
-            }
-        })
+        status_url = url_for('get_job', job_id=job_id)
+        return jsonify({'success': True, 'job_id': job_id, 'status_url': status_url}), 202, {'Location': status_url}
     
     except Exception as e:
         print(f"Error processing meeting: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    """Get the status of a background processing job"""
+    try:
+        job = load_job(secure_filename(job_id))
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify(job)
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/meetings')
 def get_meetings():
     try:
-        meetings = load_meetings()
-        # Return simplified meeting list
-        meeting_list = [{
-            'id': m['id'],
-            'title': m.get('title', f"Meeting - {m['filename']}"),
-            'filename': m['filename'],
-            'timestamp': m['timestamp'],
-            'attendees': m.get('attendees', []),
-            'summary': m['analysis']['summary'][:200] + '...' if len(m['analysis']['summary']) > 200 else m['analysis']['summary']
-        } for m in meetings]
-        
-        return jsonify({'meetings': meeting_list})
+        meeting_list = load_meeting_list()
+        
+        return stream_json_list('meetings', meeting_list)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -189,23 +589,31 @@ def get_meetings():
 @app.route('/meetings/<int:meeting_id>')
 def get_meeting(meeting_id):
     try:
-        meetings = load_meetings()
-        meeting = next((m for m in meetings if m['id'] == meeting_id), None)
+        meeting = get_meeting_by_id(meeting_id)
         
         if not meeting:
             return jsonify({'error': 'Meeting not found'}), 404
         
         # Check if visual_url is missing or expired, regenerate if needed
+        # (locally stored images are served from /static; the placeholder
+        # stands in for a visual that could not be generated yet)
         visual_url = meeting.get('visual_url', '')
-        if not visual_url or not visual_url.startswith('http'):
+        
+        # Swap a temporary OpenAI URL for its local copy once that is stored
+        local_url = visual_service.local_url(visual_url)
+        if local_url:
+            visual_url = local_url
+            update_meeting(meeting_id, visual_url=visual_url)
+        
+        if (not visual_url or visual_url == PLACEHOLDER_URL
+                or not visual_url.startswith(('http', '/static/'))):
             try:
                 print(f"Regenerating visual summary for meeting {meeting_id}")
                 summary = meeting.get('analysis', {}).get('summary', '')
                 if summary:
                     visual_url = visual_service.generate_visual_summary(summary)
                     # Update the meeting data
-                    meeting['visual_url'] = visual_url
-                    save_meetings(meetings)
+                    update_meeting(meeting_id, visual_url=visual_url)
             except Exception as e:
                 print(f"Failed to regenerate visual: {str(e)}")
                 visual_url = None
@@ -258,14 +666,7 @@ def search_meetings():
 def get_stats():
     """Get meeting statistics"""
     try:
-        meetings = load_meetings()
-        stats = {
-            'total_meetings': len(meetings),
-            'total_duration': sum(m.get('analysis', {}).get('duration_minutes', 0) for m in meetings),
-            'action_items_count': sum(len(m.get('analysis', {}).get('action_items', [])) for m in meetings),
-            'decisions_count': sum(len(m.get('analysis', {}).get('decisions', [])) for m in meetings)
-        }
-        return jsonify(stats)
+        return jsonify(load_stats())
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -289,29 +690,37 @@ def not_found(e):
 def migrate_old_meetings():
     """Add embeddings to old meetings that might be missing them"""
     try:
-        meetings = load_meetings()
-        updated = False
-        
-        for i, meeting in enumerate(meetings):
-            if 'embedding' not in meeting or not meeting['embedding']:
-                print(f"Adding embedding to meeting {meeting.get('id', i+1)}")
+        # Runs at startup, but holds the lock like any other load-modify-save
+        with _meetings_update_lock:
+            meetings = load_meetings()
+            updated = False
+            
+            # Meetings without an embedding that have a transcript to create one from
+            pending = [
+                (i, meeting, meeting['transcript'])
+                for i, meeting in enumerate(meetings)
+                if not _has_embedding(meeting) and meeting.get('transcript', '').strip()
+            ]
+            
+            if pending:
+                print(f"Adding embeddings to {len(pending)} meetings")
                 try:
-                    # Create embedding from transcript
-                    transcript = meeting.get('transcript', '')
-                    if transcript:
-                        embedding = search_service.create_embedding(transcript)
-                        meeting['embedding'] = embedding.tolist() if hasattr(embedding, 'tolist') else embedding
-                        updated = True
+                    # One batched Embeddings API call instead of one per meeting
+                    embeddings = search_service.create_embeddings_batch([t for _, _, t in pending])
+                    for (_, meeting, _), embedding in zip(pending, embeddings):
+                        meeting['embedding'] = embedding
+                    updated = True
                 except Exception as e:
-                    print(f"Failed to create embedding for meeting {meeting.get('id', i+1)}: {str(e)}")
+                    print(f"Failed to create embeddings for meetings {[m.get('id', i+1) for i, m, _ in pending]}: {str(e)}")
                     # Add empty embedding to prevent repeated attempts
-                    meeting['embedding'] = []
-        
-        if updated:
-            save_meetings(meetings)
-            print("Migration completed successfully")
-        else:
-            print("No migration needed")
+                    for _, meeting, _ in pending:
+                        meeting['embedding'] = []
+            
+            if updated:
+                save_meetings(meetings)
+                print("Migration completed successfully")
+            else:
+                print("No migration needed")
             
     except Exception as e:
         print(f"Migration failed: {str(e)}")
@@ -319,8 +728,7 @@ def migrate_old_meetings():
 @app.route('/meetings/<int:meeting_id>/regenerate-visual', methods=['POST'])
 def regenerate_visual(meeting_id):
     try:
-        meetings = load_meetings()
-        meeting = next((m for m in meetings if m['id'] == meeting_id), None)
+        meeting = get_meeting_by_id(meeting_id)
         
         if not meeting:
             return jsonify({'success': False, 'error': 'Meeting not found'}), 404
@@ -330,12 +738,13 @@ def regenerate_visual(meeting_id):
         if not summary:
             return jsonify({'success': False, 'error': 'No summary available for visual generation'}), 400
         
-        # Generate new visual
-        visual_url = visual_service.generate_visual_summary(summary)
+        # Generate new visual (an explicit regenerate skips the cached image);
+        # ?draft=1 asks for a quick low-resolution preview
+        draft = request.args.get('draft', '').lower() in ('1', 'true')
+        visual_url = visual_service.generate_visual_summary(summary, use_cache=False, draft=draft)
         
         # Update meeting data
-        meeting['visual_url'] = visual_url
-        save_meetings(meetings)
+        update_meeting(meeting_id, visual_url=visual_url)
         
         return jsonify({
             'success': True,
@@ -355,8 +764,7 @@ def create_calendar_events():
         if not meeting_id:
             return jsonify({'success': False, 'error': 'Meeting ID required'}), 400
         
-        meetings = load_meetings()
-        meeting = next((m for m in meetings if m.get('id') == meeting_id), None)
+        meeting = get_meeting_by_id(meeting_id)
         
         if not meeting:
             return jsonify({'success': False, 'error': 'Meeting not found'}), 404
@@ -383,8 +791,7 @@ def create_task_assignments():
         if not meeting_id:
             return jsonify({'success': False, 'error': 'Meeting ID required'}), 400
         
-        meetings = load_meetings()
-        meeting = next((m for m in meetings if m.get('id') == meeting_id), None)
+        meeting = get_meeting_by_id(meeting_id)
         
         if not meeting:
             return jsonify({'success': False, 'error': 'Meeting not found'}), 404
@@ -401,6 +808,63 @@ def create_task_assignments():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/analysis/stream', methods=['POST'])
+def stream_analysis():
+    """Analyze a transcript, sending each field as an event as soon as the model has written it"""
+    data = request.get_json() or {}
+    transcript = data.get('transcript', '')
+    
+    if not transcript.strip():
+        return jsonify({'success': False, 'error': 'No transcript provided'}), 400
+    
+    return stream_events(analysis_service.astream_analysis(transcript))
+
+@app.route('/api/analysis/batch', methods=['POST'])
+def submit_analysis_batch():
+    """Re-analyze meetings through the OpenAI Batch API (results within 24h, half the cost)"""
+    try:
+        data = request.get_json() or {}
+        meeting_ids = data.get('meeting_ids')
+        
+        if meeting_ids is None:
+            meetings = load_meetings()
+        else:
+            meetings = [m for m in (get_meeting_by_id(i) for i in meeting_ids) if m]
+        transcripts = [(m['id'], m['transcript']) for m in meetings if m.get('transcript', '').strip()]
+        
+        if not transcripts:
+            return jsonify({'success': False, 'error': 'No meetings with transcripts to analyze'}), 400
+        
+        batch_id = analysis_service.analyze_meeting_batch(transcripts)
+        return jsonify({'success': True, 'batch_id': batch_id, 'meetings': len(transcripts)}), 202
+    
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/analysis/batch/<batch_id>')
+def get_analysis_batch(batch_id):
+    """Poll an analysis batch and store the new analyses once it has completed"""
+    try:
+        results = analysis_service.poll_batch(batch_id)
+        if results is None:
+            return jsonify({'success': True, 'status': 'in_progress'})
+        
+        updated = 0
+        with _meetings_update_lock:
+            meetings = load_meetings()
+            for meeting_id, analysis in results.items():
+                meeting = get_meeting_by_id(meeting_id)
+                if meeting:
+                    meeting['analysis'] = analysis
+                    updated += 1
+            if updated:
+                save_meetings(meetings)
+        
+        return jsonify({'success': True, 'status': 'completed', 'updated': updated})
+    
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/insights', methods=['GET'])
 def get_cross_meeting_insights():
     """Get cross-meeting insights and recommendations"""
@@ -421,12 +885,12 @@ def get_similar_meetings(meeting_id):
     """Get meetings similar to the specified meeting"""
     try:
         meetings = load_meetings()
-        target_meeting = next((m for m in meetings if m.get('id') == meeting_id), None)
+        target_meeting = get_meeting_by_id(meeting_id)
         
         if not target_meeting:
             return jsonify({'success': False, 'error': 'Meeting not found'}), 404
         
-        similar_meetings = search_service.find_similar_meetings(target_meeting, meetings)
+        similar_meetings = search_service.find_similar_meetings(target_meeting['id'], meetings)
         
         return jsonify({
             'success': True,
@@ -444,13 +908,13 @@ def start_realtime_session():
     
     try:
         data = request.get_json()
-        session_id = data.get('session_id', f"session_{datetime.now().timestamp()}")
+        session_id = data.get('session_id') or f"session_{time.time_ns()}"
         
         session = realtime_service.create_session(session_id)
         
         return jsonify({
             'success': True,
-            'session': session
+            'session': session.to_dict()
         })
     
     except Exception as e:
@@ -463,15 +927,20 @@ def process_realtime_audio():
         return jsonify({'success': False, 'error': 'Real-time transcription not available. Please install websockets.'}), 501
     
     try:
-        data = request.get_json()
-        session_id = data.get('session_id')
-        audio_data = data.get('audio_data')  # Base64 encoded
+        if request.is_json:
+            # Legacy clients: {"session_id": ..., "audio_data": <base64>}
+            import base64
+            data = request.get_json()
+            session_id = data.get('session_id')
+            audio_bytes = base64.b64decode(data.get('audio_data') or '')
+        else:
+            # Raw audio body (application/octet-stream), session id in the query string
+            session_id = request.args.get('session_id')
+            audio_bytes = request.get_data(cache=False)
         
-        if not session_id or not audio_data:
+        if not session_id or not audio_bytes:
             return jsonify({'success': False, 'error': 'Missing session_id or audio_data'}), 400
         
-        import base64
-        audio_bytes = base64.b64decode(audio_data)
         result = realtime_service.process_audio_chunk(session_id, audio_bytes)
         
         return jsonify({
@@ -493,12 +962,10 @@ def end_realtime_session(session_id):
         
         # Save the completed session as a regular meeting
         if 'full_transcription' in summary and summary['full_transcription'].strip():
-            meetings = load_meetings()
-            
             new_meeting = {
                 'id': f"realtime_{session_id}",
                 'filename': f"realtime_session_{session_id}",
-                'timestamp': summary.get('created_at', datetime.now().isoformat()),
+                'timestamp': summary.get('created_at') or datetime.now().isoformat(),
                 'transcription': summary['full_transcription'],
                 'analysis': summary.get('final_analysis'),
                 'realtime_data': {
@@ -511,9 +978,7 @@ def end_realtime_session(session_id):
             
             # Create embedding for the transcription
             if new_meeting['transcription']:
-                embedding = search_service.create_embedding(new_meeting['transcription'])
-                if embedding:
-                    new_meeting['embedding'] = embedding
+                new_meeting['embedding'] = search_service.create_embedding(new_meeting['transcription'])
             
             # Generate visual summary if we have analysis
             if new_meeting['analysis'] and new_meeting['analysis'].get('summary'):
@@ -521,8 +986,10 @@ def end_realtime_session(session_id):
                 if visual_url:
                     new_meeting['visual_url'] = visual_url
             
-            meetings.append(new_meeting)
-            save_meetings(meetings)
+            with _meetings_update_lock:
+                meetings = load_meetings()
+                meetings.append(new_meeting)
+                save_meetings(meetings)
         
         return jsonify({
             'success': True,
@@ -600,14 +1067,35 @@ def create_bulk_task_assignments():
             'error': str(e)
         }), 500
 
-if __name__ == '__main__':
-    # Ensure required directories exist
+def initialize_app():
+    """One-time startup work shared by the dev server and gunicorn"""
+    # Ensure required directories exist; request handlers assume they do
     os.makedirs('data', exist_ok=True)
+    os.makedirs(JOBS_DIR, exist_ok=True)
     os.makedirs('uploads', exist_ok=True)
     os.makedirs('static/images', exist_ok=True)
     
+    # Jobs still queued or running were lost with the previous server
+    interrupted = fail_interrupted_jobs()
+    if interrupted:
+        print(f"Marked {interrupted} interrupted processing jobs as failed")
+    
     # Migrate old meetings to add missing embeddings
     print("Checking for meetings that need migration...")
     migrate_old_meetings()
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Stores from before stats/list files existed: write them once now so
+    # /stats and /meetings never have to fall back to parsing every record
+    if not (os.path.exists(STATS_FILE) and os.path.exists(INDEX_FILE)):
+        with _meetings_update_lock:
+            meetings = load_meetings()
+            if meetings:
+                save_meetings(meetings)
+    
+    # Startup saves must be on disk before workers start reading the store
+    flush_meetings()
+
+if __name__ == '__main__':
+    # Development server only; use `gunicorn -c gunicorn_conf.py app:app` in production
+    initialize_app()
+    app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,43 @@
+"""
+Gunicorn configuration for production deployments
+
+Usage: gunicorn -c gunicorn_conf.py app:app
+
+The gevent worker monkey-patches the standard library when it boots, so
+OpenAI HTTP calls, file I/O waits and sleeps yield to other requests
+instead of blocking the whole worker.
+"""
+
+import os
+import subprocess
+import sys
+
+bind = os.getenv('BIND', '0.0.0.0:5000')
+
+# One worker by default: each worker keeps its own in-memory copy of the
+# meeting store and writes meetings.json from it, so concurrent saves in
+# several processes would overwrite each other (real-time sessions also
+# live in worker memory). gevent still serves many requests per worker.
+# Only raise WEB_CONCURRENCY for read-mostly deployments.
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+worker_class = 'gevent'
+worker_connections = 1000
+
+# /process/<filename> waits on Whisper, GPT-4 and DALL-E in one request
+timeout = 300
+graceful_timeout = 30
+
+
+def on_starting(server):
+    """Create data directories and migrate old meetings once, before any worker starts"""
+    # Run in a separate process: importing app here would build the services
+    # and start the meetings writer thread in the master, which forked
+    # workers inherit without the thread (their saves would never be written)
+    subprocess.run([sys.executable, '-c', 'import app; app.initialize_app()'],
+                   cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+
+
+def child_exit(server, worker):
+    """Fail the processing jobs a worker still had when it exited or was recycled"""
+    subprocess.run([sys.executable, '-c', f'import app; app.fail_interrupted_jobs({worker.pid})'],
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
@@ -6,20 +6,25 @@ Simple test runner for Smart Meeting Assistant
 import os
 import sys
 import subprocess
+import importlib.util
 
 def run_tests():
     """Run all tests and display results"""
     print("🧪 Running Smart Meeting Assistant Test Suite...")
     print("=" * 60)
     
-    # Change to tests directory
-    test_dir = os.path.join(os.path.dirname(__file__), 'tests')
+    root_dir = os.path.dirname(os.path.abspath(__file__))
+    command = [sys.executable, '-m', 'pytest', '-v']
+    
+    # Spread the (independent) test classes over all cores when
+    # pytest-xdist is installed; each class stays on one worker because
+    # some patch OpenAI once per class
+    if importlib.util.find_spec('xdist') is not None:
+        command += ['-n', 'auto', '--dist', 'loadscope']
     
     try:
         # Run comprehensive tests
-        result = subprocess.run([
-            sys.executable, 'test_comprehensive.py'
-        ], cwd=test_dir, capture_output=True, text=True)
+        result = subprocess.run(command, cwd=root_dir, capture_output=True, text=True)
         
         print(result.stdout)
         if result.stderr:
@@ -0,0 +1,4 @@
+import logging
+
+# Logging is configured by the application (app.py); the services only emit
+logging.getLogger(__name__).addHandler(logging.NullHandler())
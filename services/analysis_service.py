@@ -1,17 +1,166 @@
 import os
+import re
 import json
-from openai import OpenAI
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from openai import AsyncOpenAI
+from services.openai_client import get_client, get_async_client
 import logging
-from typing import Dict, Any
+from collections import Counter
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+from services.llm_cache import LLMCache
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Calendar/task integration schema, shared by the combined analysis call
+# and the standalone follow-up call for older analyses
+TASK_INTEGRATION_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "calendar_events": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "description": {"type": "string"},
+                    "suggested_date": {"type": "string"},
+                    "duration": {"type": "integer"},
+                    "attendees": {"type": "array", "items": {"type": "string"}}
+                }
+            }
+        },
+        "task_assignments": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "task_title": {"type": "string"},
+                    "description": {"type": "string"},
+                    "assignee": {"type": "string"},
+                    "due_date": {"type": "string"},
+                    "project": {"type": "string"}
+                }
+            }
+        }
+    }
+}
+
+# Prompt caching only applies to gpt-4o-family models, and only to a
+# byte-identical prefix: the system prompt and tool schemas below are
+# module constants and the variable content goes last in the user message
+ANALYSIS_MODEL = os.getenv('ANALYSIS_MODEL', 'gpt-4o')
+
+# Short, simple transcripts (stand-ups, quick syncs) go to the much cheaper
+# model; anything longer or with many speaker turns keeps ANALYSIS_MODEL
+SIMPLE_ANALYSIS_MODEL = os.getenv('SIMPLE_ANALYSIS_MODEL', 'gpt-4o-mini')
+SIMPLE_TRANSCRIPT_MAX_CHARS = 4000
+SIMPLE_TRANSCRIPT_MAX_LINES = 50
+
+# Long transcripts are analyzed in overlapping chunks (~6000 tokens at
+# ~4 characters per token) whose partial analyses are then merged
+CHUNK_MAX_CHARS = 24000
+CHUNK_OVERLAP_CHARS = 800
+MAX_PARALLEL_CHUNKS = 4
+
+# Fields emitted by astream_analysis() as soon as the model has finished
+# writing them, before the (slow) action item list is complete
+STREAMED_FIELDS = ('summary', 'participants', 'topics')
+_STREAMED_FIELD_RES = {field: re.compile(r'"%s"\s*:\s*' % field) for field in STREAMED_FIELDS}
+
+INSIGHTS_SYSTEM_PROMPT = """You are an expert meeting analyst for KIU Consulting. Analyze meeting transcripts to extract actionable insights that will help reduce the 25,000 GEL annual cost per employee from ineffective meetings.
+
+Focus on:
+- Clear, actionable summaries
+- Specific action items with owners
+- Key decisions and their business impact
+- Meeting effectiveness assessment
+- Recommendations for improvement
+- Calendar events and task assignments for the action items
+
+Be precise and business-focused in your analysis."""
+
+INTEGRATION_SYSTEM_PROMPT = "You are a task management assistant. Convert meeting insights into actionable calendar events and task assignments."
+
+INSIGHTS_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "extract_meeting_insights",
+            "description": "Extract structured insights and follow-up tasks from meeting transcript",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "summary": {"type": "string", "description": "2-3 paragraphs"},
+                    "key_decisions": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "decision": {"type": "string"},
+                                "context": {"type": "string"},
+                                "impact": {"type": "string"}
+                            }
+                        }
+                    },
+                    "action_items": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "task": {"type": "string"},
+                                "owner": {"type": "string"},
+                                "deadline": {"type": "string"},
+                                "priority": {"type": "string", "enum": ["high", "medium", "low"]}
+                            }
+                        }
+                    },
+                    "participants": {"type": "array", "items": {"type": "string"}},
+                    "topics": {"type": "array", "items": {"type": "string"}},
+                    "score": {"type": "integer", "minimum": 1, "maximum": 10, "description": "Meeting effectiveness"},
+                    "recommendations": {"type": "array", "items": {"type": "string"}},
+                    "task_integration": TASK_INTEGRATION_PARAMETERS
+                },
+                "required": ["summary", "action_items", "key_decisions", "participants", "topics", "task_integration"]
+            }
+        }
+    }
+]
+
+# The tool schema uses short property names to save input tokens on every
+# call; results are stored under the established analysis field names
+_SCHEMA_TO_ANALYSIS_FIELDS = {
+    'topics': 'topics_discussed',
+    'score': 'meeting_effectiveness_score'
+}
+
+def normalize_insights(insights: Dict[str, Any]) -> Dict[str, Any]:
+    """Rename short tool-schema fields to the analysis field names"""
+    return {_SCHEMA_TO_ANALYSIS_FIELDS.get(key, key): value for key, value in insights.items()}
+
+INTEGRATION_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "create_task_integration",
+            "description": "Create task and calendar integration recommendations",
+            "parameters": TASK_INTEGRATION_PARAMETERS
+        }
+    }
+]
+
 class AnalysisService:
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
         if not os.getenv('OPENAI_API_KEY'):
             raise ValueError("OPENAI_API_KEY environment variable is required")
+        self.client = get_client()
+        self.cache = LLMCache()
+        self.model_usage = Counter()  # Routing decisions, for cost tracking
+    
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """OpenAI client for the running event loop (only usable inside a coroutine)"""
+        return get_async_client()
     
     def analyze_meeting(self, transcript: str) -> Dict[str, Any]:
         """
@@ -24,110 +173,43 @@ class AnalysisService:
             dict: Analysis results with summary, action items, and decisions
         """
         try:
-            if not transcript or not transcript.strip():
-                raise ValueError("Transcript cannot be empty")
+            chunks = self._split_transcript(transcript)
+            if len(chunks) == 1:
+                return self._complete_insights(self._insights_request(transcript))
             
-            # Updated function schema for modern OpenAI API
-            tools = [
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "extract_meeting_insights",
-                        "description": "Extract structured insights from meeting transcript",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "summary": {
-                                    "type": "string",
-                                    "description": "Concise meeting summary (2-3 paragraphs)"
-                                },
-                                "key_decisions": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "decision": {"type": "string"},
-                                            "context": {"type": "string"},
-                                            "impact": {"type": "string"}
-                                        }
-                                    },
-                                    "description": "List of key decisions made"
-                                },
-                                "action_items": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "task": {"type": "string"},
-                                            "owner": {"type": "string"},
-                                            "deadline": {"type": "string"},
-                                            "priority": {"type": "string", "enum": ["high", "medium", "low"]}
-                                        }
-                                    },
-                                    "description": "List of action items with owners"
-                                },
-                                "participants": {
-                                    "type": "array",
-                                    "items": {"type": "string"},
-                                    "description": "List of meeting participants"
-                                },
-                                "topics_discussed": {
-                                    "type": "array",
-                                    "items": {"type": "string"},
-                                    "description": "Main topics discussed"
-                                },
-                                "meeting_effectiveness_score": {
-                                    "type": "integer",
-                                    "minimum": 1,
-                                    "maximum": 10,
-                                    "description": "Meeting effectiveness score (1-10)"
-                                },
-                                "recommendations": {
-                                    "type": "array",
-                                    "items": {"type": "string"},
-                                    "description": "Recommendations for follow-up"
-                                }
-                            },
-                            "required": ["summary", "action_items", "key_decisions", "participants", "topics_discussed"]
-                        }
-                    }
-                }
-            ]
-            
-            # Analyze transcript with GPT-4
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an expert meeting analyst for KIU Consulting. Analyze meeting transcripts to extract actionable insights that will help reduce the 25,000 GEL annual cost per employee from ineffective meetings.
-
-Focus on:
-- Clear, actionable summaries
-- Specific action items with owners
-- Key decisions and their business impact
-- Meeting effectiveness assessment
-- Recommendations for improvement
-
-Be precise and business-focused in your analysis."""
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Analyze this meeting transcript and extract key insights:\n\n{transcript[:4000]}"  # Limit to avoid token limits
-                    }
-                ],
-                tools=tools,
-                tool_choice={"type": "function", "function": {"name": "extract_meeting_insights"}}
-            )
-            
-            # Parse function call result
-            if response.choices[0].message.tool_calls:
-                function_call = response.choices[0].message.tool_calls[0]
-                insights = json.loads(function_call.function.arguments)
-                logger.info("Successfully analyzed meeting transcript")
-                return insights
-            else:
-                raise Exception("No function call in response")
+            # Map: analyze the chunks in parallel; reduce: merge the partial analyses
+            requests = [self._insights_request(chunk, part=(i + 1, len(chunks))) for i, chunk in enumerate(chunks)]
+            with ThreadPoolExecutor(max_workers=min(len(chunks), MAX_PARALLEL_CHUNKS)) as executor:
+                partials = list(executor.map(self._complete_insights, requests))
+            return self._complete_insights(self._merge_request(partials))
+        
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON parsing error in meeting analysis: {str(e)}")
+            # Return fallback analysis
+            return self._fallback_analysis(transcript)
+        
+        except Exception as e:
+            logger.error(f"Meeting analysis failed: {str(e)}")
+            return self._fallback_analysis(transcript)
+    
+    async def aanalyze_meeting(self, transcript: str) -> Dict[str, Any]:
+        """
+        Async variant of analyze_meeting() for overlapping several analyses
+        
+        Args:
+            transcript (str): Meeting transcript
+            
+        Returns:
+            dict: Analysis results with summary, action items, and decisions
+        """
+        try:
+            chunks = self._split_transcript(transcript)
+            if len(chunks) == 1:
+                return await self._acomplete_insights(self._insights_request(transcript))
+            
+            requests = [self._insights_request(chunk, part=(i + 1, len(chunks))) for i, chunk in enumerate(chunks)]
+            partials = await asyncio.gather(*[self._acomplete_insights(request) for request in requests])
+            return await self._acomplete_insights(self._merge_request(partials))
         
         except json.JSONDecodeError as e:
             logger.error(f"JSON parsing error in meeting analysis: {str(e)}")
@@ -138,6 +220,324 @@ Be precise and business-focused in your analysis."""
             logger.error(f"Meeting analysis failed: {str(e)}")
             return self._fallback_analysis(transcript)
     
+    async def astream_analysis(self, transcript: str) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Analyze a transcript, yielding fields of the analysis as they complete
+        
+        Args:
+            transcript (str): Meeting transcript
+            
+        Yields:
+            tuple: (field, value) for each of STREAMED_FIELDS as soon as the
+                model has written it, then ('analysis', full analysis)
+        """
+        if len(self._split_transcript(transcript)) > 1:
+            # Chunked analyses are merged at the end, nothing to stream early
+            yield 'analysis', await self.aanalyze_meeting(transcript)
+            return
+        
+        try:
+            request = self._insights_request(transcript)
+            cached = self.cache.get(request)
+            if cached is not None:
+                yield 'analysis', cached
+                return
+            
+            stream = await self.async_client.chat.completions.create(**request, stream=True)
+            buffer = []
+            pending = list(STREAMED_FIELDS)
+            async for chunk in stream:
+                tool_calls = chunk.choices[0].delta.tool_calls if chunk.choices else None
+                if not tool_calls or not tool_calls[0].function or not tool_calls[0].function.arguments:
+                    continue
+                buffer.append(tool_calls[0].function.arguments)
+                
+                if pending:
+                    arguments = "".join(buffer)
+                    for field in list(pending):
+                        value = self._completed_field(arguments, field)
+                        if value is not None:
+                            pending.remove(field)
+                            yield _SCHEMA_TO_ANALYSIS_FIELDS.get(field, field), value
+            
+            insights = normalize_insights(json.loads("".join(buffer)))
+            logger.info("Successfully analyzed meeting transcript")
+            self.cache.set(request, insights)
+        
+        except Exception as e:
+            logger.error(f"Meeting analysis failed: {str(e)}")
+            insights = self._fallback_analysis(transcript)
+        
+        yield 'analysis', insights
+    
+    @staticmethod
+    def _completed_field(arguments: str, field: str) -> Optional[Any]:
+        """Decode a top-level field from partial tool-call JSON, or None if not yet complete"""
+        match = _STREAMED_FIELD_RES[field].search(arguments)
+        if not match:
+            return None
+        try:
+            value, _ = json.JSONDecoder().raw_decode(arguments, match.end())
+            return value
+        except json.JSONDecodeError:
+            return None
+    
+    async def aupdate_insights(self, insights: Optional[Dict[str, Any]], transcript_part: str) -> Dict[str, Any]:
+        """
+        Fold the next part of a transcript into a running analysis
+        
+        Args:
+            insights (dict): Analysis of the meeting so far, or None for the first part
+            transcript_part (str): Newly transcribed text
+            
+        Returns:
+            dict: Analysis of the meeting up to and including the new part
+        """
+        if not insights:
+            return await self.aanalyze_meeting(transcript_part)
+        
+        try:
+            return await self._acomplete_insights(self._update_request(insights, transcript_part))
+        
+        except Exception as e:
+            logger.error(f"Incremental meeting analysis failed: {str(e)}")
+            return insights
+    
+    def _complete_insights(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run an insights request, answering from the response cache when possible"""
+        cached = self.cache.get(request)
+        if cached is not None:
+            return cached
+        
+        response = self.client.chat.completions.create(**request)
+        insights = self._parse_insights(response)
+        self.cache.set(request, insights)
+        return insights
+    
+    async def _acomplete_insights(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of _complete_insights()"""
+        cached = self.cache.get(request)
+        if cached is not None:
+            return cached
+        
+        response = await self.async_client.chat.completions.create(**request)
+        insights = self._parse_insights(response)
+        self.cache.set(request, insights)
+        return insights
+    
+    def _split_transcript(self, transcript: str) -> List[str]:
+        """
+        Split a transcript into overlapping chunks, breaking at whitespace
+        
+        Args:
+            transcript (str): Meeting transcript
+            
+        Returns:
+            list: Chunks of at most CHUNK_MAX_CHARS characters
+        """
+        if len(transcript) <= CHUNK_MAX_CHARS:
+            return [transcript]
+        
+        chunks = []
+        start = 0
+        while start < len(transcript):
+            end = min(start + CHUNK_MAX_CHARS, len(transcript))
+            if end < len(transcript):
+                # Don't cut a word in half when a break is reasonably close
+                space = transcript.rfind(' ', start + CHUNK_MAX_CHARS // 2, end)
+                if space != -1:
+                    end = space
+            chunks.append(transcript[start:end])
+            if end == len(transcript):
+                break
+            start = end - CHUNK_OVERLAP_CHARS
+        return chunks
+    
+    def _select_model(self, text: str) -> str:
+        """
+        Pick the analysis model by transcript complexity
+        
+        Args:
+            text (str): Transcript (or serialized analysis) to be sent
+            
+        Returns:
+            str: Model name
+        """
+        if len(text) < SIMPLE_TRANSCRIPT_MAX_CHARS and text.count('\n') < SIMPLE_TRANSCRIPT_MAX_LINES:
+            model = SIMPLE_ANALYSIS_MODEL
+        else:
+            model = ANALYSIS_MODEL
+        
+        self.model_usage[model] += 1
+        logger.info(f"Routing to {model} (routing so far: {dict(self.model_usage)})")
+        return model
+    
+    def _insights_request(self, transcript: str, part: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+        """Build the chat completion arguments for meeting analysis"""
+        if not transcript or not transcript.strip():
+            raise ValueError("Transcript cannot be empty")
+        
+        if part:
+            instruction = f"Analyze part {part[0]} of {part[1]} of this meeting transcript and extract key insights:"
+        else:
+            instruction = "Analyze this meeting transcript and extract key insights:"
+        
+        return dict(
+            model=self._select_model(transcript),
+            messages=[
+                {
+                    "role": "system",
+                    "content": INSIGHTS_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": f"{instruction}\n\n{transcript}"
+                }
+            ],
+            tools=INSIGHTS_TOOLS,
+            tool_choice={"type": "function", "function": {"name": "extract_meeting_insights"}},
+            extra_body={"prompt_cache_key": "analyze_meeting_v1"}
+        )
+    
+    def _update_request(self, insights: Dict[str, Any], transcript_part: str) -> Dict[str, Any]:
+        """Build the request that updates a running analysis with more transcript"""
+        insights_json = json.dumps(insights, indent=2)
+        return dict(
+            model=self._select_model(insights_json + transcript_part),
+            messages=[
+                {
+                    "role": "system",
+                    "content": INSIGHTS_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": "This is the analysis of a meeting so far. Update it with the next part of the transcript "
+                               "and return the analysis of the whole meeting up to this point:\n\n"
+                               f"{insights_json}\n\nNext part of the transcript:\n\n{transcript_part}"
+                }
+            ],
+            tools=INSIGHTS_TOOLS,
+            tool_choice={"type": "function", "function": {"name": "extract_meeting_insights"}},
+            extra_body={"prompt_cache_key": "analyze_meeting_v1"}
+        )
+    
+    def _merge_request(self, partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the reduce request that merges per-chunk analyses into one"""
+        partials_json = json.dumps(partials, indent=2)
+        return dict(
+            model=ANALYSIS_MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": INSIGHTS_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": "These are analyses of consecutive parts of one meeting. Combine them into a single analysis "
+                               "of the whole meeting: merge duplicate action items and decisions, write one summary, and "
+                               f"score the meeting as a whole:\n\n{partials_json}"
+                }
+            ],
+            tools=INSIGHTS_TOOLS,
+            tool_choice={"type": "function", "function": {"name": "extract_meeting_insights"}},
+            extra_body={"prompt_cache_key": "analyze_meeting_v1"}
+        )
+    
+    def _log_prompt_cache(self, response) -> None:
+        """Log how much of the prompt was served from OpenAI's prefix cache"""
+        details = getattr(getattr(response, 'usage', None), 'prompt_tokens_details', None)
+        cached_tokens = getattr(details, 'cached_tokens', None)
+        if isinstance(cached_tokens, int):
+            logger.info(f"Prompt cache: {cached_tokens}/{response.usage.prompt_tokens} prompt tokens cached")
+    
+    def _parse_insights(self, response) -> Dict[str, Any]:
+        """Extract the insights from a meeting analysis response"""
+        self._log_prompt_cache(response)
+        if response.choices[0].message.tool_calls:
+            function_call = response.choices[0].message.tool_calls[0]
+            insights = normalize_insights(json.loads(function_call.function.arguments))
+            logger.info("Successfully analyzed meeting transcript")
+            return insights
+        else:
+            raise Exception("No function call in response")
+    
+    def analyze_meeting_batch(self, transcripts: List[Tuple[Any, str]]) -> str:
+        """
+        Submit meeting analyses to the OpenAI Batch API (half price, results within 24h)
+        
+        Args:
+            transcripts (list): (meeting_id, transcript) pairs
+            
+        Returns:
+            str: Batch id, to be passed to poll_batch()
+        """
+        lines = []
+        for meeting_id, transcript in transcripts:
+            request = self._insights_request(transcript)
+            body = {k: v for k, v in request.items() if k != 'extra_body'}
+            body.update(request.get('extra_body', {}))
+            lines.append(json.dumps({
+                "custom_id": str(meeting_id),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            }))
+        
+        batch_file = self.client.files.create(
+            file=("meeting_analyses.jsonl", "\n".join(lines).encode('utf-8')),
+            purpose="batch"
+        )
+        # The pinned SDK predates client.batches, so call the endpoint directly
+        batch = self.client.post(
+            "/batches",
+            body={
+                "input_file_id": batch_file.id,
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h"
+            },
+            cast_to=Dict[str, Any]
+        )
+        
+        logger.info(f"Submitted analysis batch {batch['id']} with {len(lines)} meetings")
+        return batch['id']
+    
+    def poll_batch(self, batch_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Fetch the results of an analysis batch
+        
+        Args:
+            batch_id (str): Id returned by analyze_meeting_batch()
+            
+        Returns:
+            dict: meeting_id -> analysis once the batch has completed (failed
+                requests get the fallback analysis), or None while it is running
+            
+        Raises:
+            Exception: If the batch failed, expired or was cancelled
+        """
+        batch = self.client.get(f"/batches/{batch_id}", cast_to=Dict[str, Any])
+        status = batch.get('status')
+        if status in ('failed', 'expired', 'cancelled'):
+            raise Exception(f"Analysis batch {batch_id} {status}")
+        if status != 'completed':
+            return None
+        
+        results = {}
+        output = self.client.files.content(batch['output_file_id']).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            try:
+                message = record['response']['body']['choices'][0]['message']
+                results[record['custom_id']] = normalize_insights(json.loads(message['tool_calls'][0]['function']['arguments']))
+            except (KeyError, IndexError, TypeError, json.JSONDecodeError) as e:
+                logger.error(f"Batch analysis failed for meeting {record.get('custom_id')}: {str(e)}")
+                results[record.get('custom_id')] = self._fallback_analysis("")
+        
+        logger.info(f"Analysis batch {batch_id} completed with {len(results)} results")
+        return results
+    
     def _fallback_analysis(self, transcript: str) -> Dict[str, Any]:
         """Fallback analysis when API fails"""
         return {
@@ -164,72 +564,83 @@ Be precise and business-focused in your analysis."""
             if not analysis or not analysis.get('action_items'):
                 return {"calendar_events": [], "task_assignments": []}
             
-            # Updated function schema
-            tools = [
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "create_task_integration",
-                        "description": "Create task and calendar integration recommendations",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "calendar_events": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "title": {"type": "string"},
-                                            "description": {"type": "string"},
-                                            "suggested_date": {"type": "string"},
-                                            "duration": {"type": "integer"},
-                                            "attendees": {"type": "array", "items": {"type": "string"}}
-                                        }
-                                    }
-                                },
-                                "task_assignments": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "task_title": {"type": "string"},
-                                            "description": {"type": "string"},
-                                            "assignee": {"type": "string"},
-                                            "due_date": {"type": "string"},
-                                            "project": {"type": "string"}
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
-            ]
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a task management assistant. Convert meeting insights into actionable calendar events and task assignments."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Create task and calendar recommendations based on this meeting analysis:\n\n{json.dumps(analysis, indent=2)}"
-                    }
-                ],
-                tools=tools,
-                tool_choice={"type": "function", "function": {"name": "create_task_integration"}}
-            )
-            
-            if response.choices[0].message.tool_calls:
-                function_call = response.choices[0].message.tool_calls[0]
-                integration = json.loads(function_call.function.arguments)
-                logger.info("Successfully generated follow-up tasks")
-                return integration
-            else:
+            # Produced by the same request as the analysis itself
+            if analysis.get('task_integration'):
+                return analysis['task_integration']
+            
+            request = self._integration_request(analysis)
+            cached = self.cache.get(request)
+            if cached is not None:
+                return cached
+            
+            response = self.client.chat.completions.create(**request)
+            integration = self._parse_integration(response)
+            self.cache.set(request, integration)
+            return integration
+        
+        except Exception as e:
+            logger.error(f"Task integration failed: {str(e)}")
+            return {"calendar_events": [], "task_assignments": []}
+    
+    async def agenerate_follow_up_tasks(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async variant of generate_follow_up_tasks()
+        
+        Args:
+            analysis (dict): Meeting analysis results
+            
+        Returns:
+            dict: Task integration recommendations
+        """
+        try:
+            if not analysis or not analysis.get('action_items'):
                 return {"calendar_events": [], "task_assignments": []}
+            
+            # Produced by the same request as the analysis itself
+            if analysis.get('task_integration'):
+                return analysis['task_integration']
+            
+            request = self._integration_request(analysis)
+            cached = self.cache.get(request)
+            if cached is not None:
+                return cached
+            
+            response = await self.async_client.chat.completions.create(**request)
+            integration = self._parse_integration(response)
+            self.cache.set(request, integration)
+            return integration
         
         except Exception as e:
             logger.error(f"Task integration failed: {str(e)}")
             return {"calendar_events": [], "task_assignments": []}
+    
+    def _integration_request(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the chat completion arguments for task integration"""
+        analysis_json = json.dumps(analysis, indent=2)
+        return dict(
+            model=self._select_model(analysis_json),
+            messages=[
+                {
+                    "role": "system",
+                    "content": INTEGRATION_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": f"Create task and calendar recommendations based on this meeting analysis:\n\n{analysis_json}"
+                }
+            ],
+            tools=INTEGRATION_TOOLS,
+            tool_choice={"type": "function", "function": {"name": "create_task_integration"}},
+            extra_body={"prompt_cache_key": "task_integration_v1"}
+        )
+    
+    def _parse_integration(self, response) -> Dict[str, Any]:
+        """Extract the task integration from a response"""
+        self._log_prompt_cache(response)
+        if response.choices[0].message.tool_calls:
+            function_call = response.choices[0].message.tool_calls[0]
+            integration = json.loads(function_call.function.arguments)
+            logger.info("Successfully generated follow-up tasks")
+            return integration
+        else:
+            return {"calendar_events": [], "task_assignments": []}
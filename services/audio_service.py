@@ -1,18 +1,67 @@
 import os
+import io
 import json
+import wave
+import struct
+import asyncio
 import logging
-from openai import OpenAI
-from typing import Dict, List, Optional, Any
+import numpy as np
+from functools import lru_cache
+from openai import AsyncOpenAI
+from services.openai_client import get_client, get_async_client
+from typing import AsyncIterator, Dict, List, Optional, Any
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Long WAV recordings are transcribed in pieces of this length so analysis
+# can start on the first piece while the rest is still being transcribed
+TRANSCRIPTION_CHUNK_SECONDS = 300
+
+# Optional local Whisper for live transcription; when unset (or faster-whisper
+# is not installed) live chunks go to the Whisper API as in-memory uploads
+LOCAL_WHISPER_MODEL = os.getenv('LOCAL_WHISPER_MODEL', '')
+LOCAL_WHISPER_DEVICE = os.getenv('LOCAL_WHISPER_DEVICE', 'cuda')
+LOCAL_WHISPER_COMPUTE_TYPE = os.getenv('LOCAL_WHISPER_COMPUTE_TYPE', 'float16')
+
+# Greedy decoding without cross-chunk conditioning keeps time to first text
+# low; VAD skips silent stretches before they reach the decoder
+LOCAL_WHISPER_OPTIONS = {
+    'beam_size': 1,
+    'vad_filter': True,
+    'vad_parameters': {'min_silence_duration_ms': 300},
+    'condition_on_previous_text': False,
+    'no_speech_threshold': 0.6,
+}
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+@lru_cache(maxsize=None)
+def _load_local_model():
+    """Load and warm up the local faster-whisper model once per process, if configured"""
+    if WhisperModel is None or not LOCAL_WHISPER_MODEL:
+        return None
+    
+    model = WhisperModel(LOCAL_WHISPER_MODEL, device=LOCAL_WHISPER_DEVICE, compute_type=LOCAL_WHISPER_COMPUTE_TYPE)
+    # Transcribe a second of silence so the first live chunk doesn't pay for
+    # lazy initialization (segments are generated lazily, hence the list)
+    list(model.transcribe(np.zeros(16000, dtype=np.float32), **LOCAL_WHISPER_OPTIONS)[0])
+    logger.info(f"Loaded local Whisper model {LOCAL_WHISPER_MODEL} ({LOCAL_WHISPER_COMPUTE_TYPE})")
+    return model
+
 class AudioService:
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
         if not os.getenv('OPENAI_API_KEY'):
             raise ValueError("OPENAI_API_KEY environment variable is required")
+        self.client = get_client()
+        self._local_model = _load_local_model()
+    
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """OpenAI client for the running event loop (only usable inside a coroutine)"""
+        return get_async_client()
     
     def transcribe(self, audio_file_path: str) -> str:
         """
@@ -61,7 +110,8 @@ class AudioService:
                     model="whisper-1",
                     file=audio_file,
                     response_format="verbose_json",
-                    timestamp_granularities=["segment"]
+                    # openai 1.3.0 has no timestamp_granularities argument
+                    extra_body={'timestamp_granularities': ['segment']}
                 )
             
             logger.info(f"Successfully transcribed audio with timestamps: {audio_file_path}")
@@ -70,3 +120,231 @@ class AudioService:
         except Exception as e:
             logger.error(f"Detailed audio transcription failed for {audio_file_path}: {str(e)}")
             raise Exception(f"Detailed audio transcription failed: {str(e)}")
+    
+    async def atranscribe(self, audio_file_path: str) -> str:
+        """
+        Async variant of transcribe() for overlapping several transcriptions
+        
+        Args:
+            audio_file_path (str): Path to audio file
+            
+        Returns:
+            str: Transcribed text
+        """
+        try:
+            audio_bytes = await asyncio.to_thread(self._read_audio, audio_file_path)
+            transcript = await self.async_client.audio.transcriptions.create(
+                model="whisper-1",
+                file=(os.path.basename(audio_file_path), audio_bytes),
+                response_format="text"
+            )
+            
+            logger.info(f"Successfully transcribed audio file: {audio_file_path}")
+            return transcript
+        
+        except Exception as e:
+            logger.error(f"Audio transcription failed for {audio_file_path}: {str(e)}")
+            raise Exception(f"Audio transcription failed: {str(e)}")
+    
+    async def atranscribe_with_timestamps(self, audio_file_path: str) -> Dict:
+        """
+        Async variant of transcribe_with_timestamps()
+        
+        Args:
+            audio_file_path (str): Path to audio file
+            
+        Returns:
+            dict: Detailed transcription with timestamps
+        """
+        try:
+            audio_bytes = await asyncio.to_thread(self._read_audio, audio_file_path)
+            transcript = await self.async_client.audio.transcriptions.create(
+                model="whisper-1",
+                file=(os.path.basename(audio_file_path), audio_bytes),
+                response_format="verbose_json",
+                extra_body={'timestamp_granularities': ['segment']}
+            )
+            
+            logger.info(f"Successfully transcribed audio with timestamps: {audio_file_path}")
+            return transcript.model_dump() if hasattr(transcript, 'model_dump') else dict(transcript)
+        
+        except Exception as e:
+            logger.error(f"Detailed audio transcription failed for {audio_file_path}: {str(e)}")
+            raise Exception(f"Detailed audio transcription failed: {str(e)}")
+    
+    async def atranscribe_chunks(self, audio_file_path: str) -> AsyncIterator[str]:
+        """
+        Transcribe a recording piece by piece, yielding each piece's text in order
+        
+        All pieces are transcribed concurrently; each is yielded as soon as it
+        and every earlier piece are done. Only WAV files can be split without
+        an audio decoder, other formats are transcribed as a single piece.
+        
+        Args:
+            audio_file_path (str): Path to audio file
+            
+        Yields:
+            str: Transcribed text of the next piece
+        """
+        audio_bytes = await asyncio.to_thread(self._read_audio, audio_file_path)
+        name = os.path.basename(audio_file_path)
+        if name.lower().endswith('.wav'):
+            pieces = await asyncio.to_thread(self._split_wav, audio_bytes, TRANSCRIPTION_CHUNK_SECONDS)
+        else:
+            pieces = [audio_bytes]
+        
+        async def transcribe_piece(i: int, piece: bytes) -> str:
+            try:
+                return await self.async_client.audio.transcriptions.create(
+                    model="whisper-1",
+                    file=(f"{i}_{name}", piece),
+                    response_format="text"
+                )
+            except Exception as e:
+                logger.error(f"Audio transcription failed for {audio_file_path} (piece {i + 1}): {str(e)}")
+                raise Exception(f"Audio transcription failed: {str(e)}")
+        
+        tasks = [asyncio.create_task(transcribe_piece(i, piece)) for i, piece in enumerate(pieces)]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        logger.info(f"Successfully transcribed audio file in {len(pieces)} pieces: {audio_file_path}")
+    
+    def transcribe_stream(self, audio, sample_rate: int = 16000) -> str:
+        """
+        Transcribe audio held in memory, without touching the disk
+        
+        Args:
+            audio: WAV data as bytes or BytesIO, or mono samples as a numpy
+                array (int16 PCM, or float32 in [-1, 1])
+            sample_rate (int): Sample rate of an ndarray input
+            
+        Returns:
+            str: Transcribed text
+        """
+        try:
+            if self._local_model is not None:
+                segments, _ = self._local_model.transcribe(self._model_input(audio), **LOCAL_WHISPER_OPTIONS)
+                return " ".join(segment.text.strip() for segment in segments)
+            
+            return self.client.audio.transcriptions.create(
+                model="whisper-1",
+                file=("chunk.wav", self._wav_bytes(audio, sample_rate)),
+                response_format="text"
+            )
+        
+        except Exception as e:
+            logger.error(f"Stream transcription failed: {str(e)}")
+            raise Exception(f"Audio transcription failed: {str(e)}")
+    
+    def transcribe_stream_words(self, audio, sample_rate: int = 16000) -> List[Dict[str, Any]]:
+        """
+        Transcribe audio held in memory into words with timestamps
+        
+        Args:
+            audio: WAV data as bytes or BytesIO, or mono samples as a numpy
+                array (int16 PCM, or float32 in [-1, 1])
+            sample_rate (int): Sample rate of an ndarray input
+            
+        Returns:
+            list: {'word', 'start', 'end'} dicts, times in seconds from the
+                start of the audio
+        """
+        try:
+            if self._local_model is not None:
+                segments, _ = self._local_model.transcribe(self._model_input(audio), word_timestamps=True, **LOCAL_WHISPER_OPTIONS)
+                return [
+                    {'word': word.word.strip(), 'start': word.start, 'end': word.end}
+                    for segment in segments for word in (segment.words or [])
+                ]
+            
+            transcript = self.client.audio.transcriptions.create(
+                model="whisper-1",
+                file=("chunk.wav", self._wav_bytes(audio, sample_rate)),
+                response_format="verbose_json",
+                extra_body={'timestamp_granularities': ['word']}
+            )
+            data = transcript.model_dump() if hasattr(transcript, 'model_dump') else dict(transcript)
+            return [
+                {'word': word['word'].strip(), 'start': word['start'], 'end': word['end']}
+                for word in data.get('words') or []
+            ]
+        
+        except Exception as e:
+            logger.error(f"Stream word transcription failed: {str(e)}")
+            raise Exception(f"Audio transcription failed: {str(e)}")
+    
+    @staticmethod
+    def _model_input(audio):
+        """Input for faster-whisper: float32 samples (16 kHz) or a file-like object"""
+        if isinstance(audio, np.ndarray):
+            if audio.dtype == np.int16:
+                return np.multiply(audio, 1 / 32768.0, dtype=np.float32)
+            return audio
+        if isinstance(audio, bytes):
+            return io.BytesIO(audio)
+        return audio
+    
+    @staticmethod
+    def _wav_bytes(audio, sample_rate: int) -> bytes:
+        """WAV file contents for an in-memory upload of bytes, BytesIO or samples"""
+        if isinstance(audio, np.ndarray):
+            return AudioService._encode_wav(audio, sample_rate)
+        if isinstance(audio, io.BytesIO):
+            return audio.getvalue()
+        return audio
+    
+    @staticmethod
+    def _encode_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+        """Encode int16 or float32 samples as 16-bit mono WAV data"""
+        if samples.dtype == np.int16:
+            pcm = samples.astype('<i2', copy=False)
+        else:
+            pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2')
+        
+        # The 44-byte PCM header is packed directly; the samples are copied once
+        data_size = pcm.nbytes
+        header = struct.pack(
+            '<4sI4s4sIHHIIHH4sI',
+            b'RIFF', 36 + data_size, b'WAVE',
+            b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+            b'data', data_size
+        )
+        return b''.join((header, np.ascontiguousarray(pcm).data))
+    
+    @staticmethod
+    def _split_wav(audio_bytes: bytes, chunk_seconds: int) -> List[bytes]:
+        """Split WAV data into standalone WAV files of at most chunk_seconds each"""
+        with wave.open(io.BytesIO(audio_bytes), 'rb') as source:
+            params = source.getparams()
+            frames_per_chunk = params.framerate * chunk_seconds
+            pieces = []
+            while True:
+                frames = source.readframes(frames_per_chunk)
+                if not frames:
+                    break
+                buffer = io.BytesIO()
+                with wave.open(buffer, 'wb') as piece:
+                    piece.setparams(params)
+                    piece.writeframes(frames)
+                pieces.append(buffer.getvalue())
+        return pieces or [audio_bytes]
+    
+    @staticmethod
+    def _read_audio(audio_file_path: str) -> bytes:
+        """
+        Read an audio file in one call
+        
+        The async methods run this via asyncio.to_thread so reading a large
+        recording never blocks the event loop; the bytes are then handed to
+        the SDK as an in-memory upload, so it does no file I/O of its own.
+        """
+        try:
+            with open(audio_file_path, 'rb') as audio_file:
+                return audio_file.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
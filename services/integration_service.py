@@ -1,13 +1,29 @@
 import os
+import re
 import json
 import logging
+import heapq
+import itertools
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Task keywords -> estimated hours; when several groups match, the earlier
+# group wins. All keywords are found with one case-insensitive scan.
+_HOURS_KEYWORDS = (
+    (('research', 'analyze', 'investigate'), 4),
+    (('implement', 'develop', 'create'), 8),
+    (('review', 'check', 'verify'), 2),
+    (('meeting', 'discuss', 'call'), 1),
+)
+_HOURS_RANK = {word: rank for rank, (words, _) in enumerate(_HOURS_KEYWORDS) for word in words}
+_HOURS_RE = re.compile('|'.join(_HOURS_RANK), re.IGNORECASE)
+
+# Deadline units in order of precedence
+_DEADLINE_UNITS = ('week', 'day', 'month')
+_DEADLINE_RE = re.compile('|'.join(_DEADLINE_UNITS))
+
 class IntegrationService:
     """
     Service for integrating with external calendar and task management systems
@@ -17,6 +33,12 @@ class IntegrationService:
     def __init__(self):
         self.calendar_events = []  # Simulated calendar storage
         self.task_assignments = []  # Simulated task storage
+        self._event_seq = itertools.count(1)
+        self._task_seq = itertools.count(1)
+        self._heap_seq = itertools.count()  # Tie-breaker for equal start times
+        # Min-heap of (start_time, seq, event) for events not yet started;
+        # started events are popped lazily, each exactly once
+        self._upcoming_events = []
         
     def create_calendar_events(self, meeting_analysis: Dict[str, Any]) -> List[Dict]:
         """
@@ -31,39 +53,43 @@ class IntegrationService:
         try:
             events = []
             action_items = meeting_analysis.get('action_items', [])
+            now = datetime.now()
+            now_iso = now.isoformat()
             
             for item in action_items:
                 if item.get('deadline'):
                     event = {
-                        'id': f"event_{len(self.calendar_events) + 1}",
+                        'id': f"event_{next(self._event_seq)}",
                         'title': f"Follow-up: {item.get('task', 'Task')}",
                         'description': f"Action item from meeting. Owner: {item.get('owner', 'Unassigned')}",
-                        'start_time': self._parse_deadline(item['deadline']),
+                        'start_time': self._parse_deadline(item['deadline'], now),
                         'duration_minutes': 30,
                         'attendees': [item.get('owner', 'unassigned@company.com')],
                         'location': 'Meeting Room / Video Call',
                         'status': 'confirmed',
-                        'created_at': datetime.now().isoformat()
+                        'created_at': now_iso
                     }
                     events.append(event)
-                    self.calendar_events.append(event)
             
             # Create follow-up meeting if there are multiple action items
             if len(action_items) > 3:
                 follow_up_event = {
-                    'id': f"event_{len(self.calendar_events) + 1}",
+                    'id': f"event_{next(self._event_seq)}",
                     'title': 'Action Items Follow-up Meeting',
                     'description': f'Review progress on {len(action_items)} action items from meeting',
-                    'start_time': (datetime.now() + timedelta(weeks=1)).isoformat(),
+                    'start_time': (now + timedelta(weeks=1)).isoformat(),
                     'duration_minutes': 60,
-                    'attendees': list(set([item.get('owner', 'unassigned@company.com') for item in action_items])),
+                    'attendees': list({item.get('owner', 'unassigned@company.com') for item in action_items}),
                     'location': 'Conference Room A',
                     'status': 'tentative',
-                    'created_at': datetime.now().isoformat()
+                    'created_at': now_iso
                 }
                 events.append(follow_up_event)
-                self.calendar_events.append(follow_up_event)
             
+            self.calendar_events.extend(events)
+            for event in events:
+                heapq.heappush(self._upcoming_events,
+                               (datetime.fromisoformat(event['start_time']), next(self._heap_seq), event))
             logger.info(f"Created {len(events)} calendar events")
             return events
             
@@ -84,44 +110,47 @@ class IntegrationService:
         try:
             tasks = []
             action_items = meeting_analysis.get('action_items', [])
+            project = meeting_analysis.get('project_name', 'General')
+            now = datetime.now()
+            now_iso = now.isoformat()
             
             for item in action_items:
                 task = {
-                    'id': f"task_{len(self.task_assignments) + 1}",
+                    'id': f"task_{next(self._task_seq)}",
                     'title': item.get('task', 'Untitled Task'),
                     'description': f"Action item from meeting analysis",
                     'assignee': item.get('owner', 'Unassigned'),
                     'priority': item.get('priority', 'medium'),
-                    'due_date': self._parse_deadline(item.get('deadline', '')),
+                    'due_date': self._parse_deadline(item.get('deadline', ''), now),
                     'status': 'not_started',
-                    'project': meeting_analysis.get('project_name', 'General'),
+                    'project': project,
                     'tags': ['meeting-action-item', 'auto-generated'],
-                    'created_at': datetime.now().isoformat(),
+                    'created_at': now_iso,
                     'estimated_hours': self._estimate_hours(item.get('task', ''))
                 }
                 tasks.append(task)
-                self.task_assignments.append(task)
             
             # Create tasks for key decisions follow-up
             decisions = meeting_analysis.get('key_decisions', [])
+            high_impact_due = (now + timedelta(days=7)).isoformat()
             for decision in decisions:
                 if decision.get('impact') and 'high' in decision.get('impact', '').lower():
                     task = {
-                        'id': f"task_{len(self.task_assignments) + 1}",
+                        'id': f"task_{next(self._task_seq)}",
                         'title': f"Implement Decision: {decision.get('decision', 'Decision')[:50]}...",
                         'description': f"Follow-up on high-impact decision. Context: {decision.get('context', '')}",
                         'assignee': 'Project Manager',
                         'priority': 'high',
-                        'due_date': (datetime.now() + timedelta(days=7)).isoformat(),
+                        'due_date': high_impact_due,
                         'status': 'not_started',
-                        'project': meeting_analysis.get('project_name', 'General'),
+                        'project': project,
                         'tags': ['decision-implementation', 'high-impact'],
-                        'created_at': datetime.now().isoformat(),
+                        'created_at': now_iso,
                         'estimated_hours': 4
                     }
                     tasks.append(task)
-                    self.task_assignments.append(task)
             
+            self.task_assignments.extend(tasks)
             logger.info(f"Created {len(tasks)} task assignments")
             return tasks
             
@@ -134,49 +163,55 @@ class IntegrationService:
         return {
             'calendar_events': len(self.calendar_events),
             'task_assignments': len(self.task_assignments),
-            'upcoming_events': [e for e in self.calendar_events if datetime.fromisoformat(e['start_time']) > datetime.now()],
+            'upcoming_events': [entry[2] for entry in sorted(self._prune_started_events())],
             'pending_tasks': [t for t in self.task_assignments if t['status'] == 'not_started']
         }
     
-    def _parse_deadline(self, deadline_str: str) -> str:
-        """Parse deadline string and return ISO format datetime"""
+    def get_next_events(self, count: int) -> List[Dict]:
+        """Get the next `count` upcoming events in start-time order"""
+        return [entry[2] for entry in heapq.nsmallest(count, self._prune_started_events())]
+    
+    def _prune_started_events(self) -> List:
+        """Drop events that have started from the upcoming heap and return it"""
+        now = datetime.now()
+        while self._upcoming_events and self._upcoming_events[0][0] <= now:
+            heapq.heappop(self._upcoming_events)
+        return self._upcoming_events
+    
+    def _parse_deadline(self, deadline_str: str, now: Optional[datetime] = None) -> str:
+        """Parse deadline string and return ISO format datetime (relative to now)"""
+        if now is None:
+            now = datetime.now()
         try:
-            if not deadline_str or deadline_str.lower() in ['none', 'no deadline', 'tbd']:
-                return (datetime.now() + timedelta(weeks=2)).isoformat()
+            deadline_lower = deadline_str.lower() if deadline_str else ''
+            if deadline_lower in ('', 'none', 'no deadline', 'tbd'):
+                return (now + timedelta(weeks=2)).isoformat()
             
             # Simple parsing for common formats
-            deadline_lower = deadline_str.lower()
-            if 'week' in deadline_lower:
+            units = set(_DEADLINE_RE.findall(deadline_lower))
+            if 'week' in units:
                 weeks = 1
                 if 'two' in deadline_lower or '2' in deadline_lower:
                     weeks = 2
-                return (datetime.now() + timedelta(weeks=weeks)).isoformat()
-            elif 'day' in deadline_lower:
+                return (now + timedelta(weeks=weeks)).isoformat()
+            elif 'day' in units:
                 days = 7
                 if 'tomorrow' in deadline_lower:
                     days = 1
                 elif 'few' in deadline_lower:
                     days = 3
-                return (datetime.now() + timedelta(days=days)).isoformat()
-            elif 'month' in deadline_lower:
-                return (datetime.now() + timedelta(days=30)).isoformat()
+                return (now + timedelta(days=days)).isoformat()
+            elif 'month' in units:
+                return (now + timedelta(days=30)).isoformat()
             else:
-                return (datetime.now() + timedelta(weeks=1)).isoformat()
+                return (now + timedelta(weeks=1)).isoformat()
                 
         except Exception:
-            return (datetime.now() + timedelta(weeks=1)).isoformat()
+            return (now + timedelta(weeks=1)).isoformat()
     
     def _estimate_hours(self, task_description: str) -> int:
         """Estimate hours needed for a task based on description"""
-        description_lower = task_description.lower()
-        
-        if any(word in description_lower for word in ['research', 'analyze', 'investigate']):
-            return 4
-        elif any(word in description_lower for word in ['implement', 'develop', 'create']):
-            return 8
-        elif any(word in description_lower for word in ['review', 'check', 'verify']):
-            return 2
-        elif any(word in description_lower for word in ['meeting', 'discuss', 'call']):
-            return 1
-        else:
-            return 3  # Default estimate
+        ranks = {_HOURS_RANK[match.lower()] for match in _HOURS_RE.findall(task_description)}
+        if ranks:
+            return _HOURS_KEYWORDS[min(ranks)][1]
+        return 3  # Default estimate
@@ -0,0 +1,91 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class LLMCache:
+    """
+    Persistent exact-match cache for parsed OpenAI responses
+
+    Entries are keyed on a SHA-256 of the full request (model, messages,
+    tools, ...), so a retry or re-upload of the same transcript is answered
+    from disk instead of another GPT-4 call.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: Optional[int] = None):
+        self.path = path if path is not None else os.getenv('LLM_CACHE_PATH', 'data/llm_cache.sqlite3')
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else int(os.getenv('LLM_CACHE_TTL', str(24 * 3600)))
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """Hash the chat completion arguments into a cache key"""
+        return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened on first use so importing the services never touches the disk
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT, created REAL)"
+            )
+        return self._conn
+
+    def get(self, request: Dict[str, Any]) -> Optional[Any]:
+        """
+        Look up a cached result
+
+        Args:
+            request (dict): Chat completion arguments
+
+        Returns:
+            The cached result, or None on a miss or expired entry
+        """
+        if not self.path:
+            return None
+        try:
+            key = self.make_key(request)
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                if time.time() - row[1] > self.ttl_seconds:
+                    # Drop the stale entry so the file doesn't keep growing; a
+                    # sweep in set() can't be used since caches with other TTLs
+                    # share the table
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    conn.commit()
+                    return None
+            return json.loads(row[0])
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {str(e)}")
+            return None
+
+    def set(self, request: Dict[str, Any], value: Any) -> None:
+        """
+        Store a result for a request
+
+        Args:
+            request (dict): Chat completion arguments
+            value: JSON-serializable parsed result
+        """
+        if not self.path:
+            return
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created) VALUES (?, ?, ?)",
+                    (self.make_key(request), json.dumps(value), time.time())
+                )
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {str(e)}")
@@ -0,0 +1,60 @@
+import os
+import asyncio
+import logging
+import threading
+import weakref
+from functools import lru_cache
+
+import httpx
+from openai import OpenAI, AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+# One connection pool per process, shared by every service, so keep-alive
+# connections to api.openai.com are reused instead of each service paying
+# for its own TLS handshakes
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# The SDK retries 408/409/429/5xx and connection errors itself, with
+# exponential backoff plus jitter and honouring Retry-After (up to 60s);
+# its default of 2 retries gives up too early under rate-limit bursts
+MAX_RETRIES = int(os.getenv('OPENAI_MAX_RETRIES', '5'))
+
+# Fail fast when api.openai.com is unreachable; reads keep the SDK's long
+# default since transcriptions of large files take minutes
+_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+@lru_cache(maxsize=None)
+def get_client() -> OpenAI:
+    """Shared synchronous OpenAI client"""
+    return OpenAI(
+        api_key=os.getenv('OPENAI_API_KEY'),
+        max_retries=MAX_RETRIES,
+        timeout=_TIMEOUT,
+        http_client=httpx.Client(http2=_HTTP2, limits=_LIMITS)
+    )
+
+# httpx keeps pooled async connections bound to the event loop that opened
+# them, so each loop gets its own client; entries go away with their loop
+_async_clients = weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
+
+def get_async_client() -> AsyncOpenAI:
+    """Asynchronous OpenAI client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _async_clients[loop] = AsyncOpenAI(
+                api_key=os.getenv('OPENAI_API_KEY'),
+                max_retries=MAX_RETRIES,
+                timeout=_TIMEOUT,
+                http_client=httpx.AsyncClient(http2=_HTTP2, limits=_LIMITS)
+            )
+    return client
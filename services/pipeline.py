@@ -0,0 +1,92 @@
+import os
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on meetings in flight at once, to stay inside the OpenAI
+# requests-per-minute budget (roughly RPM / 60)
+MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', '5'))
+
+# Transcribed text is folded into the running analysis once this much has
+# accumulated, so partial results appear without one GPT call per piece
+MIN_UPDATE_CHARS = 2000
+
+async def process_meetings(paths: List[str], audio_service, analysis_service,
+                           max_concurrency: int = MAX_CONCURRENCY) -> List[Dict[str, Any]]:
+    """
+    Transcribe and analyze several audio files concurrently
+
+    Args:
+        paths (list): Audio file paths
+        audio_service: AudioService instance
+        analysis_service: AnalysisService instance
+        max_concurrency (int): Maximum number of meetings processed at once
+
+    Returns:
+        list: One result per path, in order, with transcript, analysis and
+            follow_up_tasks, or an error message if that meeting failed
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def pipeline(path: str) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                transcript = await audio_service.atranscribe(path)
+                analysis = await analysis_service.aanalyze_meeting(transcript)
+                follow_up_tasks = await analysis_service.agenerate_follow_up_tasks(analysis)
+                return {
+                    'path': path,
+                    'transcript': transcript,
+                    'analysis': analysis,
+                    'follow_up_tasks': follow_up_tasks
+                }
+            except Exception as e:
+                logger.error(f"Processing failed for {path}: {str(e)}")
+                return {'path': path, 'error': str(e)}
+
+    tasks = [asyncio.create_task(pipeline(path)) for path in paths]
+    return await asyncio.gather(*tasks)
+
+async def stream_meeting_analysis(path: str, audio_service, analysis_service,
+                                  on_update: Optional[Callable[[Dict[str, Any]], None]] = None,
+                                  min_update_chars: int = MIN_UPDATE_CHARS) -> Dict[str, Any]:
+    """
+    Analyze a recording while it is still being transcribed
+
+    Transcribed pieces are folded into a running analysis (each update sees
+    the previous analysis plus the new text), so a partial analysis is
+    available long before the whole recording has been transcribed.
+
+    Args:
+        path (str): Audio file path
+        audio_service: AudioService instance
+        analysis_service: AnalysisService instance
+        on_update (callable): Called with each intermediate analysis
+        min_update_chars (int): Minimum new text before updating the analysis
+
+    Returns:
+        dict: Full transcript and final analysis
+    """
+    transcript_parts = []
+    pending = []
+    insights = None
+
+    async for text in audio_service.atranscribe_chunks(path):
+        transcript_parts.append(text)
+        pending.append(text)
+        if sum(len(part) for part in pending) < min_update_chars:
+            continue
+
+        insights = await analysis_service.aupdate_insights(insights, " ".join(pending))
+        pending = []
+        if on_update:
+            on_update(insights)
+
+    if pending or insights is None:
+        insights = await analysis_service.aupdate_insights(insights, " ".join(pending))
+        if on_update:
+            on_update(insights)
+
+    return {'transcript': " ".join(transcript_parts), 'analysis': insights}
@@ -1,22 +1,178 @@
 import asyncio
 import websockets
+import os
+import re
 import json
 import logging
 from datetime import datetime
 import base64
-import io
-import wave
+import numpy as np
 from typing import Dict, Any, List
+import time
+import heapq
 import threading
 import queue
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional: faster JSON (de)serialization for WebSocket messages
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from services.audio_service import AudioService
 from services.analysis_service import AnalysisService
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Live topic keywords; when several topics match, the earlier one wins
+_TOPIC_KEYWORDS = (
+    ('planning', ('plan', 'schedule', 'timeline', 'roadmap')),
+    ('technical', ('code', 'bug', 'feature', 'development', 'api')),
+    ('business', ('revenue', 'customer', 'market', 'sales')),
+    ('meeting', ('agenda', 'action', 'decision', 'review')),
+)
+_TOPIC_RANK = {word: rank for rank, (_, words) in enumerate(_TOPIC_KEYWORDS) for word in words}
+_TOPIC_RE = re.compile('|'.join(_TOPIC_RANK))
+
+_ACTION_RE = re.compile('todo|action|assign|responsible|deadline|due')
+
+# Sentiment words -> +1 / -1; each distinct word counts once per chunk
+_SENTIMENT_WORDS = {
+    **dict.fromkeys(('good', 'great', 'excellent', 'success', 'positive'), 1),
+    **dict.fromkeys(('issue', 'problem', 'concern', 'difficult', 'challenge'), -1),
+}
+_SENTIMENT_RE = re.compile('|'.join(_SENTIMENT_WORDS))
+
+def _json_dumps(obj) -> str:
+    """Serialize a message for a (text) WebSocket frame"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj)
+
+def _json_loads(message):
+    """Parse a WebSocket message; raises json.JSONDecodeError on bad input"""
+    if orjson is not None:
+        return orjson.loads(message)
+    return json.loads(message)
+
+# Chunks from different clients transcribed together; a batch is collected
+# for at most BATCH_WAIT_SECONDS after its first chunk arrives
+MAX_BATCH = int(os.getenv('REALTIME_MAX_BATCH', '8'))
+BATCH_WAIT_SECONDS = 0.02
+
+# WebSocket messages that change session state; they are applied in arrival
+# order per connection, while other messages (e.g. get_summary) run freely
+_ORDERED_MESSAGES = frozenset({'start_session', 'audio_chunk', 'end_session'})
+
+# How long an ended session stays available for summary retrieval
+SESSION_RETENTION_SECONDS = 300
+
+# Punctuation and case are ignored when comparing words across transcriptions
+_NON_WORD_RE = re.compile(r'[^\w]+')
+
+def _normalize_word(word: str) -> str:
+    return _NON_WORD_RE.sub('', word.lower())
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity ring of 16-bit PCM samples
+    
+    Chunks are copied straight into a preallocated int16 array; when the
+    ring is full the oldest audio is dropped.
+    """
+    
+    __slots__ = ('_data', '_head', '_size', '_odd_byte', 'start')
+    
+    def __init__(self, capacity: int):
+        self._data = np.empty(capacity, dtype=np.int16)
+        self._head = 0
+        self._size = 0
+        self._odd_byte = b''  # Half a sample, completed by the next chunk
+        self.start = 0  # Stream position (in samples) of the oldest buffered sample
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def write(self, pcm: bytes):
+        """Append 16-bit little-endian PCM bytes"""
+        if self._odd_byte:
+            pcm = self._odd_byte + pcm
+        usable = len(pcm) // 2 * 2
+        self._odd_byte = pcm[usable:]
+        samples = np.frombuffer(pcm, dtype='<i2', count=usable // 2)
+        
+        capacity = len(self._data)
+        overflow = self._size + len(samples) - capacity
+        if overflow > 0:
+            logger.warning(f"Audio buffer full, dropping {overflow} samples")
+            self.consume(overflow)
+            samples = samples[-capacity:]
+        
+        tail = (self._head + self._size) % capacity
+        first = min(len(samples), capacity - tail)
+        self._data[tail:tail + first] = samples[:first]
+        self._data[:len(samples) - first] = samples[first:]
+        self._size += len(samples)
+    
+    def samples(self) -> np.ndarray:
+        """Buffered samples, oldest first (a view unless they wrap around)"""
+        end = self._head + self._size
+        if end <= len(self._data):
+            return self._data[self._head:end]
+        return np.concatenate((self._data[self._head:], self._data[:end - len(self._data)]))
+    
+    def consume(self, count: int):
+        """Drop the oldest count samples"""
+        count = min(count, self._size)
+        self._head = (self._head + count) % len(self._data)
+        self._size -= count
+        self.start += count
+
+class LiveAnalysis:
+    """Running keyword-based analysis of a live session"""
+    
+    __slots__ = ('word_count', 'speakers_detected', 'current_topic', 'sentiment', 'action_items_detected')
+    
+    def __init__(self):
+        self.word_count = 0
+        self.speakers_detected = 0
+        self.current_topic = 'Unknown'
+        self.sentiment = 'neutral'
+        self.action_items_detected = 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class Session:
+    """State of one real-time transcription session"""
+    
+    __slots__ = ('id', 'created_at', 'chunks_received', 'bytes_received', 'unprocessed_bytes',
+                 'audio', 'tentative_tokens', 'transcription_segments', 'live_analysis', 'is_active')
+    
+    def __init__(self, session_id: str, buffer_samples: int):
+        self.id = session_id
+        self.created_at = datetime.now().isoformat()
+        self.chunks_received = 0
+        self.bytes_received = 0
+        self.unprocessed_bytes = 0  # Audio received since the last transcription
+        self.audio = AudioRingBuffer(buffer_samples)  # PCM not yet covered by committed words
+        self.tentative_tokens = []  # Uncommitted words from the last transcription
+        self.transcription_segments = []
+        self.live_analysis = LiveAnalysis()
+        self.is_active = True
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable session details"""
+        return {
+            'id': self.id,
+            'created_at': self.created_at,
+            'chunks_received': self.chunks_received,
+            'transcription_segments': self.transcription_segments,
+            'live_analysis': self.live_analysis.to_dict(),
+            'is_active': self.is_active
+        }
+
 class RealTimeTranscriptionService:
     """
     Advanced feature: Real-time meeting transcription and analysis
@@ -26,28 +182,25 @@ class RealTimeTranscriptionService:
     def __init__(self):
         self.audio_service = AudioService()
         self.analysis_service = AnalysisService()
-        self.active_sessions = {}  # session_id -> session_data
+        self.active_sessions = {}  # session_id -> Session
+        # Min-heap of (expiry time, session_id) for ended sessions, purged
+        # whenever sessions are created or listed instead of by timer threads
+        self._expiry_heap = []
+        self._expiry_lock = threading.Lock()
         self.chunk_size = 1024 * 16  # 16KB chunks
         self.sample_rate = 16000
+        # LocalAgreement-2 streaming: the rolling buffer is re-transcribed for
+        # every process_interval seconds of new audio, and words are committed
+        # once two consecutive transcriptions agree on them
+        self.process_interval = 1
+        self.max_buffer_seconds = 15  # Commit everything once the buffer is this long
         
-    def create_session(self, session_id: str) -> Dict[str, Any]:
+    def create_session(self, session_id: str) -> Session:
         """Create a new real-time transcription session"""
-        session = {
-            'id': session_id,
-            'created_at': datetime.now().isoformat(),
-            'audio_chunks': [],
-            'transcription_segments': [],
-            'partial_transcriptions': [],
-            'live_analysis': {
-                'word_count': 0,
-                'speakers_detected': 0,
-                'current_topic': 'Unknown',
-                'sentiment': 'neutral',
-                'action_items_detected': 0
-            },
-            'audio_buffer': io.BytesIO(),
-            'is_active': True
-        }
+        self._expire_sessions()
+        
+        # The ring holds twice the longest buffer LocalAgreement keeps
+        session = Session(session_id, self.sample_rate * self.max_buffer_seconds * 2)
         
         self.active_sessions[session_id] = session
         logger.info(f"Created real-time session: {session_id}")
@@ -71,148 +224,144 @@ class RealTimeTranscriptionService:
             session = self.active_sessions[session_id]
             
             # Add chunk to buffer
-            session['audio_buffer'].write(audio_data)
-            session['audio_chunks'].append({
-                'timestamp': datetime.now().isoformat(),
-                'size': len(audio_data)
-            })
-            
-            # Process if we have enough data (every 3 seconds worth)
-            buffer_size = session['audio_buffer'].tell()
-            if buffer_size >= self.sample_rate * 2 * 3:  # 3 seconds of 16-bit audio
+            session.audio.write(audio_data)
+            session.chunks_received += 1
+            session.bytes_received += len(audio_data)
+            session.unprocessed_bytes += len(audio_data)
+            
+            # Re-transcribe once enough new 16-bit audio has arrived
+            buffer_size = len(session.audio) * 2
+            if session.unprocessed_bytes >= self.sample_rate * 2 * self.process_interval:
                 return self._process_buffer(session_id)
             
             return {
                 'session_id': session_id,
                 'status': 'buffering',
                 'buffer_size': buffer_size,
-                'chunks_received': len(session['audio_chunks'])
+                'chunks_received': session.chunks_received
             }
             
         except Exception as e:
             logger.error(f"Error processing audio chunk: {str(e)}")
             return {'error': str(e)}
     
-    def _process_buffer(self, session_id: str) -> Dict[str, Any]:
-        """Process accumulated audio buffer"""
+    def _process_buffer(self, session_id: str, final: bool = False) -> Dict[str, Any]:
+        """
+        Transcribe the rolling buffer and commit the words that are stable
+        
+        Args:
+            session_id: Session identifier
+            final: Commit every transcribed word (end of session)
+            
+        Returns:
+            Dict with any newly committed segment and the tentative text
+        """
         try:
             session = self.active_sessions[session_id]
+            session.unprocessed_bytes = 0
+            
+            audio = session.audio
+            sample_count = len(audio)
+            # The int16 samples go to the audio service as-is; it converts
+            # them only for whichever backend needs another format
+            words = self._transcribe_words(audio.samples())
+            
+            # Commit the words this transcription agrees on with the previous one
+            flush = final or sample_count >= self.sample_rate * self.max_buffer_seconds
+            agreed = len(words) if flush else self._agreed_prefix(session.tentative_tokens, words)
+            committed = words[:agreed]
+            session.tentative_tokens = [word['word'] for word in words[agreed:]]
+            
+            # Drop the audio behind the last committed word
+            if flush or not words:
+                trim = sample_count
+            elif committed:
+                trim = min(sample_count, int(committed[-1]['end'] * self.sample_rate))
+            else:
+                trim = 0
+            buffer_start = audio.start / self.sample_rate
+            audio.consume(trim)
             
-            # Get audio data from buffer
-            session['audio_buffer'].seek(0)
-            audio_data = session['audio_buffer'].read()
-            
-            # Create temporary WAV file for transcription
-            temp_wav = io.BytesIO()
-            with wave.open(temp_wav, 'wb') as wav_file:
-                wav_file.setnchannels(1)  # Mono
-                wav_file.setsampwidth(2)  # 16-bit
-                wav_file.setframerate(self.sample_rate)
-                wav_file.writeframes(audio_data)
-            
-            temp_wav.seek(0)
-            
-            # Transcribe the chunk
-            transcription = self._transcribe_chunk(temp_wav)
-            
-            if transcription:
+            tentative_text = " ".join(session.tentative_tokens)
+            if committed:
+                transcription = " ".join(word['word'] for word in committed)
                 segment = {
-                    'timestamp': datetime.now().isoformat(),
+                    'start': buffer_start + committed[0]['start'],  # Seconds into the stream
                     'text': transcription,
-                    'duration': len(audio_data) / (self.sample_rate * 2)  # Duration in seconds
+                    'duration': committed[-1]['end'] - committed[0]['start']  # Duration in seconds
                 }
                 
-                session['transcription_segments'].append(segment)
+                session.transcription_segments.append(segment)
                 
                 # Update live analysis
                 self._update_live_analysis(session, transcription)
                 
-                # Clear buffer for next chunk
-                session['audio_buffer'] = io.BytesIO()
-                
                 return {
                     'session_id': session_id,
                     'status': 'transcribed',
                     'segment': segment,
-                    'live_analysis': session['live_analysis'],
-                    'total_segments': len(session['transcription_segments'])
+                    'tentative_text': tentative_text,
+                    'live_analysis': session.live_analysis.to_dict(),
+                    'total_segments': len(session.transcription_segments)
                 }
             
             return {
                 'session_id': session_id,
-                'status': 'no_transcription',
-                'buffer_cleared': True
+                'status': 'tentative' if words else 'no_transcription',
+                'tentative_text': tentative_text
             }
             
         except Exception as e:
             logger.error(f"Error processing buffer: {str(e)}")
             return {'error': str(e)}
     
-    def _transcribe_chunk(self, audio_stream: io.BytesIO) -> str:
-        """Transcribe audio chunk using Whisper API"""
+    @staticmethod
+    def _agreed_prefix(previous: List[str], words: List[Dict]) -> int:
+        """Number of leading words on which two consecutive transcriptions agree"""
+        count = 0
+        for previous_word, word in zip(previous, words):
+            if _normalize_word(previous_word) != _normalize_word(word['word']):
+                break
+            count += 1
+        return count
+    
+    def _transcribe_words(self, samples: np.ndarray) -> List[Dict]:
+        """Transcribe audio chunk in memory into timestamped words"""
         try:
-            # Use the existing audio service with some modifications for streaming
-            # Note: This is a simplified version - in production you'd want to use
-            # streaming-specific optimizations
-            
-            # Save to temporary file (Whisper API requires file input)
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_file.write(audio_stream.read())
-                temp_path = temp_file.name
-            
-            try:
-                transcription = self.audio_service.transcribe_audio(temp_path)
-                return transcription if transcription else ""
-            finally:
-                import os
-                os.unlink(temp_path)
+            return self.audio_service.transcribe_stream_words(samples, self.sample_rate)
                 
         except Exception as e:
             logger.error(f"Error transcribing chunk: {str(e)}")
-            return ""
+            return []
     
-    def _update_live_analysis(self, session: Dict, new_text: str):
+    def _update_live_analysis(self, session: Session, new_text: str):
         """Update live analysis with new transcription"""
         try:
-            analysis = session['live_analysis']
+            analysis = session.live_analysis
             
             # Update word count
             words = new_text.split()
-            analysis['word_count'] += len(words)
+            analysis.word_count += len(words)
             
             # Simple keyword detection for topics
-            keywords = {
-                'planning': ['plan', 'schedule', 'timeline', 'roadmap'],
-                'technical': ['code', 'bug', 'feature', 'development', 'api'],
-                'business': ['revenue', 'customer', 'market', 'sales'],
-                'meeting': ['agenda', 'action', 'decision', 'review']
-            }
-            
             text_lower = new_text.lower()
-            for topic, words_list in keywords.items():
-                if any(word in text_lower for word in words_list):
-                    analysis['current_topic'] = topic
-                    break
+            ranks = {_TOPIC_RANK[match] for match in _TOPIC_RE.findall(text_lower)}
+            if ranks:
+                analysis.current_topic = _TOPIC_KEYWORDS[min(ranks)][0]
             
             # Simple action item detection
-            action_indicators = ['todo', 'action', 'assign', 'responsible', 'deadline', 'due']
-            if any(indicator in text_lower for indicator in action_indicators):
-                analysis['action_items_detected'] += 1
+            if _ACTION_RE.search(text_lower):
+                analysis.action_items_detected += 1
             
             # Simple sentiment analysis (basic keyword-based)
-            positive_words = ['good', 'great', 'excellent', 'success', 'positive']
-            negative_words = ['issue', 'problem', 'concern', 'difficult', 'challenge']
+            score = sum(_SENTIMENT_WORDS[word] for word in set(_SENTIMENT_RE.findall(text_lower)))
             
-            positive_count = sum(1 for word in positive_words if word in text_lower)
-            negative_count = sum(1 for word in negative_words if word in text_lower)
-            
-            if positive_count > negative_count:
-                analysis['sentiment'] = 'positive'
-            elif negative_count > positive_count:
-                analysis['sentiment'] = 'negative'
+            if score > 0:
+                analysis.sentiment = 'positive'
+            elif score < 0:
+                analysis.sentiment = 'negative'
             else:
-                analysis['sentiment'] = 'neutral'
+                analysis.sentiment = 'neutral'
                 
         except Exception as e:
             logger.error(f"Error updating live analysis: {str(e)}")
@@ -227,7 +376,7 @@ class RealTimeTranscriptionService:
             
             # Combine all transcription segments
             full_transcription = " ".join([
-                segment['text'] for segment in session['transcription_segments']
+                segment['text'] for segment in session.transcription_segments
             ])
             
             # Generate final analysis using the regular analysis service
@@ -237,14 +386,14 @@ class RealTimeTranscriptionService:
             
             return {
                 'session_id': session_id,
-                'created_at': session['created_at'],
+                'created_at': session.created_at,
                 'ended_at': datetime.now().isoformat(),
-                'total_segments': len(session['transcription_segments']),
-                'total_chunks': len(session['audio_chunks']),
+                'total_segments': len(session.transcription_segments),
+                'total_chunks': session.chunks_received,
                 'full_transcription': full_transcription,
-                'live_analysis': session['live_analysis'],
+                'live_analysis': session.live_analysis.to_dict(),
                 'final_analysis': final_analysis,
-                'duration_seconds': sum(chunk['size'] for chunk in session['audio_chunks']) / (self.sample_rate * 2)
+                'duration_seconds': session.bytes_received / (self.sample_rate * 2)
             }
             
         except Exception as e:
@@ -257,21 +406,17 @@ class RealTimeTranscriptionService:
             if session_id not in self.active_sessions:
                 raise ValueError(f"Session {session_id} not found")
             
+            # Commit whatever is still buffered or tentative
+            if len(self.active_sessions[session_id].audio):
+                self._process_buffer(session_id, final=True)
+            
             # Get final summary
             summary = self.get_session_summary(session_id)
             
-            # Mark session as inactive
-            self.active_sessions[session_id]['is_active'] = False
-            
-            # Clean up (remove from active sessions after a delay)
-            def cleanup():
-                import time
-                time.sleep(300)  # Keep for 5 minutes for potential retrieval
-                if session_id in self.active_sessions:
-                    del self.active_sessions[session_id]
-                    logger.info(f"Cleaned up session: {session_id}")
-            
-            threading.Thread(target=cleanup, daemon=True).start()
+            # Mark session as inactive; it is kept a while for potential retrieval
+            self.active_sessions[session_id].is_active = False
+            with self._expiry_lock:
+                heapq.heappush(self._expiry_heap, (time.monotonic() + SESSION_RETENTION_SECONDS, session_id))
             
             return summary
             
@@ -279,49 +424,158 @@ class RealTimeTranscriptionService:
             logger.error(f"Error ending session: {str(e)}")
             return {'error': str(e)}
     
+    def _expire_sessions(self):
+        """Remove ended sessions whose retention period has passed"""
+        now = time.monotonic()
+        with self._expiry_lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                _, session_id = heapq.heappop(self._expiry_heap)
+                session = self.active_sessions.get(session_id)
+                # The id may have been reused by a newer, still running session
+                if session is not None and not session.is_active:
+                    del self.active_sessions[session_id]
+                    logger.info(f"Cleaned up session: {session_id}")
+    
     def get_active_sessions(self) -> List[str]:
         """Get list of active session IDs"""
+        self._expire_sessions()
         return [
             session_id for session_id, session in self.active_sessions.items()
-            if session.get('is_active', False)
+            if session.is_active
         ]
 
+class TranscriptionWorker:
+    """
+    Runs blocking chunk transcription for all WebSocket clients off the event loop
+    
+    Chunks are queued from every session and drained in batches of up to
+    max_batch, which are transcribed concurrently on a thread pool; each
+    caller is answered as soon as its own chunk is done.
+    """
+    
+    def __init__(self, transcription_service: 'RealTimeTranscriptionService',
+                 max_batch: int = MAX_BATCH, batch_wait: float = BATCH_WAIT_SECONDS):
+        self.transcription_service = transcription_service
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait
+        self._executor = ThreadPoolExecutor(max_workers=max_batch, thread_name_prefix='transcription')
+        self._queue = None
+        self._task = None
+    
+    async def submit(self, session_id: str, audio_data: bytes) -> Dict[str, Any]:
+        """
+        Queue an audio chunk and wait for its result
+        
+        Args:
+            session_id: Session identifier
+            audio_data: Raw audio data chunk
+            
+        Returns:
+            Dict with partial transcription and analysis
+        """
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done():
+            # Created lazily so the queue belongs to the running loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+        
+        future = loop.create_future()
+        await self._queue.put((session_id, audio_data, future))
+        return await future
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), self.batch_wait))
+                except asyncio.TimeoutError:
+                    break
+            
+            jobs = []
+            for session_id, audio_data, future in batch:
+                job = loop.run_in_executor(
+                    self._executor, self.transcription_service.process_audio_chunk, session_id, audio_data
+                )
+                job.add_done_callback(lambda job, future=future: self._resolve(future, job))
+                jobs.append(job)
+            
+            # Bound the chunks in flight to one batch
+            await asyncio.wait(jobs)
+    
+    @staticmethod
+    def _resolve(future: asyncio.Future, job: asyncio.Future):
+        if future.done():
+            return
+        if job.exception() is not None:
+            future.set_exception(job.exception())
+        else:
+            future.set_result(job.result())
+
 # WebSocket handler for real-time communication
 class RealTimeWebSocketHandler:
     """WebSocket handler for real-time transcription"""
     
     def __init__(self):
         self.transcription_service = RealTimeTranscriptionService()
+        self.worker = TranscriptionWorker(self.transcription_service)
         self.clients = {}  # websocket -> session_id
+        self.locks = {}  # websocket -> asyncio.Lock ordering that connection's session updates
     
     async def handle_client(self, websocket, path):
         """Handle WebSocket client connection"""
+        tasks = set()
+        self.locks[websocket] = asyncio.Lock()
         try:
             logger.info(f"New WebSocket connection: {websocket.remote_address}")
             
             async for message in websocket:
-                try:
-                    data = json.loads(message)
-                    response = await self.process_message(websocket, data)
-                    
-                    if response:
-                        await websocket.send(json.dumps(response))
-                        
-                except json.JSONDecodeError:
-                    await websocket.send(json.dumps({
-                        'error': 'Invalid JSON message'
-                    }))
-                except Exception as e:
-                    await websocket.send(json.dumps({
-                        'error': f'Message processing error: {str(e)}'
-                    }))
+                # Each message is handled in its own task so a slow
+                # transcription doesn't hold up replies to other messages
+                task = asyncio.create_task(self._handle_message(websocket, message))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
                     
         except websockets.exceptions.ConnectionClosed:
             logger.info(f"WebSocket connection closed: {websocket.remote_address}")
         except Exception as e:
             logger.error(f"WebSocket error: {str(e)}")
         finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
             await self.cleanup_client(websocket)
+            self.locks.pop(websocket, None)
+    
+    async def _handle_message(self, websocket, message):
+        """Process one message and send its reply"""
+        try:
+            if isinstance(message, bytes):
+                # Binary frames are raw 16-bit PCM for this connection's session
+                async with self.locks[websocket]:
+                    response = await self.process_audio_frame(websocket, message)
+            else:
+                # Text frames are JSON control messages
+                data = _json_loads(message)
+                if data.get('type') in _ORDERED_MESSAGES:
+                    async with self.locks[websocket]:
+                        response = await self.process_message(websocket, data)
+                else:
+                    response = await self.process_message(websocket, data)
+            
+            if response:
+                await websocket.send(_json_dumps(response))
+                
+        except json.JSONDecodeError:
+            await websocket.send(_json_dumps({
+                'error': 'Invalid JSON message'
+            }))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        except Exception as e:
+            await websocket.send(_json_dumps({
+                'error': f'Message processing error: {str(e)}'
+            }))
     
     async def process_message(self, websocket, data: Dict) -> Dict:
         """Process incoming WebSocket message"""
@@ -349,23 +603,29 @@ class RealTimeWebSocketHandler:
             return {
                 'type': 'session_started',
                 'session_id': session_id,
-                'created_at': session['created_at']
+                'created_at': session.created_at
             }
             
         except Exception as e:
             return {'error': f'Failed to start session: {str(e)}'}
     
     async def process_audio(self, websocket, data: Dict) -> Dict:
-        """Process incoming audio chunk"""
+        """Process a base64 audio chunk sent in a JSON message (legacy clients)"""
+        try:
+            audio_data = base64.b64decode(data.get('audio_data', ''))
+        except Exception as e:
+            return {'error': f'Failed to process audio: {str(e)}'}
+        
+        return await self.process_audio_frame(websocket, audio_data)
+    
+    async def process_audio_frame(self, websocket, audio_data: bytes) -> Dict:
+        """Process an audio chunk received as a binary frame"""
         try:
             session_id = self.clients.get(websocket)
             if not session_id:
                 return {'error': 'No active session'}
             
-            # Decode base64 audio data
-            audio_data = base64.b64decode(data.get('audio_data', ''))
-            
-            result = self.transcription_service.process_audio_chunk(session_id, audio_data)
+            result = await self.worker.submit(session_id, audio_data)
             result['type'] = 'transcription_update'
             
             return result
@@ -380,7 +640,7 @@ class RealTimeWebSocketHandler:
             if not session_id:
                 return {'error': 'No active session'}
             
-            summary = self.transcription_service.end_session(session_id)
+            summary = await asyncio.to_thread(self.transcription_service.end_session, session_id)
             summary['type'] = 'session_ended'
             
             return summary
@@ -395,7 +655,7 @@ class RealTimeWebSocketHandler:
             if not session_id:
                 return {'error': 'No session specified'}
             
-            summary = self.transcription_service.get_session_summary(session_id)
+            summary = await asyncio.to_thread(self.transcription_service.get_session_summary, session_id)
             summary['type'] = 'session_summary'
             
             return summary
@@ -409,7 +669,7 @@ class RealTimeWebSocketHandler:
             session_id = self.clients.get(websocket)
             if session_id:
                 # End session if still active
-                self.transcription_service.end_session(session_id)
+                await asyncio.to_thread(self.transcription_service.end_session, session_id)
                 del self.clients[websocket]
                 logger.info(f"Cleaned up client session: {session_id}")
                 
@@ -430,6 +690,7 @@ if __name__ == "__main__":
     # Example usage
     import asyncio
     
+    logging.basicConfig(level=logging.INFO)
     server = start_websocket_server()
     
     try:
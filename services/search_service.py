@@ -2,21 +2,106 @@ import os
 import json
 import logging
 import math
-from openai import OpenAI
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from services.openai_client import get_client
 from typing import Dict, List, Optional, Any
+from services.llm_cache import LLMCache
+
+# Optional: FAISS inner-product index for large meeting collections
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# Optional: Numba-compiled single-pass cosine kernel for pairwise similarity
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _cosine_kernel(v1, v2):
+        # Dot product and both norms in one pass over the vectors
+        dot = 0.0
+        norm1 = 0.0
+        norm2 = 0.0
+        for i in range(v1.shape[0]):
+            dot += v1[i] * v2[i]
+            norm1 += v1[i] * v1[i]
+            norm2 += v2[i] * v2[i]
+        if norm1 == 0.0 or norm2 == 0.0:
+            return 0.0
+        return dot / (math.sqrt(norm1) * math.sqrt(norm2))
+else:
+    _cosine_kernel = None
+
+# Below this many meetings the query transfer to the GPU costs more than it saves
+GPU_SEARCH_THRESHOLD = int(os.getenv('GPU_SEARCH_THRESHOLD', '10000'))
+
+# From this many meetings on (below the IVF-PQ threshold, without a GPU),
+# search walks an HNSW graph, O(log N) per query, instead of a flat scan;
+# smaller collections are scanned faster than the graph is traversed
+HNSW_SEARCH_THRESHOLD = int(os.getenv('HNSW_SEARCH_THRESHOLD', '1000'))
+HNSW_M = 16  # Graph neighbours per node
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64  # Candidates explored per query; raised to top_k if smaller
+
+# From this many meetings on, search uses a product-quantized IVF index (8-bit
+# codes for every 4 dimensions) trading ~1-2% recall for a much cheaper scan
+PQ_SEARCH_THRESHOLD = int(os.getenv('PQ_SEARCH_THRESHOLD', '50000'))
+
+# IVF-PQ training takes long at that size, so it runs here while searches
+# keep scanning the matrix until the trained index is swapped in
+_index_builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix='search-index')
+
+# From this many meetings on, the in-memory matrix is stored as int8 with a
+# scale per row (a quarter of the float32 footprint) and scored in blocks
+INT8_SEARCH_THRESHOLD = int(os.getenv('INT8_SEARCH_THRESHOLD', '20000'))
+INT8_BLOCK_ROWS = 4096
+
+# Recent query embeddings kept in memory; older ones are still found in the
+# persistent LLM cache
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+# Texts per Embeddings API request; keeps batches of 8000-char inputs under the token limit
+EMBEDDING_BATCH_SIZE = 100
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class SearchService:
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        self.embedding_model = "text-embedding-3-small"
         if not os.getenv('OPENAI_API_KEY'):
             raise ValueError("OPENAI_API_KEY environment variable is required")
+        self.client = get_client()
+        self.embedding_model = "text-embedding-3-small"
+        
+        self.cache = LLMCache()
+        self._query_embeddings = OrderedDict()  # normalized query -> embedding, LRU order
+        self._query_embeddings_lock = threading.Lock()  # Shared by request threads
+        
+        # Embedding index for the most recently searched meeting list; the
+        # lock covers all index state, which searches on other threads share
+        self._index_lock = threading.RLock()
+        self._data_version = 0  # Bumped by invalidate_index() when meetings are saved
+        self._indexed_version = 0
+        self._index_generation = 0  # Bumped on every rebuild
+        self._indexed_meetings = None
+        self._indexed_embeddings = []  # Embedding of each indexed meeting, as indexed
+        self._index_rows = []  # Meetings aligned with matrix rows
+        self._embedding_matrix = None  # (N, D) float32 or int8, rows L2-normalized
+        self._row_scales = None  # (N,) float32 dequantization scales when int8
+        # Backing arrays with spare rows; the two above are views of their first N rows
+        self._matrix_buffer = None
+        self._scales_buffer = None
+        self._faiss_index = None
+        self._gpu_resources = None
+        self._pq_quantizer = None  # Must outlive the IVF index that uses it
     
-    def create_embedding(self, text: str) -> List[float]:
+    def create_embedding(self, text: str) -> np.ndarray:
         """
         Create embedding for text using OpenAI Embeddings API
         
@@ -24,7 +109,7 @@ class SearchService:
             text (str): Text to embed
             
         Returns:
-            list: Embedding vector
+            np.ndarray: L2-normalized float32 embedding vector
         """
         try:
             if not text or not text.strip():
@@ -38,7 +123,7 @@ class SearchService:
                 input=text
             )
             
-            embedding = response.data[0].embedding
+            embedding = self._normalize_rows([response.data[0].embedding])[0]
             logger.info(f"Successfully created embedding for text of length {len(text)}")
             return embedding
         
@@ -46,37 +131,111 @@ class SearchService:
             logger.error(f"Embedding creation failed: {str(e)}")
             raise Exception(f"Embedding creation failed: {str(e)}")
     
-    def cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        Embedding for a search query, reusing earlier embeddings of the same query
+        
+        Queries are compared case- and whitespace-insensitively. Repeats are
+        answered from memory or the persistent cache instead of the API.
+        
+        Args:
+            query (str): Search query
+            
+        Returns:
+            np.ndarray: float32 embedding vector (read-only)
+        """
+        key = " ".join(query.lower().split())[:8000]
+        with self._query_embeddings_lock:
+            embedding = self._query_embeddings.get(key)
+            if embedding is not None:
+                self._query_embeddings.move_to_end(key)
+                return embedding
+        
+        request = {'model': self.embedding_model, 'input': key}
+        cached = self.cache.get(request)
+        if cached is not None:
+            embedding = np.asarray(cached, dtype=np.float32)
+        else:
+            embedding = np.asarray(self.create_embedding(key), dtype=np.float32)
+            self.cache.set(request, embedding.tolist())
+        
+        embedding.setflags(write=False)
+        # The API call above runs unlocked; a concurrent miss for the same
+        # query just stores an equal embedding
+        with self._query_embeddings_lock:
+            self._query_embeddings[key] = embedding
+            self._query_embeddings.move_to_end(key)
+            if len(self._query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embeddings.popitem(last=False)
+        return embedding
+    
+    def create_embeddings_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Create embeddings for many texts with batched Embeddings API calls
+        
+        Args:
+            texts (list): Texts to embed
+            
+        Returns:
+            np.ndarray: (len(texts), D) float32 matrix, rows L2-normalized and in input order
+        """
+        try:
+            if not texts:
+                raise ValueError("No texts provided for embedding")
+            if any(not text or not text.strip() for text in texts):
+                raise ValueError("Text cannot be empty for embedding")
+            
+            # Limit text length to avoid API limits
+            texts = [text[:8000] for text in texts]
+            
+            embeddings = []
+            for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+                response = self.client.embeddings.create(
+                    model=self.embedding_model,
+                    input=texts[start:start + EMBEDDING_BATCH_SIZE]
+                )
+                embeddings.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+            
+            logger.info(f"Successfully created {len(embeddings)} embeddings")
+            return self._normalize_rows(embeddings)
+        
+        except Exception as e:
+            logger.error(f"Batch embedding creation failed: {str(e)}")
+            raise Exception(f"Batch embedding creation failed: {str(e)}")
+    
+    def cosine_similarity(self, vec1, vec2) -> float:
         """
         Calculate cosine similarity between two vectors
         
         Args:
-            vec1 (list): First vector
-            vec2 (list): Second vector
+            vec1 (list or np.ndarray): First vector
+            vec2 (list or np.ndarray): Second vector
             
         Returns:
             float: Cosine similarity score
         """
         try:
+            v1 = np.asarray(vec1, dtype=np.float32)
+            v2 = np.asarray(vec2, dtype=np.float32)
+            
             # Handle edge cases
-            if len(vec1) != len(vec2):
-                logger.warning(f"Vector length mismatch: {len(vec1)} vs {len(vec2)}")
+            if v1.shape != v2.shape:
+                logger.warning(f"Vector length mismatch: {v1.size} vs {v2.size}")
                 return 0.0
             
-            if len(vec1) == 0:
+            if v1.size == 0:
                 return 0.0
             
-            # Calculate dot product
-            dot_product = sum(a * b for a, b in zip(vec1, vec2))
+            if _cosine_kernel is not None:
+                return max(-1.0, min(1.0, float(_cosine_kernel(v1, v2))))
             
-            # Calculate magnitudes
-            magnitude1 = math.sqrt(sum(a * a for a in vec1))
-            magnitude2 = math.sqrt(sum(a * a for a in vec2))
+            magnitude1 = np.linalg.norm(v1)
+            magnitude2 = np.linalg.norm(v2)
             
             if magnitude1 == 0 or magnitude2 == 0:
                 return 0.0
             
-            similarity = dot_product / (magnitude1 * magnitude2)
+            similarity = float(np.dot(v1, v2) / (magnitude1 * magnitude2))
             return max(-1.0, min(1.0, similarity))  # Clamp to [-1, 1]
         
         except Exception as e:
@@ -106,53 +265,340 @@ class SearchService:
             
             # Create embedding for query
             try:
-                query_embedding = self.create_embedding(query)
+                query_embedding = self.embed_query(query)
             except Exception as e:
                 logger.error(f"Failed to create query embedding: {str(e)}")
                 return []
             
-            # Calculate similarities
+            # Score all indexed meetings in one vectorized pass
+            with self._index_lock:
+                self._ensure_index(meetings)
+                if self._embedding_matrix is None:
+                    logger.warning("No meetings with embeddings available for search")
+                    return []
+                
+                rows, similarities = self._top_matches(query_embedding, top_k)
+                matches = [self._index_rows[row] for row in rows]
+                indexed = len(self._index_rows)
+            
             results = []
-            for meeting in meetings:
-                try:
-                    # Check if meeting has required fields
-                    if not isinstance(meeting, dict):
-                        continue
-                    
-                    if 'embedding' not in meeting or not meeting['embedding']:
-                        logger.warning(f"Meeting {meeting.get('id', 'unknown')} missing embedding")
-                        continue
-                    
-                    similarity = self.cosine_similarity(query_embedding, meeting['embedding'])
-                    
-                    # Extract safe data
-                    analysis = meeting.get('analysis', {})
-                    summary = analysis.get('summary', '')
-                    
-                    result = {
-                        'meeting_id': meeting.get('id', 'unknown'),
-                        'filename': meeting.get('filename', 'unknown'),
-                        'timestamp': meeting.get('timestamp', ''),
-                        'similarity': similarity,
-                        'summary': summary[:300] + '...' if len(summary) > 300 else summary,
-                        'topics': analysis.get('topics_discussed', []),
-                        'action_items_count': len(analysis.get('action_items', []))
-                    }
-                    results.append(result)
+            for meeting, similarity in zip(matches, similarities):
+                analysis = meeting.get('analysis', {})
+                summary = analysis.get('summary', '')
                 
-                except Exception as e:
-                    logger.error(f"Error processing meeting {meeting.get('id', 'unknown')}: {str(e)}")
-                    continue
+                results.append({
+                    'meeting_id': meeting.get('id', 'unknown'),
+                    'filename': meeting.get('filename', 'unknown'),
+                    'timestamp': meeting.get('timestamp', ''),
+                    'similarity': similarity,
+                    'summary': summary[:300] + '...' if len(summary) > 300 else summary,
+                    'topics': analysis.get('topics_discussed', []),
+                    'action_items_count': len(analysis.get('action_items', []))
+                })
             
-            # Sort by similarity and return top results
-            results.sort(key=lambda x: x['similarity'], reverse=True)
-            logger.info(f"Search completed: found {len(results)} results for query '{query}'")
-            return results[:top_k]
+            logger.info(f"Search completed: scored {indexed} meetings for query '{query}'")
+            return results
         
         except Exception as e:
             logger.error(f"Meeting search failed: {str(e)}")
             return []
     
+    def invalidate_index(self):
+        """Note that meetings were saved, so the index is re-checked on the next search"""
+        with self._index_lock:
+            self._data_version += 1
+    
+    def _ensure_index(self, meetings: List[Dict]):
+        """
+        Keep the normalized embedding matrix in step with the meeting list
+        
+        Until invalidate_index() is called the index is reused as is.
+        Afterwards, meetings appended to the indexed list are added as new
+        rows if the embeddings already indexed are unchanged; any other
+        change (such as embeddings replaced in place) rebuilds the matrix.
+        Callers hold the index lock.
+        
+        Args:
+            meetings (list): List of meeting data
+        """
+        indexed_count = len(self._indexed_embeddings)
+        if meetings is self._indexed_meetings:
+            if self._indexed_version == self._data_version and len(meetings) == indexed_count:
+                return
+            if len(meetings) >= indexed_count and self._embeddings_unchanged(meetings):
+                if len(meetings) > indexed_count and self._embedding_matrix is not None:
+                    self._extend_index(meetings[indexed_count:])
+                    self._indexed_embeddings.extend(self._embeddings_of(meetings[indexed_count:]))
+                    self._indexed_version = self._data_version
+                    return
+                if len(meetings) == indexed_count:
+                    self._indexed_version = self._data_version
+                    return
+        
+        rows, vectors = self._collect_embeddings(meetings, None)
+        matrix = None
+        faiss_index = None
+        self._index_generation += 1
+        if vectors:
+            matrix = self._normalize_rows(vectors)
+            if faiss is not None:
+                faiss_index = self._build_faiss_index(matrix)
+        
+        row_scales = None
+        if matrix is not None and len(matrix) >= INT8_SEARCH_THRESHOLD:
+            matrix, row_scales = self._quantize_rows(matrix)
+        
+        self._indexed_meetings = meetings
+        self._indexed_embeddings = self._embeddings_of(meetings)
+        self._indexed_version = self._data_version
+        self._index_rows = rows
+        self._embedding_matrix = self._matrix_buffer = matrix
+        self._row_scales = self._scales_buffer = row_scales
+        self._faiss_index = faiss_index
+    
+    @staticmethod
+    def _embeddings_of(meetings: List[Dict]) -> List[Any]:
+        """The embedding object of each meeting, for spotting later replacements"""
+        return [m.get('embedding') if isinstance(m, dict) else None for m in meetings]
+    
+    def _embeddings_unchanged(self, meetings: List[Dict]) -> bool:
+        """Whether the meetings indexed so far still hold the embeddings they were indexed with"""
+        return all(
+            (m.get('embedding') if isinstance(m, dict) else None) is embedding
+            for m, embedding in zip(meetings, self._indexed_embeddings)
+        )
+    
+    def _extend_index(self, new_meetings: List[Dict]):
+        """Append rows for newly added meetings to the existing index"""
+        rows, vectors = self._collect_embeddings(new_meetings, self._embedding_matrix.shape[1])
+        if not vectors:
+            return
+        
+        matrix = self._normalize_rows(vectors)
+        self._index_rows.extend(rows)
+        if self._faiss_index is not None:
+            self._faiss_index.add(matrix)
+        count = len(self._embedding_matrix)
+        if self._row_scales is not None:
+            matrix, row_scales = self._quantize_rows(matrix)
+            self._scales_buffer = self._append_rows(self._scales_buffer, count, row_scales)
+            self._row_scales = self._scales_buffer[:count + len(row_scales)]
+        self._matrix_buffer = self._append_rows(self._matrix_buffer, count, matrix)
+        self._embedding_matrix = self._matrix_buffer[:count + len(matrix)]
+    
+    @staticmethod
+    def _append_rows(buffer: np.ndarray, count: int, rows: np.ndarray) -> np.ndarray:
+        """
+        Write rows after the first count rows of a buffer, doubling it when full
+        
+        Growing geometrically keeps a run of single-meeting appends at
+        amortized O(1) copying instead of copying the whole matrix each time.
+        
+        Args:
+            buffer (np.ndarray): Backing array whose first count rows are in use
+            count (int): Rows in use
+            rows (np.ndarray): Rows to append
+            
+        Returns:
+            np.ndarray: The buffer, or a larger copy of it, holding the new rows
+        """
+        needed = count + len(rows)
+        if needed > len(buffer):
+            grown = np.empty((max(needed, 2 * len(buffer)),) + buffer.shape[1:], dtype=buffer.dtype)
+            grown[:count] = buffer[:count]
+            buffer = grown
+        buffer[count:needed] = rows
+        return buffer
+    
+    @staticmethod
+    def _collect_embeddings(meetings: List[Dict], dimension: Optional[int]):
+        """
+        Pick out meetings with usable embeddings
+        
+        Args:
+            meetings (list): List of meeting data
+            dimension (int): Required embedding length, or None to take the first one's
+            
+        Returns:
+            tuple: (meetings, embeddings) for the meetings that can be indexed
+        """
+        rows = []
+        vectors = []
+        for meeting in meetings:
+            if not isinstance(meeting, dict):
+                continue
+            
+            embedding = meeting.get('embedding')
+            if embedding is None or len(embedding) == 0:
+                logger.warning(f"Meeting {meeting.get('id', 'unknown')} missing embedding")
+                continue
+            
+            if dimension is None:
+                dimension = len(embedding)
+            elif len(embedding) != dimension:
+                logger.warning(f"Meeting {meeting.get('id', 'unknown')} embedding length mismatch: {len(embedding)} vs {dimension}")
+                continue
+            
+            rows.append(meeting)
+            vectors.append(embedding)
+        return rows, vectors
+    
+    @staticmethod
+    def _normalize_rows(vectors) -> np.ndarray:
+        """Stack vectors into a float32 matrix with L2-normalized rows"""
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        return matrix
+    
+    @staticmethod
+    def _quantize_rows(matrix: np.ndarray):
+        """
+        Quantize rows to int8 with a symmetric per-row scale
+        
+        Args:
+            matrix (np.ndarray): (N, D) float32 matrix
+            
+        Returns:
+            tuple: ((N, D) int8 matrix, (N,) float32 scales) with row ~= int8 row * scale
+        """
+        scales = np.abs(matrix).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.round(matrix / scales[:, None]).astype(np.int8)
+        return quantized, scales.astype(np.float32)
+    
+    def _score_rows(self, query: np.ndarray) -> np.ndarray:
+        """Inner products of every indexed row with a normalized query"""
+        if self._row_scales is None:
+            return self._embedding_matrix @ query
+        
+        # NumPy has no int8 BLAS kernel, so each block is widened to float32
+        # while it is cache-resident; the query itself stays float32
+        scores = np.empty(len(self._row_scales), dtype=np.float32)
+        for start in range(0, len(scores), INT8_BLOCK_ROWS):
+            block = self._embedding_matrix[start:start + INT8_BLOCK_ROWS]
+            scores[start:start + len(block)] = block.astype(np.float32) @ query
+        scores *= self._row_scales
+        return scores
+    
+    def _build_faiss_index(self, matrix: np.ndarray):
+        """
+        Pick and fill a FAISS index for the normalized embedding matrix
+        
+        Args:
+            matrix (np.ndarray): (N, D) float32 matrix with L2-normalized rows
+            
+        Returns:
+            faiss.Index: Inner-product index over the matrix rows
+        """
+        count, dimension = matrix.shape
+        
+        if count >= PQ_SEARCH_THRESHOLD and dimension % 4 == 0:
+            # Searches scan the matrix until the trained index is swapped in
+            _index_builder.submit(self._train_pq_index, matrix, self._index_generation)
+            return None
+        
+        if count > GPU_SEARCH_THRESHOLD and self._gpu_available():
+            index = faiss.index_cpu_to_gpu(self._gpu_resources, 0, faiss.IndexFlatIP(dimension))
+        elif count >= HNSW_SEARCH_THRESHOLD:
+            index = faiss.IndexHNSWFlat(dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            logger.info(f"Building HNSW search index over {count} meetings")
+        else:
+            index = faiss.IndexFlatIP(dimension)
+        index.add(matrix)
+        return index
+    
+    def _train_pq_index(self, matrix: np.ndarray, generation: int) -> None:
+        """
+        Train an IVF-PQ index in the background and swap it in when done
+        
+        Args:
+            matrix (np.ndarray): (N, D) float32 matrix with L2-normalized rows
+            generation (int): Index generation the matrix was taken from
+        """
+        try:
+            count, dimension = matrix.shape
+            nlist = max(4, int(math.sqrt(count)))
+            quantizer = faiss.IndexFlatIP(dimension)
+            index = faiss.IndexIVFPQ(quantizer, dimension, nlist, dimension // 4, 8, faiss.METRIC_INNER_PRODUCT)
+            index.train(matrix)
+            index.add(matrix)
+            index.nprobe = max(1, nlist // 16)
+        except Exception as e:
+            logger.error(f"Building IVF-PQ search index failed: {str(e)}")
+            return
+        
+        with self._index_lock:
+            if generation != self._index_generation:
+                return  # Rebuilt in the meantime; that rebuild trains its own index
+            
+            # Catch up with rows appended while training
+            appended = self._embedding_matrix[count:]
+            if len(appended):
+                if self._row_scales is not None:
+                    appended = appended.astype(np.float32) * self._row_scales[count:, None]
+                index.add(np.ascontiguousarray(appended, dtype=np.float32))
+            self._pq_quantizer = quantizer
+            self._faiss_index = index
+        logger.info(f"Built IVF-PQ search index over {count} meetings ({nlist} lists)")
+    
+    def _gpu_available(self) -> bool:
+        """Whether FAISS was built with GPU support and a GPU is present"""
+        if self._gpu_resources is not None:
+            return True
+        
+        try:
+            if not hasattr(faiss, 'StandardGpuResources') or faiss.get_num_gpus() == 0:
+                return False
+            self._gpu_resources = faiss.StandardGpuResources()
+            logger.info("Using FAISS GPU index for meeting search")
+            return True
+        except Exception as e:
+            logger.warning(f"FAISS GPU unavailable, using CPU index: {str(e)}")
+            return False
+    
+    def _top_matches(self, query_embedding: List[float], top_k: int):
+        """
+        Rank indexed meetings against a query embedding
+        
+        Args:
+            query_embedding (list): Query vector
+            top_k (int): Number of matches to return
+            
+        Returns:
+            tuple: (row indices, cosine similarities), best match first
+        """
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if query.shape[0] != self._embedding_matrix.shape[1]:
+            logger.warning(f"Vector length mismatch: {query.shape[0]} vs {self._embedding_matrix.shape[1]}")
+            return [], []
+        
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return [], []
+        query = query / norm
+        k = min(top_k, len(self._index_rows))
+        if k <= 0:
+            return [], []
+        
+        if self._faiss_index is not None:
+            if isinstance(self._faiss_index, faiss.IndexHNSWFlat):
+                self._faiss_index.hnsw.efSearch = max(HNSW_EF_SEARCH, k)
+            scores, rows = self._faiss_index.search(query.reshape(1, -1), k)
+            found = rows[0] >= 0  # IVF indexes pad with -1 when fewer than k are probed
+            rows, scores = rows[0][found], scores[0][found]
+        else:
+            scores = self._score_rows(query)
+            # O(N) selection of the k best, then sort only those k
+            rows = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+            rows = rows[np.argsort(-scores[rows], kind='stable')]
+            scores = scores[rows]
+        
+        similarities = np.clip(scores, -1.0, 1.0)
+        return rows.tolist(), [float(s) for s in similarities]
+    
     def find_similar_meetings(self, meeting_id: int, meetings: List[Dict], top_k: int = 3) -> List[Dict]:
         """
         Find meetings similar to a given meeting
@@ -177,37 +623,34 @@ class SearchService:
                 logger.warning(f"Reference meeting {meeting_id} not found or missing embedding")
                 return []
             
-            reference_embedding = reference_meeting['embedding']
+            # Score every indexed meeting against the reference in one pass;
+            # one extra match is fetched since the reference scores itself
+            with self._index_lock:
+                self._ensure_index(meetings)
+                if self._embedding_matrix is None:
+                    return []
+                
+                rows, similarities = self._top_matches(reference_meeting['embedding'], top_k + 1)
+                matches = [self._index_rows[row] for row in rows]
             
-            # Calculate similarities with other meetings
-            similarities = []
-            for meeting in meetings:
-                if meeting.get('id') == meeting_id or 'embedding' not in meeting:
+            results = []
+            for meeting, similarity in zip(matches, similarities):
+                if meeting.get('id') == meeting_id:
                     continue
                 
-                try:
-                    similarity = self.cosine_similarity(reference_embedding, meeting['embedding'])
-                    
-                    analysis = meeting.get('analysis', {})
-                    summary = analysis.get('summary', '')
-                    
-                    result = {
-                        'meeting_id': meeting.get('id'),
-                        'filename': meeting.get('filename', 'unknown'),
-                        'timestamp': meeting.get('timestamp', ''),
-                        'similarity': similarity,
-                        'summary': summary[:200] + '...' if len(summary) > 200 else summary
-                    }
-                    similarities.append(result)
+                analysis = meeting.get('analysis', {})
+                summary = analysis.get('summary', '')
                 
-                except Exception as e:
-                    logger.error(f"Error processing similar meeting {meeting.get('id')}: {str(e)}")
-                    continue
+                results.append({
+                    'meeting_id': meeting.get('id'),
+                    'filename': meeting.get('filename', 'unknown'),
+                    'timestamp': meeting.get('timestamp', ''),
+                    'similarity': similarity,
+                    'summary': summary[:200] + '...' if len(summary) > 200 else summary
+                })
             
-            # Sort by similarity and return top results
-            similarities.sort(key=lambda x: x['similarity'], reverse=True)
-            logger.info(f"Found {len(similarities)} similar meetings to {meeting_id}")
-            return similarities[:top_k]
+            logger.info(f"Found {len(results)} similar meetings to {meeting_id}")
+            return results[:top_k]
         
         except Exception as e:
             logger.error(f"Similar meeting search failed: {str(e)}")
@@ -256,20 +699,10 @@ class SearchService:
                     logger.error(f"Error processing meeting insights for {meeting.get('id')}: {str(e)}")
                     continue
             
-            # Find common themes
-            if all_topics:
-                # Simple frequency-based approach
-                topic_counts = {}
-                for topic in all_topics:
-                    topic_lower = topic.lower().strip()
-                    if topic_lower:
-                        topic_counts[topic_lower] = topic_counts.get(topic_lower, 0) + 1
-                
-                # Get topics that appear more than once
-                common_themes = [topic for topic, count in topic_counts.items() if count > 1]
-                common_themes = sorted(common_themes, key=lambda x: topic_counts[x], reverse=True)[:5]
-            else:
-                common_themes = []
+            # Find common themes: the most frequent topics that appear more than once
+            normalized = (topic.lower().strip() for topic in all_topics)
+            topic_counts = Counter(topic for topic in normalized if topic)
+            common_themes = [topic for topic, count in topic_counts.most_common(5) if count > 1]
             
             insights = {
                 'common_themes': common_themes,
@@ -1,25 +1,341 @@
 import os
+import re
 import json
+import time
+import hashlib
+import asyncio
 import logging
-from openai import OpenAI
+import threading
+import httpx
+import openai
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from openai import AsyncOpenAI
+from services.openai_client import get_client, get_async_client
 from typing import Dict, List, Optional, Any
+from services.llm_cache import LLMCache
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+IMAGE_MODEL = "dall-e-3"
+IMAGE_QUALITY = "standard"
+
+# Drafts (previews and thumbnails) use the cheaper, faster DALL-E 2 at
+# 512x512; it accepts prompts of up to 1000 characters and has no quality
+DRAFT_IMAGE_MODEL = "dall-e-2"
+DRAFT_IMAGE_SIZE = "512x512"
+DRAFT_PROMPT_LIMIT = 1000
+
+# Generated image URLs expire after about an hour, so cached ones are only
+# reused well inside that window
+VISUAL_CACHE_TTL = int(os.getenv('VISUAL_CACHE_TTL', '3000'))
+
+# Generated images are copied under static/ in the background, so they
+# outlive the temporary OpenAI URL and are served by Flask afterwards
+IMAGE_DOWNLOAD_TIMEOUT = 30
+
+# Records of local copies are kept as long as the files themselves
+LOCAL_COPY_TTL = 10 * 365 * 24 * 3600
+
+_download_executor = ThreadPoolExecutor(max_workers=2)
+
+# Shown instead of a generated image while DALL-E is failing
+PLACEHOLDER_URL = '/static/images/placeholder.svg'
+
+# Errors that mean the image API itself is struggling (rate limits, 5xx,
+# connection failures), as opposed to a problem with one request
+_TRANSIENT_ERRORS = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+
+class CircuitBreaker:
+    """
+    Stop calling a failing API for a while
+    
+    After fail_max consecutive transient failures the breaker opens and
+    calls fail fast for reset_timeout seconds; then one trial call is let
+    through, which closes the breaker again if it succeeds.
+    """
+    
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 30):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Whether a call may go ahead now"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            # Half-open: let this call through and hold back the rest until it reports
+            self._opened_at = time.monotonic()
+            return True
+    
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+    
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.fail_max:
+                self._opened_at = time.monotonic()
+
+# Shared by every VisualService so one user's failures spare the next user the wait
+_breaker = CircuitBreaker(int(os.getenv('VISUAL_BREAKER_FAIL_MAX', '5')),
+                          float(os.getenv('VISUAL_BREAKER_RESET_SECONDS', '30')))
+
+# Fixed style blocks lead every prompt and per-call content follows the
+# separator, so prompts share a byte-identical prefix
+_PROMPT_SEPARATOR = "\n\n---\n"
+
+_STATIC_STYLE_PROMPT = """Create a professional, clean infographic-style illustration that represents a business meeting summary. The image should include:
+
+- Modern office or meeting room setting
+- Professional business people discussing
+- Visual elements like charts, graphs, or presentation screens
+- Clean, corporate aesthetic with blue and white color scheme
+- Symbols representing collaboration, decisions, and action items
+- Abstract elements suggesting productivity and efficiency
+
+Style: Modern, clean, professional infographic. No text or words in the image."""
+
+_PRESENTATION_STYLE_PROMPT = """Create a professional presentation slide background with abstract business elements.
+
+Style requirements:
+- Clean, modern design suitable for business presentations
+- Professional color palette (blues, grays, whites)
+- Abstract geometric shapes and business icons
+- Space for text overlay
+- Corporate meeting room aesthetic
+- No text or words in the image
+- High contrast for readability when text is added later"""
+
+_CONCEPT_STYLE_PROMPT = """Create a professional conceptual illustration of the concept described at the end.
+
+Style requirements:
+- Clean, modern business illustration
+- Abstract but meaningful visual metaphors
+- Professional color palette
+- Suitable for business stakeholders
+- Clear visual hierarchy
+- No text or words in the image
+- Infographic-style design elements"""
+
+_DEFAULT_THEMES = ('business meeting', 'collaboration', 'productivity')
+
+@lru_cache(maxsize=512)
+def _build_presentation_prompt(themes: tuple) -> str:
+    """Presentation asset prompt for a sorted tuple of themes"""
+    return _PRESENTATION_STYLE_PROMPT + _PROMPT_SEPARATOR + f"Key themes to represent visually: {', '.join(themes)}"
+
+# Summary keywords that add a hint to the visual prompt, in prompt order
+_VISUAL_HINTS = (
+    ('project', ('project',), "Include project management elements like timelines or milestones."),
+    ('decision', ('decision',), "Emphasize decision-making with visual elements like checkmarks or selection symbols."),
+    ('finance', ('budget', 'financial', 'cost', 'revenue'), "Include financial elements like charts or calculator symbols.")
+)
+_HINT_CATEGORY = {word: category for category, words, _ in _VISUAL_HINTS for word in words}
+_HINT_RE = re.compile('|'.join(_HINT_CATEGORY), re.IGNORECASE)
+
 class VisualService:
-    def __init__(self):
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    def __init__(self, static_folder: Optional[str] = None, static_url_path: str = '/static'):
         if not os.getenv('OPENAI_API_KEY'):
             raise ValueError("OPENAI_API_KEY environment variable is required")
+        self.client = get_client()
+        
+        # Same request (and summary) -> same image; an empty path disables the cache
+        cache_path = '' if os.getenv('VISUAL_CACHE_DISABLED') else None
+        self.cache = LLMCache(cache_path, VISUAL_CACHE_TTL)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Local copies of generated images go under the static folder so they
+        # can be served; an empty directory disables them
+        self.static_folder = os.path.abspath(static_folder or 'static')
+        self.static_url_path = static_url_path.rstrip('/')
+        self.image_dir = self._resolve_image_dir(os.getenv('VISUAL_IMAGE_DIR', 'static/images/visuals'))
+        # Local file of each stored image by OpenAI URL, kept as long as the
+        # file; by request it is only reused for as long as the cache entry
+        self.local_copies = LLMCache(None, LOCAL_COPY_TTL)
+        self.cached_copies = LLMCache(cache_path, VISUAL_CACHE_TTL)
+    
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """OpenAI client for the running event loop (only usable inside a coroutine)"""
+        return get_async_client()
+    
+    def _resolve_image_dir(self, image_dir: str) -> str:
+        """Absolute image directory, or '' if it is disabled or can't be served"""
+        if not image_dir:
+            return ''
+        # Relative paths are taken from the app root (the static folder's parent)
+        if not os.path.isabs(image_dir):
+            image_dir = os.path.join(os.path.dirname(self.static_folder), image_dir)
+        image_dir = os.path.abspath(image_dir)
+        if os.path.commonpath([image_dir, self.static_folder]) != self.static_folder:
+            logger.warning(f"Image directory {image_dir} is outside the static folder; local copies disabled")
+            return ''
+        return image_dir
     
-    def generate_visual_summary(self, meeting_summary: str) -> str:
+    @staticmethod
+    def _image_request(prompt: str, size: str, draft: bool = False) -> Dict[str, Any]:
+        """Image generation arguments for a full-quality image or a draft"""
+        if draft:
+            return {'model': DRAFT_IMAGE_MODEL, 'size': DRAFT_IMAGE_SIZE, 'prompt': prompt[:DRAFT_PROMPT_LIMIT]}
+        return {'model': IMAGE_MODEL, 'size': size, 'quality': IMAGE_QUALITY, 'prompt': prompt}
+    
+    def _generate(self, prompt: str, size: str, use_cache: bool = True, draft: bool = False,
+                  subject: Optional[str] = None) -> str:
+        """
+        Generate one image, reusing a recent result for the same request
+        
+        Args:
+            prompt (str): Complete DALL-E prompt
+            size (str): Image size
+            use_cache (bool): Look up an earlier result first (the new one is stored either way)
+            draft (bool): Generate a quick low-resolution draft instead
+            subject (str): Text the image is for when the prompt doesn't contain
+                it; only part of the cache key, so other texts get their own image
+            
+        Returns:
+            str: URL of generated image
+        """
+        request = self._image_request(prompt, size, draft)
+        key = self._cache_key(request, subject)
+        cached = self._cache_lookup(key) if use_cache else None
+        if cached is not None:
+            return cached
+        
+        if not _breaker.allow():
+            logger.warning("Image generation paused after repeated failures, returning placeholder")
+            return PLACEHOLDER_URL
+        try:
+            response = self.client.images.generate(n=1, **request)
+        except _TRANSIENT_ERRORS:
+            _breaker.record_failure()
+            raise
+        _breaker.record_success()
+        
+        return self._store(key, response.data[0].url)
+    
+    async def _agenerate(self, prompt: str, size: str, use_cache: bool = True, draft: bool = False,
+                         subject: Optional[str] = None) -> str:
+        """Async variant of _generate()"""
+        request = self._image_request(prompt, size, draft)
+        key = self._cache_key(request, subject)
+        cached = self._cache_lookup(key) if use_cache else None
+        if cached is not None:
+            return cached
+        
+        if not _breaker.allow():
+            logger.warning("Image generation paused after repeated failures, returning placeholder")
+            return PLACEHOLDER_URL
+        try:
+            response = await self.async_client.images.generate(n=1, **request)
+        except _TRANSIENT_ERRORS:
+            _breaker.record_failure()
+            raise
+        _breaker.record_success()
+        
+        return self._store(key, response.data[0].url)
+    
+    @staticmethod
+    def _cache_key(request: Dict[str, Any], subject: Optional[str]) -> Dict[str, Any]:
+        """Cache key for an image request, scoped to the text it illustrates"""
+        if subject is None:
+            return request
+        return {**request, 'subject': subject}
+    
+    def _local_path(self, image_url: str) -> str:
+        """Location of the local copy of a generated image (unique per image)"""
+        return os.path.join(self.image_dir, f"{hashlib.sha256(image_url.encode('utf-8')).hexdigest()[:16]}.png")
+    
+    def _local_copy(self, records: LLMCache, key: Dict[str, Any]) -> Optional[str]:
+        """Static URL of a recorded local copy, if its file still exists"""
+        path = records.get(key)
+        if not path or not os.path.exists(path):
+            return None
+        return f"{self.static_url_path}/{os.path.relpath(path, self.static_folder).replace(os.sep, '/')}"
+    
+    def local_url(self, image_url: str) -> Optional[str]:
+        """
+        Find the local copy of an image generated earlier
+        
+        Args:
+            image_url (str): Temporary OpenAI URL returned when it was generated
+            
+        Returns:
+            str: Static URL of the stored copy, or None if there is none (yet)
+        """
+        if not self.image_dir or not image_url or not image_url.startswith('http'):
+            return None
+        return self._local_copy(self.local_copies, {'image_url': image_url})
+    
+    def _store(self, request: Dict[str, Any], image_url: str) -> str:
+        """
+        Remember a freshly generated image and start copying it locally
+        
+        The OpenAI URL is returned straight away; later requests for the same
+        image are served from the local copy once it has been written.
+        
+        Args:
+            request (dict): Cache key of the image request
+            image_url (str): Temporary OpenAI image URL
+            
+        Returns:
+            str: URL to hand to the caller
+        """
+        self.cache.set(request, image_url)
+        if self.image_dir:
+            _download_executor.submit(self._download, request, image_url)
+        return image_url
+    
+    def _download(self, request: Dict[str, Any], image_url: str) -> None:
+        """Write the image behind a temporary URL to a local file and record it"""
+        try:
+            path = self._local_path(image_url)
+            response = httpx.get(image_url, timeout=IMAGE_DOWNLOAD_TIMEOUT)
+            response.raise_for_status()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so readers never see a partial image
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(response.content)
+            os.replace(tmp_path, path)
+            
+            self.local_copies.set({'image_url': image_url}, path)
+            self.cached_copies.set({'request': request}, path)
+        except Exception as e:
+            logger.warning(f"Failed to store generated image locally: {str(e)}")
+    
+    def _cache_lookup(self, request: Dict[str, Any]) -> Optional[str]:
+        """Return a cached image URL for the request and count the hit or miss"""
+        if self.image_dir:
+            local_url = self._local_copy(self.cached_copies, {'request': request})
+            if local_url:
+                self.cache_hits += 1
+                return local_url
+        
+        cached = self.cache.get(request)
+        if cached is None:
+            self.cache_misses += 1
+            return None
+        self.cache_hits += 1
+        logger.info(f"Visual cache hit ({self.cache_hits} hits, {self.cache_misses} misses)")
+        return cached
+    
+    def generate_visual_summary(self, meeting_summary: str, use_cache: bool = True, draft: bool = False) -> str:
         """
         Generate visual summary using DALL-E 3
         
         Args:
             meeting_summary (str): Meeting summary text
+            use_cache (bool): Reuse a recent image for the same summary
+            draft (bool): Quick 512x512 DALL-E 2 preview instead
             
         Returns:
             str: URL of generated image
@@ -31,15 +347,32 @@ class VisualService:
             # Create a prompt for DALL-E based on meeting content
             prompt = self._create_visual_prompt(meeting_summary)
             
-            response = self.client.images.generate(
-                model="dall-e-3",
-                prompt=prompt,
-                size="1024x1024",
-                quality="standard",
-                n=1
-            )
+            image_url = self._generate(prompt, "1024x1024", use_cache, draft, subject=meeting_summary)
+            logger.info("Successfully generated visual summary")
+            return image_url
+        
+        except Exception as e:
+            logger.error(f"Visual generation failed: {str(e)}")
+            raise Exception(f"Visual generation failed: {str(e)}")
+    
+    async def agenerate_visual_summary(self, meeting_summary: str, use_cache: bool = True, draft: bool = False) -> str:
+        """
+        Async variant of generate_visual_summary() for overlapping several images
+        
+        Args:
+            meeting_summary (str): Meeting summary text
+            use_cache (bool): Reuse a recent image for the same summary
+            draft (bool): Quick 512x512 DALL-E 2 preview instead
+            
+        Returns:
+            str: URL of generated image
+        """
+        try:
+            if not meeting_summary or not meeting_summary.strip():
+                raise ValueError("Meeting summary cannot be empty")
             
-            image_url = response.data[0].url
+            image_url = await self._agenerate(self._create_visual_prompt(meeting_summary), "1024x1024", use_cache, draft,
+                                              subject=meeting_summary)
             logger.info("Successfully generated visual summary")
             return image_url
         
@@ -57,31 +390,14 @@ class VisualService:
         Returns:
             str: DALL-E prompt
         """
-        # Extract key concepts for visualization
-        base_prompt = """Create a professional, clean infographic-style illustration that represents a business meeting summary. The image should include:
-
-- Modern office or meeting room setting
-- Professional business people discussing
-- Visual elements like charts, graphs, or presentation screens
-- Clean, corporate aesthetic with blue and white color scheme
-- Symbols representing collaboration, decisions, and action items
-- Abstract elements suggesting productivity and efficiency
-
-Style: Modern, clean, professional infographic. No text or words in the image."""
-        
-        # Enhance prompt based on summary content
-        summary_lower = summary.lower()
-        
-        if 'project' in summary_lower:
-            base_prompt += " Include project management elements like timelines or milestones."
-        
-        if 'decision' in summary_lower:
-            base_prompt += " Emphasize decision-making with visual elements like checkmarks or selection symbols."
-        
-        if any(word in summary_lower for word in ['budget', 'financial', 'cost', 'revenue']):
-            base_prompt += " Include financial elements like charts or calculator symbols."
+        # Enhance prompt based on summary content (one scan for every keyword),
+        # after the fixed style block
+        matched = {_HINT_CATEGORY[word.lower()] for word in _HINT_RE.findall(summary)}
+        dynamic_suffix = [hint for category, _, hint in _VISUAL_HINTS if category in matched]
         
-        return base_prompt
+        if not dynamic_suffix:
+            return _STATIC_STYLE_PROMPT
+        return _STATIC_STYLE_PROMPT + _PROMPT_SEPARATOR + " ".join(dynamic_suffix)
     
     def generate_presentation_asset(self, key_points: List[str]) -> str:
         """
@@ -94,34 +410,26 @@ Style: Modern, clean, professional infographic. No text or words in the image.""
             str: URL of generated presentation asset
         """
         try:
-            if not key_points:
-                key_points = ['business meeting', 'collaboration', 'productivity']
-            
-            # Ensure key_points are strings
-            key_points = [str(point) for point in key_points if point]
-            
-            prompt = f"""Create a professional presentation slide background with abstract business elements. 
-
-Key themes to represent visually: {', '.join(key_points[:3])}
-
-Style requirements:
-- Clean, modern design suitable for business presentations
-- Professional color palette (blues, grays, whites)
-- Abstract geometric shapes and business icons
-- Space for text overlay
-- Corporate meeting room aesthetic
-- No text or words in the image
-- High contrast for readability when text is added later"""
-            
-            response = self.client.images.generate(
-                model="dall-e-3",
-                prompt=prompt,
-                size="1792x1024",  # Presentation aspect ratio
-                quality="standard",
-                n=1
-            )
+            image_url = self._generate(self._presentation_prompt(key_points), "1792x1024")  # Presentation aspect ratio
+            logger.info("Successfully generated presentation asset")
+            return image_url
+        
+        except Exception as e:
+            logger.error(f"Presentation asset generation failed: {str(e)}")
+            raise Exception(f"Presentation asset generation failed: {str(e)}")
+    
+    async def agenerate_presentation_asset(self, key_points: List[str]) -> str:
+        """
+        Async variant of generate_presentation_asset()
+        
+        Args:
+            key_points (list): List of key meeting points
             
-            image_url = response.data[0].url
+        Returns:
+            str: URL of generated presentation asset
+        """
+        try:
+            image_url = await self._agenerate(self._presentation_prompt(key_points), "1792x1024")
             logger.info("Successfully generated presentation asset")
             return image_url
         
@@ -129,43 +437,83 @@ Style requirements:
             logger.error(f"Presentation asset generation failed: {str(e)}")
             raise Exception(f"Presentation asset generation failed: {str(e)}")
     
-    def generate_concept_illustration(self, concept_text: str) -> str:
+    def _presentation_prompt(self, key_points: List[str]) -> str:
+        """Build the presentation asset prompt from the meeting's key points"""
+        # First three themes as strings, sorted so the same themes in any
+        # order give the same prompt (and the same cached image)
+        themes = tuple(sorted([str(point) for point in key_points or [] if point][:3])) or _DEFAULT_THEMES
+        return _build_presentation_prompt(themes)
+    
+    def generate_concept_illustration(self, concept_text: str, draft: bool = False) -> str:
         """
         Generate conceptual illustration for complex ideas
         
         Args:
             concept_text (str): Text describing the concept
+            draft (bool): Quick 512x512 DALL-E 2 preview instead
             
         Returns:
             str: URL of generated concept illustration
         """
         try:
-            if not concept_text or not concept_text.strip():
-                raise ValueError("Concept text cannot be empty")
-            
-            prompt = f"""Create a professional conceptual illustration representing: {concept_text}
-
-Style requirements:
-- Clean, modern business illustration
-- Abstract but meaningful visual metaphors
-- Professional color palette
-- Suitable for business stakeholders
-- Clear visual hierarchy
-- No text or words in the image
-- Infographic-style design elements"""
-            
-            response = self.client.images.generate(
-                model="dall-e-3",
-                prompt=prompt,
-                size="1024x1024",
-                quality="standard",
-                n=1
-            )
+            image_url = self._generate(self._concept_prompt(concept_text), "1024x1024", draft=draft)
+            logger.info("Successfully generated concept illustration")
+            return image_url
+        
+        except Exception as e:
+            logger.error(f"Concept illustration generation failed: {str(e)}")
+            raise Exception(f"Concept illustration generation failed: {str(e)}")
+    
+    async def agenerate_concept_illustration(self, concept_text: str, draft: bool = False) -> str:
+        """
+        Async variant of generate_concept_illustration()
+        
+        Args:
+            concept_text (str): Text describing the concept
+            draft (bool): Quick 512x512 DALL-E 2 preview instead
             
-            image_url = response.data[0].url
+        Returns:
+            str: URL of generated concept illustration
+        """
+        try:
+            image_url = await self._agenerate(self._concept_prompt(concept_text), "1024x1024", draft=draft)
             logger.info("Successfully generated concept illustration")
             return image_url
         
         except Exception as e:
             logger.error(f"Concept illustration generation failed: {str(e)}")
-            raise Exception(f"Concept illustration generation failed: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Concept illustration generation failed: {str(e)}")
+    
+    def _concept_prompt(self, concept_text: str) -> str:
+        """Build the concept illustration prompt"""
+        if not concept_text or not concept_text.strip():
+            raise ValueError("Concept text cannot be empty")
+        
+        return _CONCEPT_STYLE_PROMPT + _PROMPT_SEPARATOR + f"Concept: {concept_text}"
+    
+    async def batch_generate(self, requests: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Generate several images concurrently
+        
+        Args:
+            requests (list): Dicts with 'type' ('summary', 'presentation' or
+                'concept') and 'content' (summary text, key points or concept text)
+            
+        Returns:
+            list: One image URL per request, in order, or the exception raised
+                for that request
+        """
+        return await asyncio.gather(*[self._adispatch(request) for request in requests],
+                                    return_exceptions=True)
+    
+    async def _adispatch(self, request: Dict[str, Any]) -> str:
+        """Route one batch_generate() request to its async generator"""
+        generators = {
+            'summary': self.agenerate_visual_summary,
+            'presentation': self.agenerate_presentation_asset,
+            'concept': self.agenerate_concept_illustration
+        }
+        kind = request.get('type', 'summary')
+        if kind not in generators:
+            raise ValueError(f"Unknown visual type: {kind}")
+        return await generators[kind](request.get('content'))
\ No newline at end of file
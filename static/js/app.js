@@ -233,12 +233,20 @@ class MeetingProcessor {
             const processData = await processResponse.json();
             console.log('Process response:', processData);
 
-            if (processData.success) {
+            if (!processData.success) {
+                throw new Error(processData.error || 'Processing failed');
+            }
+
+            // Step 3: Wait for the background job to finish
+            console.log('Step 3: Waiting for processing job', processData.job_id);
+            const job = await this.waitForJob(processData.job_id);
+
+            if (job.status === 'finished') {
                 alert('File processed successfully! Check the meetings list below.');
                 this.loadMeetings(); // Refresh meetings list
                 this.resetUploadSection();
             } else {
-                throw new Error(processData.error || 'Processing failed');
+                throw new Error(job.error || 'Processing failed');
             }
 
         } catch (error) {
@@ -253,6 +261,22 @@ class MeetingProcessor {
         }
     }
 
+    async waitForJob(jobId, intervalMs = 2000) {
+        // Poll until the job has either finished or failed
+        while (true) {
+            const response = await fetch(`/jobs/${jobId}`);
+            const job = await response.json();
+
+            if (!response.ok) {
+                throw new Error(job.error || 'Job status unavailable');
+            }
+            if (job.status === 'finished' || job.status === 'failed') {
+                return job;
+            }
+            await new Promise(resolve => setTimeout(resolve, intervalMs));
+        }
+    }
+
     async loadMeetings() {
         console.log('Loading meetings...');
         try {
@@ -1,61 +1,125 @@
 import unittest
+import asyncio
+import io
+import inspect
+import wave
 import json
 import os
 import tempfile
-from unittest.mock import patch, MagicMock, Mock, mock_open
+import threading
+import time
+import numpy as np
+import httpx
+import openai
+from unittest.mock import patch, MagicMock, Mock, AsyncMock
+from concurrent.futures import ThreadPoolExecutor
 import sys
 sys.path.append('..')
 
-from app import app, load_meetings, save_meetings
+import app as app_module
+from app import app, load_meetings, save_meetings, flush_meetings
 from services.audio_service import AudioService
 from services.analysis_service import AnalysisService
 from services.search_service import SearchService
 from services.visual_service import VisualService
 from services.integration_service import IntegrationService
+from services.realtime_service import RealTimeTranscriptionService, RealTimeWebSocketHandler, TranscriptionWorker, AudioRingBuffer
+from services import openai_client
+from services.openai_client import get_client, get_async_client
+from services.llm_cache import LLMCache
+from services.pipeline import process_meetings, stream_meeting_analysis
+
+# Tool-call arguments for a mocked analysis response, serialized once
+_MOCK_ANALYSIS_ARGS = json.dumps({
+    'summary': 'Test meeting summary',
+    'action_items': [{'task': 'Test task', 'owner': 'Test owner'}],
+    'topics_discussed': ['test topic'],
+    'key_decisions': ['test decision']
+})
+
+class FakeFaissIndex:
+    """Exact inner-product stand-in for the FAISS index types"""
+    
+    def __init__(self, *args):
+        self.args = args
+        self.hnsw = Mock()
+        self.vectors = None
+    
+    def train(self, matrix):
+        pass
+    
+    def add(self, matrix):
+        self.vectors = matrix if self.vectors is None else np.vstack([self.vectors, matrix])
+    
+    def search(self, query, k):
+        scores = self.vectors @ query[0]
+        rows = np.argsort(-scores)[:k]
+        return scores[rows].reshape(1, -1), rows.reshape(1, -1)
 
 class TestSmartMeetingAssistant(unittest.TestCase):
     """Comprehensive test suite for Smart Meeting Assistant"""
     
+    # Sample meeting data for testing, built once; tests must not mutate the
+    # nested values (each test gets its own top-level copy)
+    SAMPLE_MEETING = {
+        'id': 'test-meeting-1',
+        'filename': 'test_meeting.mp3',
+        'timestamp': '2024-01-15T10:00:00',
+        'transcription': 'This is a test meeting about project planning and task assignments.',
+        'analysis': {
+            'summary': 'Team discussed project timeline and assigned tasks to team members.',
+            'action_items': [
+                {'task': 'Complete design mockups', 'owner': 'John', 'deadline': '2024-01-20'},
+                {'task': 'Set up development environment', 'owner': 'Jane', 'deadline': '2024-01-18'}
+            ],
+            'topics_discussed': ['project planning', 'task assignment', 'timeline'],
+            'key_decisions': ['Use Agile methodology', 'Weekly sprint meetings']
+        },
+        'embedding': [0.1] * 1536,  # Mock embedding
+        'visual_url': '/static/images/test_visual.png'
+    }
+    # The sample analysis as tool-call arguments
+    SAMPLE_ANALYSIS_ARGS = json.dumps(SAMPLE_MEETING['analysis'])
+    
     def setUp(self):
         """Set up test fixtures"""
         self.app = app.test_client()
         self.app.testing = True
         
-        # Sample meeting data for testing
-        self.sample_meeting = {
-            'id': 'test-meeting-1',
-            'filename': 'test_meeting.mp3',
-            'timestamp': '2024-01-15T10:00:00',
-            'transcription': 'This is a test meeting about project planning and task assignments.',
-            'analysis': {
-                'summary': 'Team discussed project timeline and assigned tasks to team members.',
-                'action_items': [
-                    {'task': 'Complete design mockups', 'owner': 'John', 'deadline': '2024-01-20'},
-                    {'task': 'Set up development environment', 'owner': 'Jane', 'deadline': '2024-01-18'}
-                ],
-                'topics_discussed': ['project planning', 'task assignment', 'timeline'],
-                'key_decisions': ['Use Agile methodology', 'Weekly sprint meetings']
-            },
-            'embedding': [0.1] * 1536,  # Mock embedding
-            'visual_url': '/static/images/test_visual.png'
-        }
-        
-        # Create temporary data directory for testing
-        self.temp_dir = tempfile.mkdtemp()
+        self.sample_meeting = dict(self.SAMPLE_MEETING)
+        
+        # Create temporary data directory for testing (removed even if the test fails)
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
         self.original_data_path = 'data/meetings.json'
         self.test_data_path = os.path.join(self.temp_dir, 'meetings.json')
         
-    def tearDown(self):
-        """Clean up after tests"""
-        # Clean up temporary files
-        if os.path.exists(self.test_data_path):
-            os.remove(self.test_data_path)
-        os.rmdir(self.temp_dir)
+        # Keep cached LLM responses and generated images out of the repo and
+        # out of other tests
+        env = patch.dict(os.environ, {'LLM_CACHE_PATH': os.path.join(self.temp_dir, 'llm_cache.sqlite3'),
+                                      'VISUAL_IMAGE_DIR': ''})
+        env.start()
+        self.addCleanup(env.stop)
+        
+        # Services share cached OpenAI clients; rebuild them per test so
+        # patched constructors take effect
+        get_client.cache_clear()
+        self.addCleanup(get_client.cache_clear)
+        openai_client._async_clients.clear()
+        self.addCleanup(openai_client._async_clients.clear)
 
 class TestAudioService(TestSmartMeetingAssistant):
     """Test audio transcription service"""
     
-    @patch('services.audio_service.OpenAI')
+    def setUp(self):
+        super().setUp()
+        # A real file, so uploads see genuine open()/read()/seek() behaviour
+        self.audio_path = os.path.join(self.temp_dir, 'test_audio.mp3')
+        with open(self.audio_path, 'wb') as f:
+            f.write(b"fake audio data")
+    
+    @patch('services.openai_client.OpenAI')
     def test_transcribe_audio_success(self, mock_openai):
         """Test successful audio transcription"""
         # Mock the OpenAI client and its audio.transcriptions.create method
@@ -64,16 +128,12 @@ class TestAudioService(TestSmartMeetingAssistant):
         mock_client.audio.transcriptions.create.return_value = "This is a test transcription"
         
         audio_service = AudioService()
-        
-        # Mock file existence
-        with patch('os.path.exists', return_value=True):
-            with patch('builtins.open', mock_open(read_data=b"fake audio data")):
-                result = audio_service.transcribe("test_audio.mp3")
+        result = audio_service.transcribe(self.audio_path)
         
         self.assertEqual(result, "This is a test transcription")
         mock_client.audio.transcriptions.create.assert_called_once()
     
-    @patch('services.audio_service.OpenAI')
+    @patch('services.openai_client.OpenAI')
     def test_transcribe_audio_failure(self, mock_openai):
         """Test audio transcription failure handling"""
         # Mock the OpenAI client and make it raise an exception
@@ -82,17 +142,92 @@ class TestAudioService(TestSmartMeetingAssistant):
         mock_client.audio.transcriptions.create.side_effect = Exception("API Error")
         
         audio_service = AudioService()
+        with self.assertRaises(Exception):
+            audio_service.transcribe(self.audio_path)
+
+    @patch('services.openai_client.AsyncOpenAI')
+    @patch('services.openai_client.OpenAI')
+    def test_transcribe_with_timestamps_matches_sdk(self, mock_openai, mock_async_openai):
+        """Test timestamped transcription only passes arguments the pinned SDK accepts"""
+        from openai.resources.audio import Transcriptions, AsyncTranscriptions
         
-        # Mock file existence
-        with patch('os.path.exists', return_value=True):
-            with patch('builtins.open', mock_open(read_data=b"fake audio data")):
-                with self.assertRaises(Exception):
-                    audio_service.transcribe("test_audio.mp3")
+        def create(method):
+            # Fail like the real SDK method would on an unknown keyword
+            def check(**kwargs):
+                inspect.signature(method).bind(None, **kwargs)
+                return Mock(model_dump=lambda: {'text': 'Hello', 'segments': [{'start': 0.0, 'end': 1.0}]})
+            return check
+        
+        mock_openai.return_value.audio.transcriptions.create = Mock(side_effect=create(Transcriptions.create))
+        mock_async_openai.return_value.audio.transcriptions.create = AsyncMock(side_effect=create(AsyncTranscriptions.create))
+        
+        audio_service = AudioService()
+        result = asyncio.run(audio_service.atranscribe_with_timestamps(self.audio_path))
+        self.assertEqual(result['segments'][0]['end'], 1.0)
+        
+        result = audio_service.transcribe_with_timestamps(self.audio_path)
+        self.assertEqual(result['text'], 'Hello')
+        kwargs = mock_openai.return_value.audio.transcriptions.create.call_args.kwargs
+        self.assertEqual(kwargs['extra_body'], {'timestamp_granularities': ['segment']})
+    
+    @patch('services.openai_client.OpenAI')
+    def test_transcribe_stream_in_memory(self, mock_openai):
+        """Test live samples are uploaded as an in-memory WAV without temp files"""
+        mock_client = Mock()
+        mock_openai.return_value = mock_client
+        mock_client.audio.transcriptions.create.return_value = "live text"
+
+        audio_service = AudioService()
+        samples = np.zeros(16000, dtype=np.float32)
+        with patch('tempfile.NamedTemporaryFile') as mock_tempfile:
+            result = audio_service.transcribe_stream(samples, 16000)
+
+        self.assertEqual(result, "live text")
+        mock_tempfile.assert_not_called()
+        name, data = mock_client.audio.transcriptions.create.call_args.kwargs['file']
+        with wave.open(io.BytesIO(data), 'rb') as wav_file:
+            self.assertEqual(wav_file.getnframes(), 16000)
+            self.assertEqual(wav_file.getframerate(), 16000)
+        
+        pcm = np.array([0, 1000, -1000, 32767], dtype=np.int16)
+        audio_service.transcribe_stream(pcm, 8000)
+        name, data = mock_client.audio.transcriptions.create.call_args.kwargs['file']
+        with wave.open(io.BytesIO(data), 'rb') as wav_file:
+            self.assertEqual(wav_file.getframerate(), 8000)
+            self.assertEqual(wav_file.getsampwidth(), 2)
+            self.assertEqual(np.frombuffer(wav_file.readframes(4), dtype='<i2').tolist(), pcm.tolist())
+
+    @patch('services.openai_client.OpenAI')
+    def test_local_whisper_model_is_warmed_and_shared(self, mock_openai):
+        """Test the configured faster-whisper model loads once, warms up and decodes greedily"""
+        from services import audio_service as audio_module
+        
+        model = Mock()
+        segment = Mock(text=' hello ', words=[Mock(word=' hello', start=0.0, end=0.4)])
+        model.transcribe.side_effect = lambda audio, **options: (iter([segment]), None)
+        
+        audio_module._load_local_model.cache_clear()
+        self.addCleanup(audio_module._load_local_model.cache_clear)
+        with patch.object(audio_module, 'WhisperModel', return_value=model) as mock_model_class, \
+             patch.object(audio_module, 'LOCAL_WHISPER_MODEL', 'small'):
+            first, second = AudioService(), AudioService()
+        
+        mock_model_class.assert_called_once_with('small', device='cuda', compute_type='float16')
+        self.assertIs(first._local_model, second._local_model)
+        self.assertEqual(model.transcribe.call_count, 1)  # Warm-up
+        
+        words = first.transcribe_stream_words(np.zeros(16000, dtype=np.float32))
+        self.assertEqual(words, [{'word': 'hello', 'start': 0.0, 'end': 0.4}])
+        options = model.transcribe.call_args.kwargs
+        self.assertEqual(options['beam_size'], 1)
+        self.assertTrue(options['vad_filter'])
+        self.assertFalse(options['condition_on_previous_text'])
+        mock_openai.return_value.audio.transcriptions.create.assert_not_called()
 
 class TestAnalysisService(TestSmartMeetingAssistant):
     """Test meeting analysis service"""
     
-    @patch('services.analysis_service.OpenAI')
+    @patch('services.openai_client.OpenAI')
     def test_analyze_meeting_success(self, mock_openai):
         """Test successful meeting analysis"""
         # Mock the OpenAI client and its chat.completions.create method
@@ -102,12 +237,7 @@ class TestAnalysisService(TestSmartMeetingAssistant):
         mock_response = Mock()
         mock_response.choices = [Mock()]
         mock_response.choices[0].message.tool_calls = [Mock()]
-        mock_response.choices[0].message.tool_calls[0].function.arguments = json.dumps({
-            'summary': 'Test meeting summary',
-            'action_items': [{'task': 'Test task', 'owner': 'Test owner'}],
-            'topics_discussed': ['test topic'],
-            'key_decisions': ['test decision']
-        })
+        mock_response.choices[0].message.tool_calls[0].function.arguments = _MOCK_ANALYSIS_ARGS
         mock_client.chat.completions.create.return_value = mock_response
         
         analysis_service = AnalysisService()
@@ -118,7 +248,18 @@ class TestAnalysisService(TestSmartMeetingAssistant):
         self.assertIn('action_items', result)
         mock_client.chat.completions.create.assert_called_once()
     
-    @patch('services.analysis_service.OpenAI')
+    @patch('services.openai_client.OpenAI')
+    def test_missing_api_key(self, mock_openai):
+        """Test the key is checked before any client or cache is set up"""
+        with patch.dict(os.environ, {'OPENAI_API_KEY': ''}), \
+             patch('services.analysis_service.LLMCache') as mock_cache:
+            with self.assertRaises(ValueError):
+                AnalysisService()
+        
+        mock_openai.assert_not_called()
+        mock_cache.assert_not_called()
+    
+    @patch('services.openai_client.OpenAI')
     def test_analyze_meeting_failure(self, mock_openai):
         """Test meeting analysis failure handling"""
         # Mock the OpenAI client to raise an exception
@@ -134,15 +275,190 @@ class TestAnalysisService(TestSmartMeetingAssistant):
         self.assertIn('summary', result)
         self.assertIn('Meeting analysis unavailable', result['summary'])
 
+    @patch('services.openai_client.OpenAI')
+    def test_follow_up_tasks_reuse_analysis(self, mock_openai):
+        """Test follow-up tasks come from the analysis response without a second call"""
+        mock_client = Mock()
+        mock_openai.return_value = mock_client
+        integration = {'calendar_events': [{'title': 'Review'}], 'task_assignments': []}
+        analysis = dict(self.sample_meeting['analysis'], task_integration=integration)
+        
+        analysis_service = AnalysisService()
+        result = analysis_service.generate_follow_up_tasks(analysis)
+        
+        self.assertEqual(result, integration)
+        mock_client.chat.completions.create.assert_not_called()
+
+    @patch('services.openai_client.OpenAI')
+    def test_analyze_meeting_cached(self, mock_openai):
+        """Test repeated analysis of the same transcript is served from the cache"""
+        mock_client = Mock()
+        mock_openai.return_value = mock_client
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.tool_calls = [Mock()]
+        mock_response.choices[0].message.tool_calls[0].function.arguments = self.SAMPLE_ANALYSIS_ARGS
+        mock_client.chat.completions.create.return_value = mock_response
+        
+        first = AnalysisService().analyze_meeting("Test transcription")
+        second = AnalysisService().analyze_meeting("Test transcription")
+        
+        self.assertEqual(first, second)
+        mock_client.chat.completions.create.assert_called_once()
+
+    def test_expired_cache_entries_deleted(self):
+        """Test expired cache entries are removed from the file when looked up"""
+        cache = LLMCache(os.path.join(self.temp_dir, 'cache.sqlite3'), ttl_seconds=60)
+        cache.set({'prompt': 'Test'}, {'summary': 'Cached'})
+        
+        with patch('services.llm_cache.time.time', return_value=time.time() + 120):
+            self.assertIsNone(cache.get({'prompt': 'Test'}))
+        
+        count = cache._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        self.assertEqual(count, 0)
+
+    @patch('services.openai_client.AsyncOpenAI', side_effect=lambda **kwargs: Mock())
+    def test_async_client_per_event_loop(self, mock_async_openai):
+        """Test each event loop gets its own async client, reused within the loop"""
+        analysis_service = AnalysisService()
+        
+        async def clients():
+            return analysis_service.async_client, get_async_client()
+        
+        first = asyncio.run(clients())
+        second = asyncio.run(clients())
+        
+        self.assertIs(first[0], first[1])
+        self.assertIsNot(first[0], second[0])
+        self.assertEqual(mock_async_openai.call_count, 2)
+
+    @patch('services.openai_client.OpenAI')
+    def test_model_routing(self, mock_openai):
+        """Test short transcripts use the cheaper model"""
+        analysis_service = AnalysisService()
+        
+        self.assertEqual(analysis_service._select_model("Quick standup, all on track."), 'gpt-4o-mini')
+        self.assertEqual(analysis_service._select_model("Long discussion. " * 500), 'gpt-4o')
+
+    @patch('services.openai_client.OpenAI')
+    def test_long_transcript_chunked(self, mock_openai):
+        """Test long transcripts are analyzed in chunks and merged, not truncated"""
+        mock_client = Mock()
+        mock_openai.return_value = mock_client
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.tool_calls = [Mock()]
+        mock_response.choices[0].message.tool_calls[0].function.arguments = self.SAMPLE_ANALYSIS_ARGS
+        mock_client.chat.completions.create.return_value = mock_response
+        
+        transcript = "We reviewed the roadmap in detail. " * 2000
+        analysis_service = AnalysisService()
+        chunks = analysis_service._split_transcript(transcript)
+        result = analysis_service.analyze_meeting(transcript)
+        
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) <= 24000 for chunk in chunks))
+        self.assertEqual(result['summary'], self.sample_meeting['analysis']['summary'])
+        # One call per chunk plus the merge call
+        self.assertEqual(mock_client.chat.completions.create.call_count, len(chunks) + 1)
+
+    @patch('services.openai_client.AsyncOpenAI')
+    @patch('services.openai_client.OpenAI')
+    def test_stream_analysis_emits_fields_early(self, mock_openai, mock_async_openai):
+        """Test streamed analysis yields the summary before the full analysis"""
+        analysis = self.sample_meeting['analysis']
+        # The tool schema uses short field names
+        arguments = json.dumps(dict({k: v for k, v in analysis.items() if k != 'topics_discussed'},
+                                    topics=analysis['topics_discussed'], score=7))
+        pieces = [arguments[i:i + 10] for i in range(0, len(arguments), 10)]
+        
+        async def stream():
+            for piece in pieces:
+                tool_call = Mock()
+                tool_call.function.arguments = piece
+                chunk = Mock()
+                chunk.choices = [Mock()]
+                chunk.choices[0].delta.tool_calls = [tool_call]
+                yield chunk
+        
+        mock_async_openai.return_value.chat.completions.create = AsyncMock(return_value=stream())
+        
+        async def collect():
+            return [item async for item in AnalysisService().astream_analysis("Test transcription")]
+        
+        events = asyncio.run(collect())
+        
+        self.assertEqual(events[0], ('summary', self.sample_meeting['analysis']['summary']))
+        self.assertIn(('topics_discussed', self.sample_meeting['analysis']['topics_discussed']), events)
+        self.assertEqual(events[-1], ('analysis', dict(analysis, meeting_effectiveness_score=7)))
+
+class TestPipeline(TestSmartMeetingAssistant):
+    """Test concurrent meeting processing"""
+    
+    def test_process_meetings_concurrently(self):
+        """Test every meeting is processed and failures stay per-meeting"""
+        audio_service = Mock()
+        audio_service.atranscribe = AsyncMock(side_effect=['first transcript', Exception("Bad audio")])
+        analysis_service = Mock()
+        analysis_service.aanalyze_meeting = AsyncMock(return_value={'summary': 'Summary', 'action_items': []})
+        analysis_service.agenerate_follow_up_tasks = AsyncMock(return_value={'calendar_events': [], 'task_assignments': []})
+        
+        results = asyncio.run(process_meetings(['a.mp3', 'b.mp3'], audio_service, analysis_service, max_concurrency=1))
+        
+        self.assertEqual(results[0]['transcript'], 'first transcript')
+        self.assertEqual(results[0]['analysis']['summary'], 'Summary')
+        self.assertIn('Bad audio', results[1]['error'])
+        analysis_service.aanalyze_meeting.assert_awaited_once_with('first transcript')
+
+    @patch('services.audio_service.TRANSCRIPTION_CHUNK_SECONDS', 1)
+    @patch('services.openai_client.AsyncOpenAI')
+    @patch('services.openai_client.OpenAI')
+    def test_stream_meeting_analysis(self, mock_openai, mock_async_openai):
+        """Test WAV recordings are transcribed in pieces that feed a running analysis"""
+        wav_path = os.path.join(self.temp_dir, 'meeting.wav')
+        with wave.open(wav_path, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(8000)
+            wav_file.writeframes(b'\x00\x00' * 8000 * 2)  # 2 seconds
+        
+        mock_async_openai.return_value.audio.transcriptions.create = AsyncMock(side_effect=['first part', 'second part'])
+        analysis_service = Mock()
+        analysis_service.aupdate_insights = AsyncMock(side_effect=[{'summary': 'Partial'}, {'summary': 'Final'}])
+        updates = []
+        
+        result = asyncio.run(stream_meeting_analysis(wav_path, AudioService(), analysis_service,
+                                                     on_update=updates.append, min_update_chars=1))
+        
+        self.assertEqual(result['transcript'], 'first part second part')
+        self.assertEqual(result['analysis'], {'summary': 'Final'})
+        self.assertEqual(updates, [{'summary': 'Partial'}, {'summary': 'Final'}])
+        analysis_service.aupdate_insights.assert_any_await({'summary': 'Partial'}, 'second part')
+
 class TestSearchService(TestSmartMeetingAssistant):
     """Test search and embedding service"""
     
-    @patch('services.search_service.OpenAI')
-    def test_create_embedding_success(self, mock_openai):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # One patched OpenAI constructor for the whole class; each test gets
+        # a fresh client mock from it
+        cls._openai_patch = patch('services.openai_client.OpenAI')
+        cls.mock_openai = cls._openai_patch.start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls._openai_patch.stop()
+        super().tearDownClass()
+    
+    def setUp(self):
+        super().setUp()
+        self.mock_openai.reset_mock()
+        self.mock_client = self.mock_openai.return_value = Mock()
+    
+    def test_create_embedding_success(self):
         """Test successful embedding creation"""
-        # Mock the OpenAI client and its embeddings.create method
-        mock_client = Mock()
-        mock_openai.return_value = mock_client
+        mock_client = self.mock_client
         
         mock_response = Mock()
         mock_response.data = [Mock()]
@@ -153,28 +469,50 @@ class TestSearchService(TestSmartMeetingAssistant):
         result = search_service.create_embedding("Test text")
         
         self.assertEqual(len(result), 1536)
+        self.assertEqual(result.dtype, np.float32)
+        self.assertAlmostEqual(float(np.linalg.norm(result)), 1.0, places=5)
         mock_client.embeddings.create.assert_called_once()
     
+    def test_create_embeddings_batch(self):
+        """Test batched embedding creation keeps input order"""
+        mock_client = self.mock_client
+        
+        mock_response = Mock()
+        mock_response.data = [Mock(index=1, embedding=[0.0, 2.0]), Mock(index=0, embedding=[1.0, 0.0])]
+        mock_client.embeddings.create.return_value = mock_response
+        
+        search_service = SearchService()
+        result = search_service.create_embeddings_batch(["first", "second"])
+        
+        self.assertEqual(result.tolist(), [[1.0, 0.0], [0.0, 1.0]])
+        mock_client.embeddings.create.assert_called_once()
+        self.assertEqual(mock_client.embeddings.create.call_args.kwargs['input'], ["first", "second"])
+    
     def test_cosine_similarity(self):
         """Test cosine similarity calculation"""
-        # Create a SearchService with mocked OpenAI for initialization
-        with patch('services.search_service.OpenAI'):
-            search_service = SearchService()
+        search_service = SearchService()
         
-        vec1 = [1, 2, 3]
-        vec2 = [2, 4, 6]
+        vec1 = np.array([1, 2, 3], dtype=np.float32)
+        vec2 = np.array([2, 4, 6], dtype=np.float32)
         
         similarity = search_service.cosine_similarity(vec1, vec2)
         
         self.assertAlmostEqual(similarity, 1.0, places=5)  # Perfect correlation
+        self.assertAlmostEqual(search_service.cosine_similarity([1, 2, 3], [2, 4, 6]), 1.0, places=5)
+        
+        # Full-size embeddings from a seeded generator, checked against the definition
+        rng = np.random.default_rng(42)
+        emb1, emb2 = rng.standard_normal((2, 1536)).astype(np.float32)
+        expected = float(emb1 @ emb2 / (np.linalg.norm(emb1) * np.linalg.norm(emb2)))
+        self.assertAlmostEqual(search_service.cosine_similarity(emb1, emb2), expected, places=5)
+        self.assertEqual(search_service.cosine_similarity(np.zeros(3, dtype=np.float32), vec2), 0.0)
+        self.assertEqual(search_service.cosine_similarity([1, 2], vec2), 0.0)
     
     def test_search_meetings(self):
         """Test meeting search functionality"""
         meetings = [self.sample_meeting]
         
-        # Create a SearchService with mocked OpenAI for initialization
-        with patch('services.search_service.OpenAI'):
-            search_service = SearchService()
+        search_service = SearchService()
         
         with patch.object(search_service, 'create_embedding', return_value=[0.1] * 1536):
             results = search_service.search_meetings("project planning", meetings)
@@ -184,19 +522,226 @@ class TestSearchService(TestSmartMeetingAssistant):
             self.assertIn('meeting_id', results[0])
             self.assertIn('similarity', results[0])
 
+    def test_search_meetings_ranking(self):
+        """Test that search results are ranked by cosine similarity"""
+        meetings = [
+            dict(self.sample_meeting, id=1, embedding=[1.0, 0.0, 0.0]),
+            dict(self.sample_meeting, id=2, embedding=[0.6, 0.8, 0.0]),
+            dict(self.sample_meeting, id=3, embedding=[]),
+        ]
+
+        search_service = SearchService()
+
+        with patch.object(search_service, 'create_embedding', return_value=[0.0, 2.0, 0.0]):
+            results = search_service.search_meetings("budget review", meetings, top_k=5)
+
+        self.assertEqual([r['meeting_id'] for r in results], [2, 1])
+        self.assertAlmostEqual(results[0]['similarity'], 0.8, places=5)
+        self.assertAlmostEqual(results[1]['similarity'], 0.0, places=5)
+
+        # Meetings appended later are added to the index without a rebuild
+        meetings.append(dict(self.sample_meeting, id=4, embedding=[0.0, 3.0, 0.0]))
+        with patch.object(search_service, '_normalize_rows', wraps=search_service._normalize_rows) as normalize, \
+             patch.object(search_service, 'create_embedding', return_value=[0.0, 2.0, 0.0]):
+            results = search_service.search_meetings("budget review", meetings, top_k=2)
+
+        self.assertEqual([r['meeting_id'] for r in results], [4, 2])
+        self.assertEqual(len(normalize.call_args.args[0]), 1)
+        
+        # Further appends fill spare rows of the backing buffer
+        buffer = search_service._matrix_buffer
+        self.assertGreater(len(buffer), len(search_service._embedding_matrix))
+        meetings.append(dict(self.sample_meeting, id=5, embedding=[0.0, 0.0, 1.0]))
+        with patch.object(search_service, 'create_embedding', return_value=[0.0, 0.0, 1.0]):
+            results = search_service.search_meetings("hiring", meetings, top_k=1)
+        self.assertIs(search_service._matrix_buffer, buffer)
+        self.assertEqual(results[0]['meeting_id'], 5)
+
+    def test_search_with_int8_matrix(self):
+        """Test large collections are scored from an int8 matrix with the same ranking"""
+        rng = np.random.default_rng(0)
+        meetings = [dict(self.sample_meeting, id=i, embedding=rng.standard_normal(64).tolist()) for i in range(50)]
+        query = meetings[7]['embedding']
+        
+        search_service = SearchService()
+        
+        with patch('services.search_service.INT8_SEARCH_THRESHOLD', 10), \
+             patch('services.search_service.INT8_BLOCK_ROWS', 16), \
+             patch.object(search_service, 'create_embedding', return_value=query):
+            results = search_service.search_meetings("standup", meetings, top_k=3)
+            meetings.append(dict(self.sample_meeting, id=99, embedding=query))
+            extended = search_service.search_meetings("standup", meetings, top_k=2)
+        
+        self.assertEqual(search_service._embedding_matrix.dtype, np.int8)
+        self.assertEqual(len(search_service._row_scales), 51)
+        self.assertEqual(results[0]['meeting_id'], 7)
+        self.assertAlmostEqual(results[0]['similarity'], 1.0, places=2)
+        self.assertEqual(sorted(r['meeting_id'] for r in extended), [7, 99])
+    
+    def test_hnsw_index_for_mid_sized_collections(self):
+        """Test collections past the HNSW threshold are searched through an HNSW graph"""
+        fake_faiss = Mock(IndexHNSWFlat=type('IndexHNSWFlat', (FakeFaissIndex,), {}),
+                          IndexFlatIP=type('IndexFlatIP', (FakeFaissIndex,), {}),
+                          METRIC_INNER_PRODUCT=0)
+        meetings = [dict(self.sample_meeting, id=i, embedding=[float(i), 1.0]) for i in range(5)]
+        
+        search_service = SearchService()
+        
+        with patch('services.search_service.faiss', fake_faiss), \
+             patch('services.search_service.HNSW_SEARCH_THRESHOLD', 3), \
+             patch.object(search_service, 'create_embedding', return_value=[1.0, 0.0]):
+            results = search_service.search_meetings("roadmap", meetings, top_k=2)
+        
+        index = search_service._faiss_index
+        self.assertIsInstance(index, fake_faiss.IndexHNSWFlat)
+        self.assertEqual(index.args, (2, 16, 0))
+        self.assertEqual(index.hnsw.efSearch, 64)
+        self.assertEqual([r['meeting_id'] for r in results], [4, 3])
+    
+    def test_pq_index_trained_in_background(self):
+        """Test the IVF-PQ index is trained off the search path, keeping appended rows"""
+        from services import search_service as search_module
+        
+        fake_faiss = Mock(IndexIVFPQ=type('IndexIVFPQ', (FakeFaissIndex,), {}),
+                          IndexHNSWFlat=type('IndexHNSWFlat', (FakeFaissIndex,), {}),
+                          IndexFlatIP=type('IndexFlatIP', (FakeFaissIndex,), {}),
+                          METRIC_INNER_PRODUCT=0)
+        meetings = [dict(self.sample_meeting, id=i, embedding=[float(i), 1.0, 0.0, 0.0]) for i in range(5)]
+        search_service = SearchService()
+        pending = []
+        
+        with patch('services.search_service.faiss', fake_faiss), \
+             patch('services.search_service.PQ_SEARCH_THRESHOLD', 3), \
+             patch.object(search_module._index_builder, 'submit', side_effect=lambda fn, *args: pending.append((fn, args))), \
+             patch.object(search_service, 'create_embedding', return_value=[1.0, 0.0, 0.0, 0.0]):
+            # Searches scan the matrix until training has finished
+            results = search_service.search_meetings("roadmap", meetings, top_k=1)
+            self.assertIsNone(search_service._faiss_index)
+            meetings.append(dict(self.sample_meeting, id=9, embedding=[9.0, 1.0, 0.0, 0.0]))
+            search_service.search_meetings("roadmap", meetings, top_k=1)
+            
+            fn, args = pending.pop()
+            fn(*args)
+            trained = search_service.search_meetings("roadmap", meetings, top_k=1)
+        
+        self.assertEqual(results[0]['meeting_id'], 4)
+        self.assertIsInstance(search_service._faiss_index, fake_faiss.IndexIVFPQ)
+        self.assertEqual(len(search_service._faiss_index.vectors), 6)
+        self.assertEqual(trained[0]['meeting_id'], 9)
+    
+    def test_replaced_embeddings_are_reindexed(self):
+        """Test embeddings replaced in place are picked up once meetings are saved"""
+        meetings = [
+            dict(self.sample_meeting, id=1, embedding=[1.0, 0.0]),
+            dict(self.sample_meeting, id=2, embedding=[0.0, 1.0]),
+        ]
+        search_service = SearchService()
+        
+        with patch.object(search_service, 'create_embedding', return_value=[1.0, 0.0]):
+            before = search_service.search_meetings("budget", meetings, top_k=1)
+            meetings[1]['embedding'] = [2.0, 0.0]
+            meetings[0]['embedding'] = [0.0, 2.0]
+            search_service.invalidate_index()
+            after = search_service.search_meetings("budget", meetings, top_k=1)
+        
+        self.assertEqual(before[0]['meeting_id'], 1)
+        self.assertEqual(after[0]['meeting_id'], 2)
+    
+    def test_query_embeddings_are_reused(self):
+        """Test repeated queries are embedded once, in memory and across instances"""
+        search_service = SearchService()
+        other_service = SearchService()
+        
+        with patch.object(search_service, 'create_embedding', return_value=[0.5, 0.5]) as mock_embed:
+            first = search_service.embed_query("Budget  review")
+            second = search_service.embed_query(" budget REVIEW ")
+        mock_embed.assert_called_once_with("budget review")
+        self.assertIs(first, second)
+        
+        with patch.object(other_service, 'create_embedding') as mock_other_embed:
+            persisted = other_service.embed_query("budget review")
+        mock_other_embed.assert_not_called()
+        self.assertEqual(persisted.tolist(), [0.5, 0.5])
+    
+    def test_query_embeddings_thread_safe(self):
+        """Test concurrent searches can share the in-memory query embedding LRU"""
+        search_service = SearchService()
+        queries = [f"query {i % 40}" for i in range(400)]
+        
+        with patch('services.search_service.QUERY_EMBEDDING_CACHE_SIZE', 8), \
+             patch.object(search_service, 'create_embedding', return_value=[0.5, 0.5]), \
+             patch.object(search_service.cache, 'get', return_value=None), \
+             patch.object(search_service.cache, 'set'):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                embeddings = list(pool.map(search_service.embed_query, queries))
+        
+        self.assertEqual(len(embeddings), 400)
+        self.assertLessEqual(len(search_service._query_embeddings), 8)
+    
+    def test_find_similar_meetings(self):
+        """Test similar meetings are ranked against the reference, excluding it"""
+        meetings = [
+            dict(self.sample_meeting, id=1, embedding=[1.0, 0.0, 0.0]),
+            dict(self.sample_meeting, id=2, embedding=[0.0, 1.0, 0.0]),
+            dict(self.sample_meeting, id=3, embedding=[2.0, 2.0, 0.0]),
+            dict(self.sample_meeting, id=4, embedding=[]),
+        ]
+        
+        search_service = SearchService()
+        results = search_service.find_similar_meetings(1, meetings, top_k=5)
+        
+        self.assertEqual([r['meeting_id'] for r in results], [3, 2])
+        self.assertAlmostEqual(results[0]['similarity'], 0.70710678, places=5)
+        self.assertEqual(search_service.find_similar_meetings(99, meetings), [])
+    
+    def test_meeting_insights_common_themes(self):
+        """Test common themes are topics repeated across meetings, most frequent first"""
+        meetings = [
+            {'id': 1, 'analysis': {'topics_discussed': ['Budget', 'Hiring ', 'Roadmap']}},
+            {'id': 2, 'analysis': {'topics_discussed': ['budget', 'hiring', ' ']}},
+            {'id': 3, 'analysis': {'topics_discussed': ['BUDGET'], 'action_items': [{'task': 'Plan'}]}},
+        ]
+        
+        search_service = SearchService()
+        insights = search_service.get_meeting_insights(meetings)
+        
+        self.assertEqual(insights['common_themes'], ['budget', 'hiring'])
+        self.assertEqual(insights['total_action_items'], 1)
+
 class TestVisualService(TestSmartMeetingAssistant):
     """Test visual summary generation service"""
     
-    @patch('services.visual_service.OpenAI')
-    def test_generate_visual_summary_success(self, mock_openai):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._openai_patch = patch('services.openai_client.OpenAI')
+        cls._async_openai_patch = patch('services.openai_client.AsyncOpenAI')
+        cls.mock_openai = cls._openai_patch.start()
+        cls.mock_async_openai = cls._async_openai_patch.start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls._openai_patch.stop()
+        cls._async_openai_patch.stop()
+        super().tearDownClass()
+    
+    def setUp(self):
+        super().setUp()
+        self.mock_openai.reset_mock()
+        self.mock_async_openai.reset_mock()
+        self.mock_client = self.mock_openai.return_value = Mock()
+        self.mock_async_client = self.mock_async_openai.return_value = Mock()
+        
+        # DALL-E response shared by the tests
+        self.mock_response = Mock()
+        self.mock_response.data = [Mock()]
+        self.mock_response.data[0].url = "https://example.com/image.png"
+        self.mock_client.images.generate.return_value = self.mock_response
+        self.mock_async_client.images.generate = AsyncMock(return_value=self.mock_response)
+    
+    def test_generate_visual_summary_success(self):
         """Test successful visual summary generation"""
-        # Mock OpenAI client and DALL-E response
-        mock_client = Mock()
-        mock_openai.return_value = mock_client
-        mock_response = Mock()
-        mock_response.data = [Mock()]
-        mock_response.data[0].url = "https://example.com/image.png"
-        mock_client.images.generate.return_value = mock_response
+        mock_client = self.mock_client
         
         visual_service = VisualService()
         result = visual_service.generate_visual_summary("Test summary")
@@ -204,6 +749,154 @@ class TestVisualService(TestSmartMeetingAssistant):
         self.assertIsInstance(result, str)
         self.assertEqual(result, "https://example.com/image.png")
         mock_client.images.generate.assert_called_once()
+    
+    def test_generate_visual_summary_cached(self):
+        """Test repeated prompts reuse the generated image"""
+        mock_client = self.mock_client
+        
+        visual_service = VisualService()
+        first = visual_service.generate_visual_summary("Test summary")
+        second = visual_service.generate_visual_summary("Test summary")
+        
+        self.assertEqual(first, second)
+        mock_client.images.generate.assert_called_once()
+        self.assertEqual(visual_service.cache_hits, 1)
+        
+        # An explicit regenerate goes back to the API
+        visual_service.generate_visual_summary("Test summary", use_cache=False)
+        self.assertEqual(mock_client.images.generate.call_count, 2)
+    
+    def test_draft_visual_uses_cheaper_model(self):
+        """Test draft visuals are requested from DALL-E 2 at 512x512"""
+        visual_service = VisualService()
+        visual_service.generate_visual_summary("Test summary", draft=True)
+        
+        kwargs = self.mock_client.images.generate.call_args.kwargs
+        self.assertEqual(kwargs['model'], 'dall-e-2')
+        self.assertEqual(kwargs['size'], '512x512')
+        self.assertNotIn('quality', kwargs)
+        self.assertLessEqual(len(kwargs['prompt']), 1000)
+    
+    def test_presentation_prompt_ignores_theme_order(self):
+        """Test presentation prompts are identical for the same themes in any order"""
+        visual_service = VisualService()
+        
+        self.assertEqual(visual_service._presentation_prompt(['Budget', 'Timeline', '', 'Hiring']),
+                         visual_service._presentation_prompt(['Hiring', 'Budget', 'Timeline']))
+        self.assertIn('business meeting', visual_service._presentation_prompt([]))
+    
+    def test_circuit_breaker_returns_placeholder(self):
+        """Test repeated transient failures stop further DALL-E calls for a while"""
+        from services import visual_service as visual_module
+        
+        error = openai.APIConnectionError(request=httpx.Request('POST', 'https://api.openai.com/v1/images/generations'))
+        self.mock_client.images.generate.side_effect = error
+        visual_service = VisualService()
+        
+        with patch.object(visual_module, '_breaker', visual_module.CircuitBreaker(fail_max=2, reset_timeout=60)):
+            for _ in range(2):
+                with self.assertRaises(Exception):
+                    visual_service.generate_concept_illustration("Growth")
+            result = visual_service.generate_concept_illustration("Growth")
+        
+        self.assertEqual(result, visual_module.PLACEHOLDER_URL)
+        self.assertEqual(self.mock_client.images.generate.call_count, 2)
+    
+    def _local_visual_service(self):
+        """Visual service storing local copies under a temporary static folder"""
+        static_folder = os.path.join(self.temp_dir, 'static')
+        with patch.dict(os.environ, {'VISUAL_IMAGE_DIR': 'static/visuals'}):
+            return VisualService(static_folder=static_folder), os.path.join(static_folder, 'visuals')
+    
+    @patch('services.visual_service.httpx.get')
+    def test_generated_image_stored_locally(self, mock_get):
+        """Test generated images are copied locally and then served from there"""
+        from services import visual_service as visual_module
+        
+        mock_client = self.mock_client
+        mock_get.return_value.content = b'image bytes'
+        visual_service, image_dir = self._local_visual_service()
+        
+        # Run the background copy inline
+        with patch.object(visual_module._download_executor, 'submit', side_effect=lambda fn, *args: fn(*args)):
+            first = visual_service.generate_concept_illustration("Growth")
+        second = visual_service.generate_concept_illustration("Growth")
+        
+        self.assertEqual(first, "https://example.com/image.png")
+        self.assertTrue(second.startswith('/static/visuals/') and second.endswith('.png'))
+        with open(os.path.join(image_dir, os.path.basename(second)), 'rb') as f:
+            self.assertEqual(f.read(), b'image bytes')
+        # Meetings holding the temporary URL resolve to the same copy
+        self.assertEqual(visual_service.local_url(first), second)
+        mock_client.images.generate.assert_called_once()
+    
+    def test_visual_summary_cached_per_summary(self):
+        """Test summaries with the same prompt hints still get their own image"""
+        visual_service = VisualService()
+        
+        visual_service.generate_visual_summary("Budget review for Q3")
+        visual_service.generate_visual_summary("Budget review for Q3")
+        visual_service.generate_visual_summary("Budget review for Q4")
+        
+        prompts = [call.kwargs['prompt'] for call in self.mock_client.images.generate.call_args_list]
+        self.assertEqual(len(prompts), 2)
+        self.assertEqual(prompts[0], prompts[1])
+        self.assertNotIn('subject', self.mock_client.images.generate.call_args.kwargs)
+    
+    @patch('services.visual_service.httpx.get')
+    def test_local_copy_reuse_expires_with_cache(self, mock_get):
+        """Test a stored copy is only reused for the same request within the cache TTL"""
+        from services import visual_service as visual_module
+        
+        mock_get.return_value.content = b'image bytes'
+        visual_service, _ = self._local_visual_service()
+        
+        with patch.object(visual_module._download_executor, 'submit', side_effect=lambda fn, *args: fn(*args)):
+            first = visual_service.generate_concept_illustration("Growth")
+            with patch('services.llm_cache.time.time', return_value=time.time() + visual_module.VISUAL_CACHE_TTL + 60):
+                visual_service.generate_concept_illustration("Growth")
+                # The meeting that got the first image still finds its copy
+                self.assertIsNotNone(visual_service.local_url(first))
+        
+        self.assertEqual(self.mock_client.images.generate.call_count, 2)
+    
+    @patch('services.visual_service.httpx.get')
+    def test_regenerated_image_gets_own_copy(self, mock_get):
+        """Test a forced regenerate doesn't overwrite the copy other meetings use"""
+        from services import visual_service as visual_module
+        
+        mock_get.return_value.content = b'image bytes'
+        visual_service, image_dir = self._local_visual_service()
+        
+        with patch.object(visual_module._download_executor, 'submit', side_effect=lambda fn, *args: fn(*args)):
+            first = visual_service.generate_visual_summary("Test summary")
+            self.mock_response.data[0].url = "https://example.com/regenerated.png"
+            second = visual_service.generate_visual_summary("Test summary", use_cache=False)
+        
+        self.assertNotEqual(visual_service.local_url(first), visual_service.local_url(second))
+        self.assertEqual(len(os.listdir(image_dir)), 2)
+    
+    def test_image_dir_outside_static_folder(self):
+        """Test local copies are disabled when they couldn't be served"""
+        with patch.dict(os.environ, {'VISUAL_IMAGE_DIR': os.path.join(self.temp_dir, 'visuals')}):
+            visual_service = VisualService(static_folder=os.path.join(self.temp_dir, 'static'))
+        
+        self.assertEqual(visual_service.image_dir, '')
+        self.assertIsNone(visual_service.local_url("https://example.com/image.png"))
+    
+    def test_batch_generate(self):
+        """Test several images are requested concurrently, with errors kept per request"""
+        visual_service = VisualService()
+        results = asyncio.run(visual_service.batch_generate([
+            {'type': 'summary', 'content': 'Test summary'},
+            {'type': 'presentation', 'content': ['Budget', 'Timeline']},
+            {'type': 'concept', 'content': ''}
+        ]))
+        
+        self.assertEqual(results[:2], ["https://example.com/image.png"] * 2)
+        self.assertIsInstance(results[2], Exception)
+        self.assertEqual(self.mock_async_client.images.generate.call_count, 2)
+        self.mock_client.images.generate.assert_not_called()
 
 class TestIntegrationService(TestSmartMeetingAssistant):
     """Test calendar and task integration service"""
@@ -233,6 +926,211 @@ class TestIntegrationService(TestSmartMeetingAssistant):
         if tasks:
             self.assertIn('title', tasks[0])
             self.assertIn('assignee', tasks[0])
+    
+    def test_upcoming_events_in_start_order(self):
+        """Test the summary lists upcoming events soonest first"""
+        analysis = {'action_items': [
+            {'task': 'Write report', 'owner': 'John', 'deadline': 'next month'},
+            {'task': 'Call vendor', 'owner': 'Jane', 'deadline': 'tomorrow, in a day'},
+            {'task': 'Review budget', 'owner': 'Ana', 'deadline': 'in two weeks'}
+        ]}
+        
+        self.integration_service.create_calendar_events(analysis)
+        summary = self.integration_service.get_integration_summary()
+        
+        titles = [event['title'] for event in summary['upcoming_events']]
+        self.assertEqual(titles, ['Follow-up: Call vendor', 'Follow-up: Review budget', 'Follow-up: Write report'])
+        self.assertEqual(self.integration_service.get_next_events(1)[0]['title'], 'Follow-up: Call vendor')
+
+class TestRealTimeService(TestSmartMeetingAssistant):
+    """Test real-time transcription session handling"""
+    
+    @patch('services.openai_client.OpenAI')
+    def test_live_analysis_keywords(self, mock_openai):
+        """Test live topic, action item and sentiment detection"""
+        service = RealTimeTranscriptionService()
+        session = service.create_session('live-1')
+        
+        service._update_live_analysis(session, "Great review of the API roadmap, but one problem. Great work")
+        analysis = session.live_analysis
+        self.assertEqual(analysis.current_topic, 'planning')
+        self.assertEqual(analysis.word_count, 11)
+        self.assertEqual(analysis.action_items_detected, 0)
+        self.assertEqual(analysis.sentiment, 'neutral')  # 'great' counts once
+        
+        service._update_live_analysis(session, "Assign the bug fix, it is a concern")
+        self.assertEqual(analysis.current_topic, 'technical')
+        self.assertEqual(analysis.action_items_detected, 1)
+        self.assertEqual(analysis.sentiment, 'negative')
+        self.assertEqual(session.to_dict()['live_analysis']['sentiment'], 'negative')
+    
+    @patch('services.openai_client.OpenAI')
+    def test_stream_commits_words_two_rounds_agree_on(self, mock_openai):
+        """Test words are committed only once consecutive transcriptions agree"""
+        service = RealTimeTranscriptionService()
+        session = service.create_session('live-2')
+        second = np.zeros(service.sample_rate, dtype=np.int16).tobytes()
+        rounds = [
+            [{'word': 'hello', 'start': 0.0, 'end': 0.5}, {'word': 'wor', 'start': 0.5, 'end': 0.9}],
+            [{'word': 'Hello,', 'start': 0.0, 'end': 0.5}, {'word': 'world', 'start': 0.5, 'end': 1.0},
+             {'word': 'again', 'start': 1.2, 'end': 1.8}],
+            [{'word': 'world', 'start': 0.0, 'end': 0.5}, {'word': 'again', 'start': 0.7, 'end': 1.3}],
+        ]
+        
+        with patch.object(service.audio_service, 'transcribe_stream_words', side_effect=rounds) as mock_words:
+            buffering = service.process_audio_chunk('live-2', second[:1000])
+            first = service.process_audio_chunk('live-2', second[1000:])
+            result = service.process_audio_chunk('live-2', second)
+            buffered = len(session.audio)
+            final = service._process_buffer('live-2', final=True)
+        
+        self.assertEqual(buffering['status'], 'buffering')
+        self.assertEqual(first['status'], 'tentative')
+        self.assertEqual(first['tentative_text'], 'hello wor')
+        self.assertEqual(result['status'], 'transcribed')
+        self.assertEqual(result['segment']['text'], 'Hello,')
+        self.assertEqual(result['tentative_text'], 'world again')
+        self.assertEqual(buffered, service.sample_rate * 3 // 2)  # Trimmed at 0.5s
+        self.assertEqual(len(mock_words.call_args_list[1].args[0]), service.sample_rate * 2)
+        self.assertEqual(result['segment']['start'], 0.0)
+        self.assertEqual(final['segment']['text'], 'world again')
+        self.assertEqual(final['segment']['start'], 0.5)
+        self.assertEqual(len(session.audio), 0)
+        self.assertEqual(session.chunks_received, 3)
+
+    @patch('services.openai_client.OpenAI')
+    def test_ended_sessions_expire_without_threads(self, mock_openai):
+        """Test ended sessions are kept for the retention period, then purged"""
+        service = RealTimeTranscriptionService()
+        service.create_session('old')
+        service.create_session('live')
+        
+        with patch.object(service, 'get_session_summary', return_value={}), \
+             patch('threading.Thread') as mock_thread:
+            service.end_session('old')
+        mock_thread.assert_not_called()
+        
+        self.assertEqual(service.get_active_sessions(), ['live'])
+        self.assertIn('old', service.active_sessions)
+        
+        with patch('services.realtime_service.time.monotonic', return_value=time.monotonic() + 301):
+            self.assertEqual(service.get_active_sessions(), ['live'])
+        self.assertNotIn('old', service.active_sessions)
+    
+    def test_audio_ring_buffer_wraps_and_drops_oldest(self):
+        """Test the ring keeps samples in order across wrap-around and overflow"""
+        ring = AudioRingBuffer(4)
+        ring.write(np.array([1, 2, 3], dtype=np.int16).tobytes()[:-1])  # Half a sample held back
+        self.assertEqual(ring.samples().tolist(), [1, 2])
+        
+        ring.consume(1)
+        ring.write(b'\x00' + np.array([4, 5], dtype=np.int16).tobytes())
+        self.assertEqual(ring.samples().tolist(), [2, 3, 4, 5])  # Wrapped around
+        
+        ring.write(np.array([6], dtype=np.int16).tobytes())
+        self.assertEqual(ring.samples().tolist(), [3, 4, 5, 6])
+        self.assertEqual(ring.start, 2)
+    
+    def test_transcription_worker_runs_off_event_loop(self):
+        """Test queued chunks from several sessions are transcribed on worker threads"""
+        threads = []
+        
+        def process_audio_chunk(session_id, audio_data):
+            threads.append(threading.current_thread().name)
+            return {'session_id': session_id, 'size': len(audio_data)}
+        
+        service = Mock()
+        service.process_audio_chunk.side_effect = process_audio_chunk
+        worker = TranscriptionWorker(service, max_batch=4)
+        
+        async def submit_all():
+            return await asyncio.gather(*(worker.submit(f's{i}', b'\x00' * i) for i in range(3)))
+        
+        results = asyncio.run(submit_all())
+        
+        self.assertEqual(results, [{'session_id': f's{i}', 'size': i} for i in range(3)])
+        self.assertTrue(all(name.startswith('transcription') for name in threads))
+
+    @patch('services.openai_client.OpenAI')
+    def test_websocket_messages_are_json_text_frames(self, mock_openai):
+        """Test WebSocket replies are JSON text frames, including for bad input"""
+        handler = RealTimeWebSocketHandler()
+        
+        class FakeWebSocket:
+            remote_address = ('127.0.0.1', 1234)
+            
+            def __init__(self, messages):
+                self.messages = messages
+                self.send = AsyncMock()
+            
+            async def __aiter__(self):
+                for message in self.messages:
+                    yield message
+        
+        websocket = FakeWebSocket(['not json', '{"type": "start_session", "session_id": "ws-1"}', '{"type": "nope"}'])
+        with patch.object(handler.transcription_service, 'end_session', return_value={}):
+            asyncio.run(handler.handle_client(websocket, '/'))
+        
+        sent = [call.args[0] for call in websocket.send.call_args_list]
+        self.assertTrue(all(isinstance(message, str) for message in sent))
+        replies = [json.loads(message) for message in sent]
+        self.assertEqual(replies[0], {'error': 'Invalid JSON message'})
+        self.assertEqual(replies[1]['type'], 'session_started')
+        self.assertEqual(replies[1]['session_id'], 'ws-1')
+        self.assertEqual(replies[2], {'error': 'Unknown message type: nope'})
+    
+    @patch('services.openai_client.OpenAI')
+    def test_websocket_control_messages_not_blocked_by_audio(self, mock_openai):
+        """Test a summary request is answered while earlier audio is still transcribing"""
+        handler = RealTimeWebSocketHandler()
+        sent = []
+        
+        async def run():
+            release = asyncio.Event()
+            
+            async def slow_submit(session_id, audio_data):
+                await release.wait()
+                return {'status': 'transcribed'}
+            
+            class FakeWebSocket:
+                remote_address = ('127.0.0.1', 1234)
+                
+                async def send(self, message):
+                    sent.append(json.loads(message))
+                    if len(sent) == 2:  # session_started, then the summary
+                        release.set()
+                
+                async def __aiter__(self):
+                    for message in ['{"type": "start_session", "session_id": "ws-3"}', b'\x00\x00' * 8,
+                                    '{"type": "get_summary"}']:
+                        yield message
+            
+            with patch.object(handler.worker, 'submit', slow_submit), \
+                 patch.object(handler.transcription_service, 'get_session_summary', return_value={'session_id': 'ws-3'}), \
+                 patch.object(handler.transcription_service, 'end_session', return_value={}):
+                await handler.handle_client(FakeWebSocket(), '/')
+        
+        asyncio.run(run())
+        
+        self.assertEqual([message['type'] for message in sent],
+                         ['session_started', 'session_summary', 'transcription_update'])
+        self.assertEqual(handler.locks, {})
+    
+    @patch('services.openai_client.OpenAI')
+    def test_websocket_binary_frames_are_audio(self, mock_openai):
+        """Test binary frames go to the session as raw PCM without base64"""
+        handler = RealTimeWebSocketHandler()
+        websocket = Mock()
+        handler.clients[websocket] = 'ws-2'
+        
+        with patch.object(handler.worker, 'submit', AsyncMock(return_value={'status': 'buffering'})) as mock_submit:
+            result = asyncio.run(handler.process_audio_frame(websocket, b'\x01\x00' * 4))
+            legacy = asyncio.run(handler.process_audio(websocket, {'audio_data': 'AQABAA=='}))
+        
+        self.assertEqual(result['type'], 'transcription_update')
+        self.assertEqual(legacy['type'], 'transcription_update')
+        self.assertEqual(mock_submit.call_args_list[0].args, ('ws-2', b'\x01\x00' * 4))
+        self.assertEqual(mock_submit.call_args_list[1].args, ('ws-2', b'\x01\x00' * 2))
 
 class TestFlaskEndpoints(TestSmartMeetingAssistant):
     """Test Flask API endpoints"""
@@ -247,6 +1145,172 @@ class TestFlaskEndpoints(TestSmartMeetingAssistant):
         response = self.app.post('/upload')
         self.assertEqual(response.status_code, 400)
     
+    def test_upload_file_success(self):
+        """Test that uploads are written to the upload folder"""
+        audio = b"fake audio data" * 1000
+        
+        with patch.dict(app.config, {'UPLOAD_FOLDER': self.temp_dir}):
+            response = self.app.post('/upload', data={'file': (io.BytesIO(audio), 'standup.mp3')})
+        
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertTrue(data['filename'].endswith('_standup.mp3'))
+        with open(os.path.join(self.temp_dir, data['filename']), 'rb') as f:
+            self.assertEqual(f.read(), audio)
+    
+    def test_concurrent_jobs_get_distinct_ids(self):
+        """Test meetings finished by two jobs at once are stored under different ids"""
+        original_next_id = app_module.next_meeting_id
+        started = threading.Barrier(2)
+        
+        def transcribe(path):
+            started.wait(timeout=5)  # both jobs run the pipeline together
+            return f"Transcript of {path}"
+        
+        def slow_next_id(meetings):
+            meeting_id = original_next_id(meetings)
+            time.sleep(0.05)  # widen the window between picking an id and saving
+            return meeting_id
+        
+        with patch('app.MEETINGS_FILE', self.test_data_path), \
+             patch('app.EMBEDDINGS_FILE', os.path.join(self.temp_dir, 'embeddings.npy')), \
+             patch('app.STATS_FILE', os.path.join(self.temp_dir, 'stats.json')), \
+             patch('app.INDEX_FILE', os.path.join(self.temp_dir, 'meetings_index.json')), \
+             patch.dict('app._meetings_cache', {'mtime': None, 'data': None, 'by_id': {}, 'next_id': 1}), \
+             patch('app.next_meeting_id', side_effect=slow_next_id), \
+             patch.object(app_module.audio_service, 'transcribe', side_effect=transcribe), \
+             patch.object(app_module.analysis_service, 'analyze_meeting', return_value={'summary': 'Summary'}), \
+             patch.object(app_module.search_service, 'create_embedding', return_value=[1.0, 0.0]), \
+             patch.object(app_module.visual_service, 'generate_visual_summary', return_value='/static/images/v.png'):
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = [pool.submit(app_module.run_meeting_pipeline, f"{name}.mp3", f"{name}.mp3", name, [])
+                           for name in ('first', 'second')]
+                results = [future.result(timeout=10) for future in futures]
+            flush_meetings()
+            stored = load_meetings()
+        
+        self.assertNotEqual(results[0]['id'], results[1]['id'])
+        self.assertEqual(sorted(m['id'] for m in stored), [1, 2])
+    
+    def test_regenerate_visual_waits_for_meeting_updates(self):
+        """Test a regenerated visual is saved under the lock other writers hold"""
+        meeting = dict(self.sample_meeting, id=7, transcript='Transcript')
+        with open(self.test_data_path, 'wb') as f:
+            f.write(app_module._json_dumps([meeting]))
+        
+        with patch('app.MEETINGS_FILE', self.test_data_path), \
+             patch('app.EMBEDDINGS_FILE', os.path.join(self.temp_dir, 'embeddings.npy')), \
+             patch('app.STATS_FILE', os.path.join(self.temp_dir, 'stats.json')), \
+             patch('app.INDEX_FILE', os.path.join(self.temp_dir, 'meetings_index.json')), \
+             patch.dict('app._meetings_cache', {'mtime': None, 'data': None, 'by_id': {}, 'next_id': 1}), \
+             patch.object(app_module.visual_service, 'generate_visual_summary', return_value='/static/images/new.png'), \
+             patch('app.save_meetings', wraps=save_meetings) as mock_save:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                with app_module._meetings_update_lock:
+                    future = pool.submit(self.app.post, '/meetings/7/regenerate-visual')
+                    time.sleep(0.1)
+                    mock_save.assert_not_called()
+                response = future.result(timeout=5)
+            flush_meetings()
+        
+        self.assertEqual(response.status_code, 200)
+        mock_save.assert_called_once()
+    
+    def test_interrupted_jobs_marked_failed(self):
+        """Test jobs lost with their worker report failure instead of staying queued"""
+        with patch('app.JOBS_DIR', self.temp_dir):
+            app_module._set_job_status('queued-job', 'queued', pid=100)
+            app_module._set_job_status('running-job', 'started', pid=200)
+            app_module._set_job_status('done-job', 'finished', pid=100, meeting={'id': 1})
+            
+            self.assertEqual(app_module.fail_interrupted_jobs(pid=100), 1)
+            self.assertEqual(app_module.load_job('running-job')['status'], 'started')
+            self.assertEqual(app_module.fail_interrupted_jobs(), 1)
+            jobs = {job_id: app_module.load_job(job_id) for job_id in ('queued-job', 'running-job', 'done-job')}
+        
+        self.assertEqual(jobs['queued-job']['status'], 'failed')
+        self.assertEqual(jobs['running-job']['status'], 'failed')
+        self.assertIn('interrupted', jobs['running-job']['error'])
+        self.assertEqual(jobs['done-job']['status'], 'finished')
+    
+    def test_get_meeting_swaps_in_local_visual(self):
+        """Test a stored temporary image URL is replaced by its local copy"""
+        meeting = dict(self.sample_meeting, id=7, transcript='Transcript', visual_url='https://example.com/image.png')
+        with open(self.test_data_path, 'wb') as f:
+            f.write(app_module._json_dumps([meeting]))
+        
+        with patch('app.MEETINGS_FILE', self.test_data_path), \
+             patch('app.EMBEDDINGS_FILE', os.path.join(self.temp_dir, 'embeddings.npy')), \
+             patch('app.STATS_FILE', os.path.join(self.temp_dir, 'stats.json')), \
+             patch('app.INDEX_FILE', os.path.join(self.temp_dir, 'meetings_index.json')), \
+             patch.dict('app._meetings_cache', {'mtime': None, 'data': None, 'by_id': {}, 'next_id': 1}), \
+             patch.object(app_module.visual_service, 'local_url', return_value='/static/images/visuals/v.png'):
+            response = self.app.get(f"/meetings/{meeting['id']}")
+            flush_meetings()
+            app_module._meetings_cache['data'] = None
+            stored = app_module.get_meeting_by_id(meeting['id'])
+        
+        self.assertEqual(json.loads(response.data)['meeting']['visual_url'], '/static/images/visuals/v.png')
+        self.assertEqual(stored['visual_url'], '/static/images/visuals/v.png')
+    
+    def test_stream_analysis_endpoint(self):
+        """Test analysis fields are sent as server-sent events as they complete"""
+        async def astream_analysis(transcript):
+            yield 'summary', 'Summary'
+            yield 'analysis', {'summary': 'Summary', 'action_items': []}
+        
+        with patch.object(app_module.analysis_service, 'astream_analysis', side_effect=astream_analysis):
+            response = self.app.post('/api/analysis/stream', json={'transcript': 'Test transcription'})
+            body = response.get_data()
+            missing = self.app.post('/api/analysis/stream', json={})
+        
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        events = [event.split(b'\ndata: ') for event in body.strip().split(b'\n\n')]
+        self.assertEqual([event for event, _ in events], [b'event: summary', b'event: analysis'])
+        self.assertEqual(json.loads(events[1][1])['summary'], 'Summary')
+        self.assertEqual(missing.status_code, 400)
+    
+    @patch('services.openai_client.AsyncOpenAI', side_effect=lambda **kwargs: Mock())
+    def test_stream_analysis_back_to_back(self, mock_async_openai):
+        """Test consecutive streamed analyses share one event loop and its client"""
+        clients = []
+        
+        async def astream_analysis(transcript):
+            clients.append(app_module.analysis_service.async_client)
+            await asyncio.sleep(0)
+            yield 'analysis', {'summary': transcript}
+        
+        with patch.object(app_module.analysis_service, 'astream_analysis', side_effect=astream_analysis):
+            bodies = [self.app.post('/api/analysis/stream', json={'transcript': name}).get_data()
+                      for name in ('First', 'Second')]
+        
+        self.assertIn(b'"summary":"First"', bodies[0])
+        self.assertIn(b'"summary":"Second"', bodies[1])
+        self.assertIs(clients[0], clients[1])
+        mock_async_openai.assert_called_once()
+    
+    def test_process_runs_as_background_job(self):
+        """Test processing is queued and its result is available from /jobs"""
+        with open(os.path.join(self.temp_dir, 'standup.mp3'), 'wb') as f:
+            f.write(b"fake audio data")
+        inline_executor = Mock(submit=lambda fn, *args: fn(*args))
+        
+        with patch.dict(app.config, {'UPLOAD_FOLDER': self.temp_dir}), \
+             patch('app.JOBS_DIR', self.temp_dir), \
+             patch('app._job_executor', inline_executor), \
+             patch('app.run_meeting_pipeline', return_value={'id': 1, 'title': 'Standup'}):
+            response = self.app.post('/process/standup.mp3', json={'title': 'Standup'})
+            queued = json.loads(response.data)
+            job = json.loads(self.app.get(queued['status_url']).data)
+            missing = self.app.get('/jobs/unknown')
+        
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(queued['status_url'], f"/jobs/{queued['job_id']}")
+        self.assertEqual(response.headers['Location'], queued['status_url'])
+        self.assertEqual(job['status'], 'finished')
+        self.assertEqual(job['meeting']['title'], 'Standup')
+        self.assertEqual(missing.status_code, 404)
+    
     @patch('app.load_meetings')
     def test_search_endpoint(self, mock_load):
         """Test search endpoint"""
@@ -271,53 +1335,144 @@ class TestFlaskEndpoints(TestSmartMeetingAssistant):
         data = json.loads(response.data)
         self.assertIn('insights', data)
 
+    @patch('app.load_meetings')
+    def test_calendar_endpoint_accepts_string_id(self, mock_load):
+        """Test calendar integration looks meetings up by normalized id"""
+        meeting = dict(self.sample_meeting, id=7)
+        mock_load.return_value = [meeting]
+        
+        with patch.dict('app._meetings_cache', {'by_id': {'7': meeting}}):
+            response = self.app.post('/api/integrations/calendar', json={'meeting_id': '7'})
+            missing = self.app.post('/api/integrations/calendar', json={'meeting_id': 8})
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['events_created'], 2)
+        self.assertEqual(missing.status_code, 404)
+
+    def test_realtime_process_accepts_raw_audio(self):
+        """Test realtime chunks can be posted as a raw binary body"""
+        mock_realtime = Mock()
+        mock_realtime.process_audio_chunk.return_value = {'status': 'buffered'}
+        
+        with patch('app.REALTIME_ENABLED', True), patch('app.realtime_service', mock_realtime):
+            response = self.app.post('/api/realtime/process?session_id=s1', data=b'\x00\x01' * 8,
+                                     content_type='application/octet-stream')
+            missing = self.app.post('/api/realtime/process', data=b'\x00\x01',
+                                    content_type='application/octet-stream')
+        
+        self.assertEqual(response.status_code, 200)
+        mock_realtime.process_audio_chunk.assert_called_once_with('s1', b'\x00\x01' * 8)
+        self.assertEqual(missing.status_code, 400)
+
+    def test_analysis_batch_results_stored(self):
+        """Test completed batch analyses replace the stored analyses"""
+        meeting = dict(self.sample_meeting, id=3)
+        new_analysis = {'summary': 'Batch summary', 'action_items': [], 'key_decisions': []}
+        
+        with patch('app.load_meetings', return_value=[meeting]), \
+             patch.dict('app._meetings_cache', {'by_id': {'3': meeting}}), \
+             patch('app.save_meetings') as mock_save, \
+             patch.object(app_module.analysis_service, 'poll_batch', side_effect=[None, {'3': new_analysis}]):
+            pending = json.loads(self.app.get('/api/analysis/batch/batch_1').data)
+            done = json.loads(self.app.get('/api/analysis/batch/batch_1').data)
+        
+        self.assertEqual(pending['status'], 'in_progress')
+        self.assertEqual(done['updated'], 1)
+        self.assertEqual(meeting['analysis'], new_analysis)
+        mock_save.assert_called_once()
+
+    def test_stats_endpoint(self):
+        """Test stats are served from the precomputed stats file"""
+        stats_path = os.path.join(self.temp_dir, 'stats.json')
+        with open(stats_path, 'wb') as f:
+            f.write(app_module._json_dumps(app_module.compute_stats([self.sample_meeting, self.sample_meeting])))
+        
+        with patch('app.STATS_FILE', stats_path), \
+             patch.dict('app._stats_cache', {'mtime': None, 'data': None}), \
+             patch('app.load_meetings') as mock_load:
+            response = self.app.get('/stats')
+        
+        mock_load.assert_not_called()
+        data = json.loads(response.data)
+        self.assertEqual(data['total_meetings'], 2)
+        self.assertEqual(data['action_items_count'], 4)
+        self.assertEqual(data['decisions_count'], 4)
+
+    def test_meetings_list_endpoint(self):
+        """Test the meeting list is served from the index file, not full records"""
+        index_path = os.path.join(self.temp_dir, 'meetings_index.json')
+        with open(index_path, 'wb') as f:
+            f.write(app_module._json_dumps([app_module.meeting_list_entry(self.sample_meeting)]))
+        
+        with patch('app.INDEX_FILE', index_path), \
+             patch.dict('app._index_cache', {'mtime': None, 'data': None}), \
+             patch('app.load_meetings') as mock_load:
+            response = self.app.get('/meetings')
+        
+        mock_load.assert_not_called()
+        meetings = json.loads(response.data)['meetings']
+        self.assertEqual(len(meetings), 1)
+        self.assertEqual(meetings[0]['id'], self.sample_meeting['id'])
+        self.assertNotIn('transcript', meetings[0])
+
 class TestDataPersistence(TestSmartMeetingAssistant):
     """Test data loading and saving functionality"""
     
     def test_load_meetings_empty(self):
         """Test loading meetings when file doesn't exist"""
-        with patch('os.path.exists', return_value=False):
+        with patch('app.MEETINGS_FILE', os.path.join(self.temp_dir, 'missing.json')):
             meetings = load_meetings()
             
         self.assertEqual(meetings, [])
     
     def test_save_and_load_meetings(self):
         """Test saving and loading meetings"""
-        test_meetings = [self.sample_meeting]
+        test_meetings = [self.sample_meeting, dict(self.sample_meeting, id='test-meeting-2', embedding=[])]
         
-        with patch('app.open', unittest.mock.mock_open()) as mock_file:
-            with patch('os.makedirs'):
-                save_meetings(test_meetings)
-                
-        mock_file.assert_called_once()
+        with patch('app.MEETINGS_FILE', self.test_data_path), \
+             patch('app.EMBEDDINGS_FILE', os.path.join(self.temp_dir, 'embeddings.npy')), \
+             patch('app.STATS_FILE', os.path.join(self.temp_dir, 'stats.json')), \
+             patch('app.INDEX_FILE', os.path.join(self.temp_dir, 'meetings_index.json')), \
+             patch.dict('app._meetings_cache', {'mtime': None, 'data': None}):
+            save_meetings(test_meetings)
+            flush_meetings()
+            app_module._meetings_cache['data'] = None
+            loaded = load_meetings()
+        
+        # Embeddings live in the float16 sidecar matrix, not in the JSON records
+        with open(self.test_data_path, 'rb') as f:
+            records = app_module._json_loads(f.read())
+        self.assertNotIn('embedding', records[0])
+        self.assertEqual(records[0]['embedding_row'], 0)
+        self.assertEqual(np.load(os.path.join(self.temp_dir, 'embeddings.npy')).dtype, np.float16)
+        
+        self.assertEqual(len(loaded), 2)
+        self.assertEqual(loaded[0]['analysis'], self.sample_meeting['analysis'])
+        self.assertEqual(loaded[0]['embedding'].shape, (1536,))
+        self.assertAlmostEqual(float(loaded[0]['embedding'][0]), 0.1 / (0.01 * 1536) ** 0.5, places=3)
+        self.assertEqual(loaded[1]['embedding'], [])
+
+    def test_load_meetings_cached_until_file_changes(self):
+        """Test that meetings are only re-parsed when the file changes"""
+        with open(self.test_data_path, 'wb') as f:
+            f.write(app_module._json_dumps([self.sample_meeting]))
+
+        with patch('app.MEETINGS_FILE', self.test_data_path), \
+             patch('app.EMBEDDINGS_FILE', os.path.join(self.temp_dir, 'embeddings.npy')), \
+             patch('app.STATS_FILE', os.path.join(self.temp_dir, 'stats.json')), \
+             patch('app.INDEX_FILE', os.path.join(self.temp_dir, 'meetings_index.json')), \
+             patch.dict('app._meetings_cache', {'mtime': None, 'data': None}):
+            first = load_meetings()
+            with patch('app._json_loads') as mock_load:
+                second = load_meetings()
+            mock_load.assert_not_called()
+            self.assertIs(first, second)
+
+            save_meetings(first + [dict(self.sample_meeting, id='test-meeting-2')])
+            self.assertEqual(len(load_meetings()), 2)
+            flush_meetings()
+            app_module._meetings_cache['data'] = None
+            self.assertEqual(len(load_meetings()), 2)
 
 if __name__ == '__main__':
-    # Create test suite
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-    
-    # Add all test classes
-    test_classes = [
-        TestAudioService,
-        TestAnalysisService, 
-        TestSearchService,
-        TestVisualService,
-        TestIntegrationService,
-        TestFlaskEndpoints,
-        TestDataPersistence
-    ]
-    
-    for test_class in test_classes:
-        tests = loader.loadTestsFromTestCase(test_class)
-        suite.addTests(tests)
-    
-    # Run tests
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
-    
-    # Print summary
-    print(f"\nTest Summary:")
-    print(f"Tests run: {result.testsRun}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
-    print(f"Success rate: {((result.testsRun - len(result.failures) - len(result.errors)) / result.testsRun * 100):.1f}%")
+    unittest.main(verbosity=2)